@@ -5,6 +5,7 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from datetime import datetime
 import asyncio
+import time
 from contextlib import asynccontextmanager
 
 from ...api.schemas.common import HealthCheckResponse, ServiceStatus
@@ -13,12 +14,20 @@ from ...api.schemas.common import HealthCheckResponse, ServiceStatus
 class BaseService(ABC):
     """모든 마이크로서비스의 기본 추상 클래스"""
     
+    # 의존성 헬스 체크: 프로브 하나의 최대 대기 시간(초), 결과 캐시 유효 시간(초)
+    dependency_probe_timeout: float = 2.0
+    dependency_status_ttl: float = 5.0
+    
     def __init__(self, service_name: str, version: str = "1.0.0"):
         self.service_name = service_name
         self.version = version
         self.start_time = datetime.now()
         self.is_initialized = False
         self.dependencies: Dict[str, Any] = {}
+        self._dependency_status: Dict[str, ServiceStatus] = {}
+        self._dependency_checked_at = 0.0
+        self._dependency_refresh: Optional[asyncio.Task] = None
+        self._dependency_monitor: Optional[asyncio.Task] = None
     
     @property
     def uptime_seconds(self) -> float:
@@ -54,24 +63,72 @@ class BaseService(ABC):
         """
         pass
     
+    async def _probe_dependency(self, dep_name: str, dep_client: Any):
+        """의존성 하나의 상태 확인 (dependency_probe_timeout 초과 시 UNHEALTHY)"""
+        if not hasattr(dep_client, 'health_check'):
+            return dep_name, ServiceStatus.HEALTHY
+        try:
+            health_result = await asyncio.wait_for(dep_client.health_check(), self.dependency_probe_timeout)
+            return dep_name, (
+                ServiceStatus.HEALTHY if health_result.get('healthy', False) 
+                else ServiceStatus.UNHEALTHY
+            )
+        except Exception:
+            return dep_name, ServiceStatus.UNHEALTHY
+    
+    async def _refresh_dependencies(self):
+        results = await asyncio.gather(*(
+            self._probe_dependency(dep_name, dep_client)
+            for dep_name, dep_client in self.dependencies.items()
+        ))
+        self._dependency_status = dict(results)
+        self._dependency_checked_at = time.monotonic()
+    
+    def refresh_dependencies(self) -> asyncio.Task:
+        """의존성 상태 갱신 태스크 (이미 진행 중이면 같은 태스크를 공유)"""
+        if self._dependency_refresh is None or self._dependency_refresh.done():
+            self._dependency_refresh = asyncio.ensure_future(self._refresh_dependencies())
+        return self._dependency_refresh
+    
     async def check_dependencies(self) -> Dict[str, ServiceStatus]:
-        """의존성 서비스들의 상태 확인"""
-        dependency_status = {}
+        """
+        의존성 서비스들의 상태 확인
+        - 모든 의존성을 동시에 확인하고 결과를 dependency_status_ttl 동안 캐시
+        - TTL이 지나면 이전 결과를 반환하면서 백그라운드로 갱신 (첫 호출만 결과를 기다림)
+        """
+        if not self._dependency_checked_at:
+            await asyncio.shield(self.refresh_dependencies())
+        elif time.monotonic() - self._dependency_checked_at > self.dependency_status_ttl:
+            self.refresh_dependencies()
+        return dict(self._dependency_status)
+    
+    def start_dependency_monitor(self, interval: Optional[float] = None):
+        """의존성 상태 주기적 갱신 시작 (initialize에서 호출, 기본 간격은 dependency_status_ttl)"""
+        if self._dependency_monitor is not None:
+            return
+        interval = interval or self.dependency_status_ttl
         
-        for dep_name, dep_client in self.dependencies.items():
-            try:
-                if hasattr(dep_client, 'health_check'):
-                    health_result = await dep_client.health_check()
-                    dependency_status[dep_name] = (
-                        ServiceStatus.HEALTHY if health_result.get('healthy', False) 
-                        else ServiceStatus.UNHEALTHY
-                    )
-                else:
-                    dependency_status[dep_name] = ServiceStatus.HEALTHY
-            except Exception:
-                dependency_status[dep_name] = ServiceStatus.UNHEALTHY
+        async def monitor():
+            while True:
+                try:
+                    await asyncio.shield(self.refresh_dependencies())
+                except Exception:
+                    pass
+                await asyncio.sleep(interval)
         
-        return dependency_status
+        self._dependency_monitor = asyncio.ensure_future(monitor())
+    
+    async def stop_dependency_monitor(self):
+        """의존성 상태 갱신 중지 (cleanup에서 호출)"""
+        for task in (self._dependency_monitor, self._dependency_refresh):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._dependency_monitor = None
+        self._dependency_refresh = None
     
     def get_service_info(self) -> Dict[str, Any]:
         """서비스 기본 정보 반환"""
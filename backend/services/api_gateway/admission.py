@@ -0,0 +1,307 @@
+"""
+업스트림별 입장 제어 - 동시 요청 수 제한 + 길이 제한 우선순위 대기열
+한도를 넘는 요청은 대기열에서 기다리고, 대기열이 가득 찼거나 너무 오래 기다리면
+업스트림에 보내지 않고 바로 503(Retry-After)으로 거절해 폭주가 업스트림 전체로 번지지 않게 한다.
+
+빈 슬롯은 우선순위가 높은 대기 요청부터 받는다 (음성 > 일반 텍스트 > 일괄/백그라운드).
+낮은 우선순위 요청도 aging초 이상 기다리면 먼저 처리해 계속 밀리지 않게 하고,
+대기열이 가득 찬 상태에서 높은 우선순위 요청이 오면 가장 늦게 들어온 낮은 우선순위 요청을 대신 거절한다.
+"""
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional, Tuple
+import asyncio
+import math
+import os
+import time
+
+# 우선순위 (앞일수록 먼저 처리)
+VOICE = "voice"              # 음성 대화 턴 (is_voice=1), 음성 인식/합성
+INTERACTIVE = "interactive"  # 일반 텍스트 요청
+BULK = "bulk"                # 일괄 점역, 대화 기록 조회 등 기다려도 되는 요청
+PRIORITIES = (VOICE, INTERACTIVE, BULK)
+
+# 클래스별 대기/점유 시간 백분위 계산에 쓰는 최근 표본 수
+LATENCY_SAMPLES = 1024
+
+
+class AdmissionRejected(Exception):
+    """입장 거절 - retry_after초 뒤 재시도 권장"""
+
+    def __init__(self, upstream: str, reason: str, retry_after: int):
+        super().__init__(f"{upstream}: {reason}")
+        self.upstream = upstream
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def _percentile(samples: Deque[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class _ClassStats:
+    """우선순위 클래스 하나의 입장/대기/점유 통계"""
+
+    __slots__ = ("admitted", "queued", "promoted", "rejected", "waits", "wait_seconds_max", "hold_seconds_total")
+
+    def __init__(self):
+        self.admitted = 0
+        self.queued = 0
+        self.promoted = 0   # aging으로 우선순위를 건너뛰어 처리된 수
+        self.rejected = 0
+        self.waits: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.wait_seconds_max = 0.0
+        self.hold_seconds_total = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "promoted": self.promoted,
+            "rejected": self.rejected,
+            "wait_p50_ms": round(_percentile(self.waits, 0.50) * 1000, 3),
+            "wait_p95_ms": round(_percentile(self.waits, 0.95) * 1000, 3),
+            "wait_p99_ms": round(_percentile(self.waits, 0.99) * 1000, 3),
+            "wait_max_ms": round(self.wait_seconds_max * 1000, 3),
+            "avg_hold_ms": round(self.hold_seconds_total / self.admitted * 1000, 3) if self.admitted else 0.0,
+        }
+
+
+class Permit:
+    """획득한 실행 슬롯 - release()는 여러 번 호출해도 한 번만 반환 (스트림 종료/백그라운드 양쪽에서 호출)"""
+
+    __slots__ = ("_limiter", "priority", "_acquired_at", "_released")
+
+    def __init__(self, limiter: "AdmissionLimiter", priority: str):
+        self._limiter = limiter
+        self.priority = priority
+        self._acquired_at = time.monotonic()
+        self._released = False
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+        self._limiter._release(time.monotonic() - self._acquired_at, self.priority)
+
+
+class AdmissionLimiter:
+    """
+    업스트림 하나의 입장 제어
+
+    - max_concurrent: 동시에 업스트림으로 보내는 요청 수
+    - max_queue: 슬롯을 기다릴 수 있는 요청 수 (초과하면 바로 거절)
+    - max_wait: 대기열에서 기다리는 최대 시간(초, 초과하면 거절)
+    - aging: 이 시간(초) 이상 기다린 요청은 우선순위와 관계없이 먼저 처리 (기본 max_wait의 절반)
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, max_wait: float,
+                 aging: Optional[float] = None):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.aging = max_wait / 2 if aging is None else aging
+        self.active = 0
+        # 우선순위별 대기열 - (future, 대기 시작 시각)
+        self._waiters: Dict[str, Deque[Tuple[asyncio.Future, float]]] = {priority: deque() for priority in PRIORITIES}
+        self._hold_seconds = 0.0  # 슬롯 점유 시간 이동 평균 (Retry-After 추정용)
+        self._classes = {priority: _ClassStats() for priority in PRIORITIES}
+
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.rejected_displaced = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    @classmethod
+    def from_env(cls, name: str, max_concurrent: int, max_queue: int, max_wait: float) -> "AdmissionLimiter":
+        """ADMISSION_<NAME>_CONCURRENCY / _QUEUE / _MAX_WAIT / _AGING 환경 변수로 기본값 조정"""
+        prefix = f"ADMISSION_{name.upper()}"
+        aging = os.getenv(f"{prefix}_AGING")
+        return cls(
+            name,
+            max_concurrent=int(os.getenv(f"{prefix}_CONCURRENCY", str(max_concurrent))),
+            max_queue=int(os.getenv(f"{prefix}_QUEUE", str(max_queue))),
+            max_wait=float(os.getenv(f"{prefix}_MAX_WAIT", str(max_wait))),
+            aging=float(aging) if aging else None,
+        )
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def retry_after(self) -> int:
+        """대기열이 빠지는 데 걸릴 시간 추정 (초, 1~60)"""
+        estimate = (self._hold_seconds or self.max_wait) * (self.waiting + 1) / max(self.max_concurrent, 1)
+        return min(max(math.ceil(estimate), 1), 60)
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        return AdmissionRejected(self.name, reason, self.retry_after())
+
+    def _record_wait(self, priority: str, waited: float):
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        stats = self._classes[priority]
+        stats.waits.append(waited)
+        stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+
+    def _displace(self, priority: str) -> bool:
+        """대기열이 가득 참 - priority보다 낮은 클래스에서 가장 늦게 들어온 대기 요청을 거절하고 자리를 비움"""
+        for lower in reversed(PRIORITIES[PRIORITIES.index(priority) + 1:]):
+            waiters = self._waiters[lower]
+            while waiters:
+                future, _ = waiters.pop()
+                if not future.done():
+                    future.set_exception(self._reject("displaced by higher priority"))
+                    self.rejected_displaced += 1
+                    return True
+        return False
+
+    async def acquire(self, priority: str = INTERACTIVE) -> Permit:
+        """실행 슬롯 획득 (기다릴 수 없으면 AdmissionRejected)"""
+        if priority not in self._waiters:
+            raise ValueError(f"unknown priority: {priority}")
+        stats = self._classes[priority]
+        if self.active < self.max_concurrent and not self.waiting:
+            self.active += 1
+            self.admitted += 1
+            stats.admitted += 1
+            self._record_wait(priority, 0.0)
+            return Permit(self, priority)
+        if self.waiting >= self.max_queue and not self._displace(priority):
+            self.rejected_queue_full += 1
+            stats.rejected += 1
+            raise self._reject("queue full")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (future, time.monotonic())
+        self._waiters[priority].append(entry)
+        self.queued += 1
+        stats.queued += 1
+        try:
+            await asyncio.wait_for(future, self.max_wait)
+        except asyncio.TimeoutError:
+            self._record_wait(priority, time.monotonic() - entry[1])
+            self.rejected_timeout += 1
+            stats.rejected += 1
+            raise self._reject("queue wait timeout")
+        except AdmissionRejected:
+            # 더 높은 우선순위 요청에 밀려남
+            self._record_wait(priority, time.monotonic() - entry[1])
+            stats.rejected += 1
+            raise
+        except asyncio.CancelledError:
+            # 슬롯을 넘겨받은 직후 취소되면 다음 대기자에게 돌려준다
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self._release(0.0, None)
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            try:
+                self._waiters[priority].remove(entry)
+            except ValueError:
+                pass
+        self._record_wait(priority, time.monotonic() - entry[1])
+        self.admitted += 1
+        stats.admitted += 1
+        return Permit(self, priority)
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """다음에 슬롯을 받을 대기 요청 - aging을 넘긴 가장 오래된 요청, 없으면 우선순위 순"""
+        for waiters in self._waiters.values():
+            while waiters and waiters[0][0].done():
+                waiters.popleft()
+
+        overdue = time.monotonic() - self.aging
+        oldest = None
+        for priority, waiters in self._waiters.items():
+            if waiters and waiters[0][1] <= overdue and (oldest is None or waiters[0][1] < self._waiters[oldest][0][1]):
+                oldest = priority
+        if oldest is not None:
+            # 더 높은 우선순위 대기자를 건너뛰었을 때만 승격으로 센다
+            if any(self._waiters[higher] for higher in PRIORITIES[:PRIORITIES.index(oldest)]):
+                self._classes[oldest].promoted += 1
+            return self._waiters[oldest].popleft()[0]
+
+        for waiters in self._waiters.values():
+            if waiters:
+                return waiters.popleft()[0]
+        return None
+
+    def _release(self, held: float, priority: Optional[str]):
+        if priority is not None:
+            self._hold_seconds = held if not self._hold_seconds else self._hold_seconds * 0.9 + held * 0.1
+            self._classes[priority].hold_seconds_total += held
+        # 슬롯을 대기 중인 다음 요청에게 그대로 넘김 (active 수는 그대로)
+        future = self._next_waiter()
+        if future is not None:
+            future.set_result(None)
+            return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: str = INTERACTIVE):
+        permit = await self.acquire(priority)
+        try:
+            yield permit
+        finally:
+            permit.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "max_wait": self.max_wait,
+            "aging": self.aging,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "rejected_displaced": self.rejected_displaced,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "avg_wait_ms": round(self.wait_seconds_total / self.queued * 1000, 3) if self.queued else 0.0,
+            "max_wait_ms": round(self.wait_seconds_max * 1000, 3),
+            "avg_hold_ms": round(self._hold_seconds * 1000, 3),
+            "classes": {
+                priority: {"waiting": len(self._waiters[priority]), **stats.to_dict()}
+                for priority, stats in self._classes.items()
+            },
+        }
+
+
+class AdmissionController:
+    """업스트림 이름 → 입장 제어기"""
+
+    def __init__(self, limiters: Dict[str, AdmissionLimiter]):
+        self._limiters = limiters
+
+    def get(self, name: str) -> AdmissionLimiter:
+        return self._limiters[name]
+
+    def items(self):
+        return self._limiters.items()
+
+    async def acquire(self, name: str, priority: str = INTERACTIVE) -> Permit:
+        return await self._limiters[name].acquire(priority)
+
+    def slot(self, name: str, priority: str = INTERACTIVE):
+        return self._limiters[name].slot(priority)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+
+
+def admission_from_env(defaults: Dict[str, tuple]) -> AdmissionController:
+    """{이름: (동시 요청 수, 대기열 길이, 최대 대기 초)} 기본값으로 생성 (ADMISSION_* 환경 변수로 조정)"""
+    return AdmissionController({
+        name: AdmissionLimiter.from_env(name, *values) for name, values in defaults.items()
+    })
@@ -0,0 +1,135 @@
+"""
+JWT 인증 - 검증이 끝난 토큰의 클레임을 토큰 만료 시각까지 캐시
+같은 세션이 반복해서 보내는 토큰은 서명 검증(HMAC)과 클레임 파싱을 다시 하지 않는다.
+PyJWT는 처음 토큰을 검증할 때 import한다 (인증을 쓰지 않는 배포의 시작 시간 단축).
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import os
+import time
+
+# exp 클레임이 없는 토큰도 이 시간(초)이 지나면 다시 검증
+DEFAULT_MAX_CACHE_SECONDS = 3600.0
+
+
+class AuthError(Exception):
+    """인증 실패 (401) - detail은 클라이언트에 그대로 전달하는 메시지"""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """Authorization 헤더에서 Bearer 토큰만 추출 (없으면 None)"""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+
+class JWTAuthenticator:
+    """
+    HS256 토큰 검증기 + 검증 결과 LRU 캐시
+
+    - cache_size: 캐시할 토큰 수 (0이면 캐시 없이 매번 검증)
+    - max_cache_seconds: 캐시 항목의 최대 보관 시간 (exp가 더 이르면 exp까지)
+
+    캐시 키는 토큰 원문이 아닌 해시이며, 서명까지 포함한 토큰 전체의 해시이므로
+    같은 키는 곧 이미 검증에 성공한 같은 토큰이다.
+    """
+
+    def __init__(self, secret: str, algorithm: str = "HS256", cache_size: int = 4096,
+                 max_cache_seconds: float = DEFAULT_MAX_CACHE_SECONDS):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.cache_size = cache_size
+        self.max_cache_seconds = max_cache_seconds
+        self._cache: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls, secret: str, algorithm: str) -> "JWTAuthenticator":
+        """AUTH_CACHE_SIZE, AUTH_CACHE_MAX_SECONDS 환경 변수로 생성"""
+        return cls(
+            secret,
+            algorithm,
+            cache_size=int(os.getenv("AUTH_CACHE_SIZE", "4096")),
+            max_cache_seconds=float(os.getenv("AUTH_CACHE_MAX_SECONDS", str(DEFAULT_MAX_CACHE_SECONDS))),
+        )
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        import jwt as pyjwt
+
+        try:
+            claims = pyjwt.decode(token, self.secret, algorithms=[self.algorithm])
+        except pyjwt.ExpiredSignatureError:
+            self.failures += 1
+            raise AuthError("토큰이 만료되었습니다.")
+        except pyjwt.PyJWTError:
+            self.failures += 1
+            raise AuthError("유효하지 않은 토큰입니다.")
+        if claims.get("sub") is None:
+            self.failures += 1
+            raise AuthError("유효하지 않은 토큰입니다.")
+        return claims
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """토큰 검증 후 클레임 반환 (실패하면 AuthError)"""
+        if not self.cache_size:
+            self.misses += 1
+            return self._decode(token)
+
+        key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+        now = time.time()
+        entry = self._cache.get(key)
+        if entry is not None:
+            claims, expires_at = entry
+            if now < expires_at:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return claims
+            del self._cache[key]
+            self.expirations += 1
+
+        self.misses += 1
+        claims = self._decode(token)
+        expires_at = now + self.max_cache_seconds
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, float(claims["exp"]))
+        self._cache[key] = (claims, expires_at)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        return claims
+
+    def authenticate(self, authorization: Optional[str]) -> Dict[str, Any]:
+        """Authorization 헤더 검증 (토큰이 없거나 잘못되면 AuthError)"""
+        token = bearer_token(authorization)
+        if token is None:
+            raise AuthError("토큰이 없습니다.")
+        return self.verify(token)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "max_entries": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "failures": self.failures,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
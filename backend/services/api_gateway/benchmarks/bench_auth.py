@@ -0,0 +1,71 @@
+"""
+JWT 인증 벤치마크 - 토큰 검증 캐시 유무에 따른 초당 처리량
+
+검증 함수만 반복 호출하는 경우와, 게이트웨이를 ASGI로 직접 호출해 인증이 필요한 요청
+(/auth/verify, AUTH_REQUIRED 상태의 /admin/upstreams)을 보내는 경우를 비교한다.
+
+    python benchmarks/bench_auth.py [--requests 5000] [--tokens 50]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+GATEWAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, GATEWAY_DIR)
+os.environ.setdefault("BRAILLE_WORKERS", "0")
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from auth import JWTAuthenticator  # noqa: E402
+
+
+def make_tokens(count: int) -> list:
+    # 활성 세션 수만큼 서로 다른 토큰 (요청은 이 토큰들을 돌아가며 사용)
+    return [main.create_access_token({"sub": f"user-{i}", "username": f"user-{i}"}) for i in range(count)]
+
+
+def bench_verify(tokens: list, requests: int):
+    for label, cache_size in (("no cache", 0), ("cache", 4096)):
+        authenticator = JWTAuthenticator(main.JWT_SECRET, main.JWT_ALGORITHM, cache_size=cache_size)
+        started = time.perf_counter()
+        for i in range(requests):
+            authenticator.verify(tokens[i % len(tokens)])
+        elapsed = time.perf_counter() - started
+        print(f"  {'verify/' + label:<34}{requests / elapsed:>12,.0f} req/s")
+
+
+async def bench_gateway(tokens: list, requests: int):
+    headers = [{"Authorization": f"Bearer {token}"} for token in tokens]
+    main.AUTH_REQUIRED = True
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+        for path in ("/auth/verify", "/admin/upstreams"):
+            for label, cache_size in (("no cache", 0), ("cache", 4096)):
+                main.authenticator = JWTAuthenticator(main.JWT_SECRET, main.JWT_ALGORITHM, cache_size=cache_size)
+                started = time.perf_counter()
+                for i in range(requests):
+                    response = await client.get(path, headers=headers[i % len(headers)])
+                    assert response.status_code == 200, response.text
+                elapsed = time.perf_counter() - started
+                print(f"  {'gateway' + path + '/' + label:<34}{requests / elapsed:>12,.0f} req/s")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--tokens", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    tokens = make_tokens(args.tokens)
+    print(f"Authenticated requests per second ({args.requests} requests, {args.tokens} distinct tokens)")
+    bench_verify(tokens, args.requests * 10)
+    asyncio.run(bench_gateway(tokens, args.requests))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,182 @@
+"""
+점역 파이프라인 마이크로벤치마크 - 단계별 처리량(글자/초)과 호출당 메모리 할당, 기준값 대비 회귀 검사
+
+benchmarks/corpus의 짧은/중간/긴 한국어 LLM 답변(마크다운, 이모지, 숫자 포함)으로
+sanitize_text_for_braille, extract_quoted_text_for_braille, korTranslate, convert_unicode_braille_to_brf와
+세 단계를 이은 전체 파이프라인을 잰다. 각 단계의 입력은 실제 파이프라인과 같다 (korTranslate는 정제된 텍스트,
+BRF 변환은 점역 결과). 처리량이 기준값보다 --tolerance 이상 떨어지거나 할당량이 --alloc-tolerance 이상
+늘면 종료 코드 1로 실패한다.
+
+    python benchmarks/bench_braille_pipeline.py [--repeat 5] [--output result.json]
+    python benchmarks/bench_braille_pipeline.py --update-baseline   # 기준값 갱신 (같은 장비에서)
+"""
+from typing import Any, Callable, Dict, List, Tuple
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+
+GATEWAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, GATEWAY_DIR)
+
+from KorToBraille.KorToBraille import KorToBraille  # noqa: E402
+
+from braille_engine import translate_sanitized  # noqa: E402
+from brf import convert_unicode_braille_to_brf  # noqa: E402
+from sanitizer import extract_quoted_text_for_braille, sanitize_text_for_braille  # noqa: E402
+
+CORPUS_DIR = os.path.join(GATEWAY_DIR, "benchmarks", "corpus")
+CORPUS_SIZES = ("short", "medium", "long")
+DEFAULT_BASELINE = os.path.join(GATEWAY_DIR, "benchmarks", "baselines", "braille_pipeline.json")
+
+
+def load_corpus() -> Dict[str, str]:
+    corpus = {}
+    for size in CORPUS_SIZES:
+        with open(os.path.join(CORPUS_DIR, f"{size}.md"), encoding="utf-8") as source:
+            corpus[size] = source.read()
+    return corpus
+
+
+def build_cases(corpus: Dict[str, str]) -> List[Tuple[str, Callable[[str], Any], str]]:
+    """(이름, 함수, 입력) - 입력 글자 수로 처리량을 계산"""
+    converter = KorToBraille()
+
+    def kor_translate(text: str) -> str:
+        return translate_sanitized(converter, text)
+
+    def pipeline(text: str) -> str:
+        return convert_unicode_braille_to_brf(kor_translate(sanitize_text_for_braille(text)))
+
+    cases = []
+    for size, text in corpus.items():
+        sanitized = sanitize_text_for_braille(text)
+        braille = kor_translate(sanitized)
+        cases += [
+            (f"sanitize/{size}", sanitize_text_for_braille, text),
+            (f"extract_quoted/{size}", extract_quoted_text_for_braille, text),
+            (f"kortranslate/{size}", kor_translate, sanitized),
+            (f"brf/{size}", convert_unicode_braille_to_brf, braille),
+            (f"pipeline/{size}", pipeline, text),
+        ]
+    return cases
+
+
+def measure_time(func: Callable[[str], Any], text: str, repeat: int) -> float:
+    """호출 1회 시간(초) - 0.2초 이상 걸리도록 반복 횟수를 정한 뒤 repeat번 중 최솟값"""
+    timer = timeit.Timer(lambda: func(text))
+    number, _ = timer.autorange()
+    number = max(number, 1) * 2
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def measure_allocations(func: Callable[[str], Any], text: str) -> Tuple[int, int]:
+    """호출 1회 동안의 (최대 할당 바이트, 할당된 메모리 블록 수) - tracemalloc 기준"""
+    func(text)  # 캐시/지연 초기화 제외
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_bytes, _ = tracemalloc.get_traced_memory()
+        result = func(text)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    # 결과 객체처럼 호출이 끝난 뒤에도 살아 있는 블록 수 (중간에 해제된 임시 객체는 최대 할당 바이트에 반영)
+    blocks = sum(max(stat.count_diff, 0) for stat in after.compare_to(before, "filename"))
+    del result
+    return peak_bytes - start_bytes, blocks
+
+
+def run(repeat: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name, func, text in build_cases(load_corpus()):
+        seconds = measure_time(func, text, repeat)
+        peak_bytes, blocks = measure_allocations(func, text)
+        results[name] = {
+            "chars": len(text),
+            "us_per_call": round(seconds * 1e6, 2),
+            "chars_per_sec": round(len(text) / seconds),
+            "alloc_peak_bytes": peak_bytes,
+            "alloc_blocks": blocks,
+        }
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float, alloc_tolerance: float) -> List[str]:
+    """기준값 대비 회귀 목록 (처리량 감소, 할당량 증가)"""
+    regressions = []
+    for name, current in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        floor = expected["chars_per_sec"] * (1 - tolerance)
+        if current["chars_per_sec"] < floor:
+            regressions.append(f"{name}: {current['chars_per_sec']:,} chars/s < {floor:,.0f} "
+                               f"(baseline {expected['chars_per_sec']:,})")
+        # 작은 입력은 몇 백 바이트 차이도 비율이 커지므로 1KB 여유를 둔다
+        ceiling = expected["alloc_peak_bytes"] * (1 + alloc_tolerance) + 1024
+        if current["alloc_peak_bytes"] > ceiling:
+            regressions.append(f"{name}: peak alloc {current['alloc_peak_bytes']:,} B > {ceiling:,.0f} "
+                               f"(baseline {expected['alloc_peak_bytes']:,})")
+    return regressions
+
+
+def machine_info() -> Dict[str, str]:
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "machine": platform.machine(), "processor": platform.processor()}
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="현재 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.30, help="허용하는 처리량 감소 비율")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.10, help="허용하는 최대 할당량 증가 비율")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(f"{'case':<24}{'chars':>7}{'us/call':>12}{'chars/s':>14}{'peak KB':>10}{'blocks':>8}")
+    for name, result in results.items():
+        print(f"{name:<24}{result['chars']:>7}{result['us_per_call']:>12.2f}{result['chars_per_sec']:>14,}"
+              f"{result['alloc_peak_bytes'] / 1024:>10.1f}{result['alloc_blocks']:>8}")
+
+    report = {"machine": machine_info(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+            output.write("\n")
+        print(f"기준값 저장: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"기준값 파일이 없습니다: {args.baseline} (--update-baseline으로 생성)")
+        return
+    with open(args.baseline, encoding="utf-8") as source:
+        baseline = json.load(source)
+    if baseline.get("machine") != report["machine"]:
+        print("주의: 기준값과 다른 환경에서 측정했습니다 - 처리량 비교는 참고용입니다")
+    regressions = compare(results, baseline["results"], args.tolerance, args.alloc_tolerance)
+    if regressions:
+        print("성능 회귀:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"기준값 대비 회귀 없음 (처리량 -{args.tolerance:.0%}, 할당량 +{args.alloc_tolerance:.0%} 허용)")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,113 @@
+"""
+Dify 스트림 중계 벤치마크 - 스트리밍 토큰 하나당 CPU 시간 (parsed vs raw 중계)
+
+가짜 Dify 업스트림(httpx.MockTransport)이 토큰 단위 message 프레임을 보내고, 게이트웨이
+/process를 ASGI로 직접 호출해 응답 전체를 받는 동안의 프로세스 CPU 시간을 잰다.
+점역(braille_stream)과 로그 출력은 꺼서 중계 비용만 비교한다.
+
+    python benchmarks/bench_dify_relay.py [--tokens 5000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+
+GATEWAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, GATEWAY_DIR)
+os.environ.setdefault("API_KEY", "benchmark")
+os.environ.setdefault("BRAILLE_WORKERS", "0")
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from sse import PACING_PROFILES, SSEEmitter, scan_dify_frame  # noqa: E402
+
+TOKENS = ["안녕", "하세요", ".", " 오늘", "은", " 날씨", "가", " 맑", "습니다", "!\n"]
+
+
+def dify_frames(count: int) -> list:
+    ids = {key: str(uuid.uuid4()) for key in ("conversation_id", "message_id", "task_id")}
+    frames = []
+    for i in range(count):
+        payload = {"event": "message", **ids, "id": ids["message_id"], "created_at": 1700000000,
+                   "answer": TOKENS[i % len(TOKENS)], "from_variable_selector": None}
+        frames.append("data: " + json.dumps(payload, ensure_ascii=False))
+    end = {"event": "message_end", **ids, "id": ids["message_id"], "metadata": {"usage": {}}}
+    frames.append("data: " + json.dumps(end, ensure_ascii=False))
+    return frames
+
+
+def bench_micro(frames: list, repeat: int):
+    """줄 하나 처리 비용: json.loads + 새 프레임 직렬화 vs event/answer 스캔 + 원본 전달"""
+    lines = frames[:-1]
+
+    def parsed():
+        emitter = SSEEmitter(PACING_PROFILES["passthrough"])
+        for line in lines:
+            data = json.loads(line[6:])
+            if data.get("event", "") == "message":
+                emitter.event({"event": "message", "chunk": data.get("answer", "")})
+
+    def raw():
+        emitter = SSEEmitter(PACING_PROFILES["passthrough"])
+        for line in lines:
+            event, answer = scan_dify_frame(line)
+            if event == "message" and answer is not None:
+                emitter.raw(line + "\n\n")
+
+    for name, func in (("parsed", parsed), ("raw", raw)):
+        best = min(_cpu_time(func) for _ in range(repeat))
+        print(f"  {'micro/' + name:<34}{best / len(lines) * 1e6:>10.2f} us/token")
+
+
+def _cpu_time(func) -> float:
+    started = time.process_time()
+    func()
+    return time.process_time() - started
+
+
+async def bench_gateway(frames: list, repeat: int):
+    body = ("\n\n".join(frames) + "\n\n").encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+
+    main.upstream_clients._clients["dify"] = httpx.AsyncClient(
+        base_url="http://dify.invalid/v1", transport=httpx.MockTransport(handler))
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+        for relay in ("parsed", "raw"):
+            for pacing in ("passthrough", "coalesce"):
+                request = {"query": "benchmark", "agent_id": 0, "relay": relay,
+                           "pacing": pacing, "braille_stream": False}
+                best = None
+                for _ in range(repeat):
+                    started = time.process_time()
+                    response = await client.post("/process", json=request)
+                    elapsed = time.process_time() - started
+                    assert response.status_code == 200 and "message_end" in response.text
+                    best = elapsed if best is None else min(best, elapsed)
+                tokens = len(frames) - 1
+                print(f"  {'gateway/' + relay + '+' + pacing:<34}{best / tokens * 1e6:>10.2f} us/token")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    frames = dify_frames(args.tokens)
+    print(f"CPU time per streamed token ({args.tokens} tokens, best of {args.repeat})")
+    bench_micro(frames, args.repeat)
+    asyncio.run(bench_gateway(frames, args.repeat))
+
+
+if __name__ == "__main__":
+    main_cli()
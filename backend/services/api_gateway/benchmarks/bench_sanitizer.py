@@ -0,0 +1,59 @@
+"""
+sanitize_text_for_braille / extract_quoted_text_for_braille 마이크로벤치마크
+
+긴 LLM 답변(마크다운, 이모지 포함)과 서식 없는 평문에 대해 기존 구현(tests의 legacy_*)과
+현재 구현의 1회 처리 시간을 비교한다.
+
+    python benchmarks/bench_sanitizer.py [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+GATEWAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, GATEWAY_DIR)
+sys.path.insert(0, os.path.join(GATEWAY_DIR, "tests"))
+
+from sanitizer import sanitize_text_for_braille, extract_quoted_text_for_braille  # noqa: E402
+from test_sanitizer import legacy_sanitize_text_for_braille, legacy_extract_quoted_text_for_braille  # noqa: E402
+
+LLM_PARAGRAPH = (
+    "## 오늘의 날씨 요약 🌤️\n\n"
+    "**서울**은 맑고 기온은 *23도*입니다. 미세먼지는 `보통` 수준이에요! "
+    "자세한 내용은 [기상청](https://www.weather.go.kr)에서 확인하세요.\n\n"
+    "- 부산: 흐림, 21도\n- 대구: 비, 19도 ☔\n\n"
+)
+PLAIN_PARAGRAPH = "점자는 손끝으로 읽는 문자입니다. 한글 점자는 1926년에 반포되었습니다. 오늘도 좋은 하루 보내세요.\n"
+QUOTED_PARAGRAPH = "다음 문장을 점역해 주세요: \"안녕하세요\" 그리고 '감사합니다' 입니다. "
+
+CORPUS = {
+    "llm_markdown": LLM_PARAGRAPH * 200,
+    "plain": PLAIN_PARAGRAPH * 200,
+}
+
+
+def bench(func, text, repeat):
+    return min(timeit.repeat(lambda: func(text), number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = [("sanitize/" + name, text, legacy_sanitize_text_for_braille, sanitize_text_for_braille)
+            for name, text in CORPUS.items()]
+    rows.append(("extract/quoted", QUOTED_PARAGRAPH * 200,
+                 legacy_extract_quoted_text_for_braille, extract_quoted_text_for_braille))
+
+    print(f"{'case':<24}{'chars':>8}{'legacy ms':>12}{'current ms':>12}{'speedup':>10}")
+    for name, text, legacy, current in rows:
+        assert legacy(text) == current(text), name
+        old_ms = bench(legacy, text, args.repeat)
+        new_ms = bench(current, text, args.repeat)
+        print(f"{name:<24}{len(text):>8}{old_ms:>12.3f}{new_ms:>12.3f}{old_ms / new_ms:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+게이트웨이 콜드 스타트 측정 - main 모듈 import 시간과 프로세스 시작부터 /health, /ready 응답까지의 시간
+
+- import: 새 인터프리터에서 `import main`에 걸린 시간과, -X importtime 기준 누적 시간이 큰 모듈 목록
+- ready: `uvicorn main:app`을 띄운 뒤 /health가 처음 응답한 시각(요청을 받기 시작)과
+  /ready가 200을 돌려준 시각(점역 변환기 예열 완료)까지의 시간
+
+    python benchmarks/bench_startup.py [--runs 5] [--top 15] [--braille-workers 2] [--output startup.json]
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from loadgen import free_port
+
+GATEWAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def gateway_env(braille_workers: int) -> Dict[str, str]:
+    return {**os.environ, "LOG_LEVEL": "WARNING", "HEALTH_REFRESH_INTERVAL": "0",
+            "BRAILLE_WORKERS": str(braille_workers)}
+
+
+def measure_import(env: Dict[str, str]) -> Tuple[float, List[Tuple[str, float, float]]]:
+    """(import main 시간 ms, [(모듈, 자체 ms, 누적 ms)]) - 새 인터프리터 한 번"""
+    script = "import time; t = time.perf_counter(); import main; print((time.perf_counter() - t) * 1000)"
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", script], cwd=GATEWAY_DIR, env=env,
+                               capture_output=True, text=True, check=True)
+    modules = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            modules.append((name, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return float(completed.stdout.strip().splitlines()[-1]), modules
+
+
+def poll_until(url: str, process: subprocess.Popen, started: float, timeout: float,
+               accept: Tuple[int, ...] = (200,), waiting: Tuple[int, ...] = (503,)) -> Optional[float]:
+    """
+    url이 accept 상태 코드를 돌려준 시각(started 기준 초)
+    accept도 waiting도 아닌 응답이면 엔드포인트가 없는 것으로 보고 None (/ready가 없는 이전 버전 비교용)
+    """
+    deadline = started + timeout
+    with httpx.Client(timeout=1.0) as client:
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"게이트웨이가 종료되었습니다 (exit {process.returncode})")
+            try:
+                status = client.get(url).status_code
+                if status in accept:
+                    return time.perf_counter() - started
+                if status not in waiting:
+                    return None
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.005)
+    raise RuntimeError(f"{url}이 {timeout}초 안에 응답하지 않았습니다")
+
+
+def measure_ready(env: Dict[str, str], timeout: float) -> Dict[str, Optional[float]]:
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+        "--log-level", "warning", "--no-access-log",
+    ], cwd=GATEWAY_DIR, env=env)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        # /health는 내부 서비스 상태에 따라 degraded여도 200이므로 응답 자체가 "요청을 받기 시작"한 시점
+        health = poll_until(f"{base_url}/health", process, started, timeout, accept=(200, 503), waiting=())
+        ready = poll_until(f"{base_url}/ready", process, started, timeout)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {"health_ms": round(health * 1000, 1), "ready_ms": round(ready * 1000, 1) if ready is not None else None}
+
+
+def median(values: List[Optional[float]]) -> Optional[float]:
+    present = [value for value in values if value is not None]
+    return round(statistics.median(present), 1) if present else None
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="누적 import 시간 상위 모듈 수")
+    parser.add_argument("--braille-workers", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    env = gateway_env(args.braille_workers)
+    import_runs = [measure_import(env) for _ in range(args.runs)]
+    import_ms = [total for total, _ in import_runs]
+    # 마지막 실행의 모듈별 시간 - 최상위(들여쓰기 없는) import가 아니어도 누적 시간 순으로
+    modules = sorted(import_runs[-1][1], key=lambda item: item[2], reverse=True)[:args.top]
+
+    ready_runs = [measure_ready(env, args.timeout) for _ in range(args.runs)]
+    report: Dict[str, Any] = {
+        "runs": args.runs,
+        "braille_workers": args.braille_workers,
+        "import_main_ms": {"median": median(import_ms), "min": round(min(import_ms), 1)},
+        "health_ms": median([run["health_ms"] for run in ready_runs]),
+        "ready_ms": median([run["ready_ms"] for run in ready_runs]),
+        "top_imports": [{"module": name, "self_ms": round(own, 1), "cumulative_ms": round(total, 1)}
+                        for name, own, total in modules],
+    }
+
+    print(f"import main: median {report['import_main_ms']['median']} ms (min {report['import_main_ms']['min']} ms)")
+    print(f"process start -> /health: {report['health_ms']} ms")
+    print(f"process start -> /ready:  {report['ready_ms'] if report['ready_ms'] is not None else '(없음)'} ms")
+    print(f"{'module':<40}{'self ms':>10}{'cumul ms':>10}")
+    for item in report["top_imports"]:
+        print(f"{item['module']:<40}{item['self_ms']:>10}{item['cumulative_ms']:>10}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
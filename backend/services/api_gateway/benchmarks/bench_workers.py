@@ -0,0 +1,161 @@
+"""
+게이트웨이 워커 수별 처리량 벤치마크 - 다중 워커 모드(GATEWAY_WORKERS)와 공유 점역 캐시의 확장성
+
+워커 수 단계마다 `python main.py`를 GATEWAY_WORKERS=N으로 띄우고 /convert-to-braille에 동시 요청을 보낸다.
+- unique: 매번 다른 문장 (캐시 미스, korTranslate 실행 비용이 워커 수에 따라 나뉘는지)
+- repeat: 적은 수의 같은 문장 반복 (한 워커가 점역한 결과를 다른 워커가 공유 캐시에서 가져가는지)
+점역은 기본으로 각 워커 프로세스 안에서 직접 한다 (BRAILLE_WORKERS=0) - 워커 수 외의 병렬성을 빼기 위해서.
+CPU 코어가 워커 수보다 적으면 처리량은 늘지 않으므로 결과에 CPU 수를 함께 기록한다.
+
+    python benchmarks/bench_workers.py [--workers 1,2,4] [--concurrency 32] [--requests 400] [--output workers.json]
+"""
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import httpx
+
+from loadgen import free_port, summarize, wait_ready
+
+GATEWAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CORPUS_PATH = os.path.join(GATEWAY_DIR, "benchmarks", "corpus", "long.md")
+
+
+def load_sentences() -> List[str]:
+    """말뭉치의 긴 답변을 문단 단위로 (너무 짧은 문단 제외)"""
+    with open(CORPUS_PATH, encoding="utf-8") as source:
+        return [block.strip() for block in source.read().split("\n\n") if len(block.strip()) >= 20]
+
+
+def workload_texts(kind: str, sentences: List[str], requests: int, run_id: int) -> List[str]:
+    if kind == "unique":
+        # 실행/요청마다 다른 숫자를 붙여 이전 단계의 캐시 결과를 재사용하지 않게 함
+        return [f"{sentences[i % len(sentences)]} {run_id}-{i}" for i in range(requests)]
+    return [sentences[i % 8 % len(sentences)] for i in range(requests)]
+
+
+async def run_workload(base_url: str, texts: List[str], concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    queue = list(reversed(texts))
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal errors
+        while queue:
+            text = queue.pop()
+            started = time.perf_counter()
+            try:
+                response = await client.post("/convert-to-braille", json={"text": text})
+                response.raise_for_status()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[client_loop(client) for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+    return {
+        "requests": len(texts),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "latency": summarize(latencies),
+    }
+
+
+def spawn_gateway(workers: int, braille_workers: int, extra_env: List[str]) -> Dict[str, Any]:
+    port = free_port()
+    env = {
+        **os.environ,
+        "GATEWAY_HOST": "127.0.0.1",
+        "GATEWAY_PORT": str(port),
+        "GATEWAY_WORKERS": str(workers),
+        "BRAILLE_WORKERS": str(braille_workers),
+        "LOG_LEVEL": "WARNING",
+        "HEALTH_REFRESH_INTERVAL": "0",
+    }
+    env.pop("BRAILLE_SHARED_CACHE_PATH", None)
+    for item in extra_env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    process = subprocess.Popen([sys.executable, "main.py"], cwd=GATEWAY_DIR, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(f"{base_url}/", process)
+    except BaseException:
+        process.terminate()
+        raise
+    return {"base_url": base_url, "process": process}
+
+
+def stop_gateway(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def measure(args, workers: int, sentences: List[str]) -> Dict[str, Any]:
+    gateway = spawn_gateway(workers, args.braille_workers, args.gateway_env)
+    try:
+        base_url = gateway["base_url"]
+        # 모든 워커가 연결을 받을 수 있게 된 뒤 측정 (워커마다 lifespan 예열)
+        await run_workload(base_url, workload_texts("unique", sentences, workers * 8, -1), workers * 4)
+        result = {"workers": workers}
+        for kind in ("unique", "repeat"):
+            texts = workload_texts(kind, sentences, args.requests, workers)
+            result[kind] = await run_workload(base_url, texts, args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            cache = (await client.get("/admin/braille-cache")).json()
+        # 공유 캐시면 모든 워커 합계, 단일 워커면 프로세스 안 LRU 통계
+        result["braille_cache"] = cache.get("shared", cache)
+    finally:
+        stop_gateway(gateway["process"])
+    return result
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4", help="게이트웨이 워커 수 단계 (쉼표 구분)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=400, help="워크로드마다 보낼 요청 수")
+    parser.add_argument("--braille-workers", type=int, default=0, help="워커 하나의 점역 프로세스 수")
+    parser.add_argument("--gateway-env", action="append", default=[], help="게이트웨이 환경 변수 (KEY=VALUE)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    sentences = load_sentences()
+    print(f"CPU {os.cpu_count()}개, 동시 요청 {args.concurrency}, 워크로드당 요청 {args.requests}")
+    levels = []
+    for workers in [int(value) for value in args.workers.split(",")]:
+        result = asyncio.run(measure(args, workers, sentences))
+        levels.append(result)
+        print(f"workers={workers:<3} unique {result['unique']['rps']:>8} rps (p95 {result['unique']['latency']['p95_ms']} ms)"
+              f"   repeat {result['repeat']['rps']:>8} rps (p95 {result['repeat']['latency']['p95_ms']} ms)"
+              f"   cache hit rate {result['braille_cache'].get('hit_rate')}")
+
+    base = levels[0]
+    for level in levels[1:]:
+        print(f"x{level['workers'] / base['workers']:.0f} workers: unique {level['unique']['rps'] / base['unique']['rps']:.2f}x, "
+              f"repeat {level['repeat']['rps'] / base['repeat']['rps']:.2f}x")
+
+    if args.output:
+        report = {"cpu_count": os.cpu_count(), "python": platform.python_version(),
+                  "concurrency": args.concurrency, "requests": args.requests,
+                  "braille_workers": args.braille_workers, "levels": levels}
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,298 @@
+"""
+게이트웨이 부하 생성기 - /process 동시 스트림의 처리량, 첫 청크까지의 시간(TTFC), 스트림당 메모리
+
+기본으로 가짜 Dify 서버(stub_dify.py)와 그 서버를 가리키는 게이트웨이(UPSTREAM_DIFY_BASE_URL)를
+하위 프로세스로 띄운다. 그런 다음 동시 스트림 수를 단계별로 올리며 측정하고, 결과를 JSON으로 저장해 실행끼리 비교할 수 있게 한다.
+이미 떠 있는 게이트웨이를 측정하려면 --gateway-url을 주면 된다 (메모리는 --gateway-pid를 줄 때만 측정).
+
+    python benchmarks/loadgen.py [--concurrency 1,10,50] [--requests 200] [--output loadgen.json]
+                                 [--tokens 200] [--token-interval-ms 20] [--first-token-ms 300]
+                                 [--gateway-env BRAILLE_WORKERS=4 ...]
+"""
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+GATEWAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+STUB_SCRIPT = os.path.join(GATEWAY_DIR, "benchmarks", "stub_dify.py")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_bytes(pid: Optional[int]) -> Optional[int]:
+    """프로세스 상주 메모리 (Linux /proc 기준, 읽을 수 없으면 None)"""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """초 단위 값 목록 → ms 단위 p50/p95/p99/max"""
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+    return {
+        "p50_ms": ms(percentile(values, 0.50)),
+        "p95_ms": ms(percentile(values, 0.95)),
+        "p99_ms": ms(percentile(values, 0.99)),
+        "max_ms": ms(max(values) if values else None),
+    }
+
+
+class MemorySampler:
+    """측정 구간 동안 게이트웨이 RSS 최댓값 추적"""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.02):
+        self.pid = pid
+        self.interval = interval
+        self.peak = rss_bytes(pid)
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            current = rss_bytes(self.pid)
+            if current is not None and (self.peak is None or current > self.peak):
+                self.peak = current
+            await asyncio.sleep(self.interval)
+
+    def __enter__(self):
+        if self.pid is not None:
+            self._task = asyncio.ensure_future(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        if self._task is not None:
+            self._task.cancel()
+
+
+async def one_stream(client: httpx.AsyncClient, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """/process 스트림 하나 - 상태 코드, 첫 청크까지 시간, 전체 시간, message_end 수신 여부"""
+    started = time.perf_counter()
+    ttfc = None
+    received = 0
+    completed = False
+    tail = b""
+    try:
+        async with client.stream("POST", "/process", json=payload) as response:
+            async for chunk in response.aiter_raw():
+                if ttfc is None:
+                    ttfc = time.perf_counter() - started
+                received += len(chunk)
+                # 이벤트가 청크 경계에 걸려도 찾을 수 있게 앞 청크의 끝부분을 이어 붙여 검사
+                if b'"message_end"' in tail + chunk:
+                    completed = True
+                tail = chunk[-32:]
+            status = response.status_code
+    except httpx.HTTPError as e:
+        return {"status": type(e).__name__, "ttfc": ttfc, "total": time.perf_counter() - started,
+                "bytes": received, "completed": False}
+    return {"status": status, "ttfc": ttfc, "total": time.perf_counter() - started,
+            "bytes": received, "completed": completed and status == 200}
+
+
+async def warm_up(base_url: str, payload: Dict[str, Any], count: int = 5):
+    """첫 요청의 지연 초기화(커넥션 풀, 점역 워커, 임포트)가 첫 단계 결과에 섞이지 않도록 미리 요청"""
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0) as client:
+        for i in range(count):
+            await one_stream(client, {**payload, "user": f"warmup-{i}"})
+
+
+async def run_level(base_url: str, concurrency: int, requests: int, payload: Dict[str, Any],
+                    pid: Optional[int]) -> Dict[str, Any]:
+    """동시 스트림 concurrency개를 유지하며 requests개 요청"""
+    limits = httpx.Limits(max_connections=concurrency + 8, max_keepalive_connections=concurrency + 8)
+    results: List[Dict[str, Any]] = []
+    issued = 0
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120.0) as client:
+        idle_rss = rss_bytes(pid)
+
+        async def worker(index: int):
+            nonlocal issued
+            while issued < requests:
+                issued += 1
+                body = {**payload, "user": f"load-{index}"}
+                results.append(await one_stream(client, body))
+
+        started = time.perf_counter()
+        with MemorySampler(pid) as memory:
+            await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    ok = [result for result in results if result["completed"]]
+    statuses: Dict[str, int] = {}
+    for result in results:
+        statuses[str(result["status"])] = statuses.get(str(result["status"]), 0) + 1
+    peak_rss = memory.peak
+    per_stream = None
+    if idle_rss is not None and peak_rss is not None:
+        per_stream = max(peak_rss - idle_rss, 0) / concurrency
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(results),
+        "completed": len(ok),
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+        "ttfc": summarize([result["ttfc"] for result in ok if result["ttfc"] is not None]),
+        "stream_total": summarize([result["total"] for result in ok]),
+        "avg_bytes_per_stream": round(sum(result["bytes"] for result in ok) / len(ok)) if ok else 0,
+        "memory": {
+            "idle_rss_mb": round(idle_rss / 2 ** 20, 2) if idle_rss is not None else None,
+            "peak_rss_mb": round(peak_rss / 2 ** 20, 2) if peak_rss is not None else None,
+            "per_stream_kb": round(per_stream / 1024, 1) if per_stream is not None else None,
+        },
+    }
+
+
+def wait_ready(url: str, process: Optional[subprocess.Popen], timeout: float = 60.0):
+    """서버가 응답할 때까지 대기 (하위 프로세스가 먼저 죽으면 실패)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"{url} 서버 프로세스가 종료되었습니다 (exit {process.returncode})")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} 서버가 {timeout}초 안에 준비되지 않았습니다")
+
+
+def spawn_stack(args) -> Dict[str, Any]:
+    """가짜 Dify 서버 + 그 서버를 가리키는 게이트웨이 실행"""
+    stub_port, gateway_port = free_port(), free_port()
+    stub = subprocess.Popen([
+        sys.executable, STUB_SCRIPT, "--port", str(stub_port),
+        "--tokens", str(args.tokens), "--token-interval-ms", str(args.token_interval_ms),
+        "--first-token-ms", str(args.first_token_ms), "--latency-ms", str(args.latency_ms),
+    ], cwd=GATEWAY_DIR)
+    processes = [stub]
+    try:
+        wait_ready(f"http://127.0.0.1:{stub_port}/v1/stub/stats", stub)
+
+        most = max(args.concurrency)
+        env = {
+            **os.environ,
+            "UPSTREAM_DIFY_BASE_URL": f"http://127.0.0.1:{stub_port}/v1",
+            "API_KEY": "stub",
+            "LOG_LEVEL": "WARNING",
+            "BRAILLE_WORKERS": "2",
+            # 가짜 Dify 외의 내부 서비스는 없으므로 주기적 헬스 체크 경고를 끔
+            "HEALTH_REFRESH_INTERVAL": "0",
+            # 측정하려는 동시 스트림 수가 입장 제어에 막히지 않도록 (--gateway-env로 덮어쓰기 가능)
+            "ADMISSION_DIFY_CHAT_CONCURRENCY": str(most),
+            "ADMISSION_DIFY_CHAT_QUEUE": str(most),
+        }
+        for item in args.gateway_env:
+            key, _, value = item.partition("=")
+            env[key] = value
+        gateway = subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(gateway_port),
+            "--log-level", "warning", "--no-access-log",
+        ], cwd=GATEWAY_DIR, env=env)
+        processes.append(gateway)
+        base_url = f"http://127.0.0.1:{gateway_port}"
+        wait_ready(f"{base_url}/", gateway)
+    except BaseException:
+        for process in processes:
+            process.terminate()
+        raise
+    return {"base_url": base_url, "pid": gateway.pid, "processes": processes,
+            "env": {key: env[key] for key in sorted(env) if key.startswith(("ADMISSION_", "BRAILLE_", "SSE_", "UPSTREAM_"))}}
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", default="1,10,50", help="동시 스트림 수 단계 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=200, help="단계별 요청 수 (동시 수보다 작으면 동시 수)")
+    parser.add_argument("--output", default="loadgen.json")
+    parser.add_argument("--gateway-url", help="이미 실행 중인 게이트웨이 (지정하면 하위 프로세스를 띄우지 않음)")
+    parser.add_argument("--gateway-pid", type=int, help="--gateway-url 게이트웨이의 PID (메모리 측정용)")
+    parser.add_argument("--gateway-env", action="append", default=[], help="게이트웨이 환경 변수 KEY=VALUE")
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--token-interval-ms", type=float, default=20.0)
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--agent-id", type=int, default=0)
+    parser.add_argument("--voice", action="store_true", help="is_voice=1 요청")
+    parser.add_argument("--no-braille-stream", action="store_true", help="문장 단위 점역 끄기")
+    parser.add_argument("--pacing", default=None, help="SSE pacing 프로필 (기본은 게이트웨이 설정)")
+    args = parser.parse_args()
+    args.concurrency = [int(value) for value in args.concurrency.split(",") if value.strip()]
+
+    payload: Dict[str, Any] = {"query": "오늘 날씨를 알려 주세요", "agent_id": args.agent_id,
+                               "is_voice": 1 if args.voice else 0,
+                               "braille_stream": not args.no_braille_stream}
+    if args.pacing:
+        payload["pacing"] = args.pacing
+
+    stack = None
+    if args.gateway_url:
+        base_url, pid = args.gateway_url.rstrip("/"), args.gateway_pid
+    else:
+        stack = spawn_stack(args)
+        base_url, pid = stack["base_url"], stack["pid"]
+
+    runs = []
+    try:
+        asyncio.run(warm_up(base_url, payload))
+        for concurrency in args.concurrency:
+            result = asyncio.run(run_level(base_url, concurrency, max(args.requests, concurrency), payload, pid))
+            runs.append(result)
+            print(f"  c={concurrency:<4} rps={result['rps']:<8} ttfc p50/p95/p99="
+                  f"{result['ttfc']['p50_ms']}/{result['ttfc']['p95_ms']}/{result['ttfc']['p99_ms']} ms  "
+                  f"mem/stream={result['memory']['per_stream_kb']} KB  statuses={result['statuses']}")
+    finally:
+        if stack is not None:
+            for process in stack["processes"]:
+                process.terminate()
+            for process in stack["processes"]:
+                process.wait(timeout=10)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "target": "spawned" if stack is not None else base_url,
+        "stub": {key: getattr(args, key) for key in ("tokens", "token_interval_ms", "first_token_ms", "latency_ms")}
+        if stack is not None else None,
+        "gateway_env": stack["env"] if stack is not None else None,
+        "payload": payload,
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,134 @@
+"""
+부하 테스트용 가짜 Dify 서버 - chat-messages SSE 스트림, 대화 목록/메시지, 파일 업로드/미리보기
+
+실제 agent.sapie.ai를 호출하지 않고 게이트웨이를 벤치마크할 수 있도록 Dify 응답 형식을 흉내 낸다.
+첫 토큰까지의 지연, 토큰 간격, 토큰 수, 일반 API 지연을 조절할 수 있다.
+게이트웨이는 UPSTREAM_DIFY_BASE_URL=http://127.0.0.1:<port>/v1 로 이 서버를 가리키면 된다.
+
+    python benchmarks/stub_dify.py [--port 5001] [--tokens 200] [--token-interval-ms 20]
+                                   [--first-token-ms 300] [--latency-ms 20]
+"""
+from dataclasses import dataclass
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+TOKENS = ["안녕", "하세요", ".", " 오늘", "은", " 날씨", "가", " 맑", "습니다", "!\n",
+          " 점자", "로", " 변환", "할", " 문장", "을", " 보내", "드립니다", ".", " "]
+
+
+@dataclass
+class StubConfig:
+    tokens: int = 200               # 답변 하나의 message 이벤트 수
+    token_interval_ms: float = 20.0  # 토큰 사이 간격
+    first_token_ms: float = 300.0    # 요청부터 첫 토큰까지 (모델 지연)
+    latency_ms: float = 20.0         # 스트리밍이 아닌 API의 응답 지연
+    preview_bytes: int = 256 * 1024  # 파일 미리보기 응답 크기
+
+
+def create_app(config: StubConfig) -> FastAPI:
+    app = FastAPI(title="Stub Dify")
+    stats = {"chat_streams": 0, "active_streams": 0, "requests": 0}
+
+    async def delay():
+        if config.latency_ms:
+            await asyncio.sleep(config.latency_ms / 1000)
+
+    @app.middleware("http")
+    async def count_requests(request: Request, call_next):
+        stats["requests"] += 1
+        return await call_next(request)
+
+    @app.post("/v1/chat-messages")
+    async def chat_messages(request: Request):
+        payload = await request.json()
+        conversation_id = payload.get("conversation_id") or str(uuid.uuid4())
+        message_id = str(uuid.uuid4())
+        ids = {"conversation_id": conversation_id, "message_id": message_id, "task_id": str(uuid.uuid4())}
+        tokens = config.tokens
+
+        async def stream():
+            stats["chat_streams"] += 1
+            stats["active_streams"] += 1
+            try:
+                await asyncio.sleep(config.first_token_ms / 1000)
+                for i in range(tokens):
+                    frame = {"event": "message", **ids, "id": message_id, "created_at": int(time.time()),
+                             "answer": TOKENS[i % len(TOKENS)], "from_variable_selector": None}
+                    yield f"data: {json.dumps(frame, ensure_ascii=False)}\n\n".encode()
+                    if config.token_interval_ms:
+                        await asyncio.sleep(config.token_interval_ms / 1000)
+                end = {"event": "message_end", **ids, "id": message_id,
+                       "metadata": {"usage": {"completion_tokens": tokens}}}
+                yield f"data: {json.dumps(end, ensure_ascii=False)}\n\n".encode()
+            finally:
+                stats["active_streams"] -= 1
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/v1/conversations")
+    async def conversations(user: str = "default-user", limit: int = 20):
+        await delay()
+        data = [{"id": f"conv-{i}", "name": f"대화 {i}", "inputs": {}, "status": "normal",
+                 "created_at": 1700000000 + i, "updated_at": 1700000000 + i} for i in range(limit)]
+        return {"data": data, "limit": limit, "has_more": False}
+
+    @app.get("/v1/messages")
+    async def messages(conversation_id: str, user: str = "default-user", limit: int = 20):
+        await delay()
+        data = [{"id": f"msg-{i}", "conversation_id": conversation_id, "query": f"질문 {i}",
+                 "answer": "".join(TOKENS), "message_files": [], "created_at": 1700000000 + i}
+                for i in range(limit)]
+        return {"data": data, "limit": limit, "has_more": False}
+
+    @app.delete("/v1/conversations/{conversation_id}")
+    async def delete_conversation(conversation_id: str):
+        await delay()
+        return {"result": "success"}
+
+    @app.post("/v1/files/upload")
+    async def upload(request: Request):
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+        await delay()
+        return JSONResponse({"id": str(uuid.uuid4()), "name": "upload", "size": size,
+                             "extension": "bin", "mime_type": "application/octet-stream",
+                             "created_by": "stub", "created_at": int(time.time())}, status_code=201)
+
+    @app.get("/v1/files/{file_id}/preview")
+    async def preview(file_id: str):
+        await delay()
+        return Response(b"\0" * config.preview_bytes, media_type="application/pdf")
+
+    @app.get("/v1/stub/stats")
+    async def stub_stats():
+        return stats
+
+    return app
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--tokens", type=int, default=StubConfig.tokens)
+    parser.add_argument("--token-interval-ms", type=float, default=StubConfig.token_interval_ms)
+    parser.add_argument("--first-token-ms", type=float, default=StubConfig.first_token_ms)
+    parser.add_argument("--latency-ms", type=float, default=StubConfig.latency_ms)
+    parser.add_argument("--preview-bytes", type=int, default=StubConfig.preview_bytes)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = StubConfig(args.tokens, args.token_interval_ms, args.first_token_ms, args.latency_ms, args.preview_bytes)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main_cli()
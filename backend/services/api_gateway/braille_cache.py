@@ -0,0 +1,114 @@
+"""
+점역 결과 캐시 - 정제된 텍스트 해시 → 점자 결과 LRU (선택적 TTL)
+인사말, 에이전트 안내 문구처럼 반복되는 텍스트의 korTranslate 재실행을 막는다.
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional, Tuple
+import hashlib
+import os
+import time
+
+
+def text_digest(sanitized_text: str) -> bytes:
+    """캐시 키 - 긴 원문 대신 고정 길이 해시를 보관"""
+    return hashlib.blake2b(sanitized_text.encode("utf-8"), digest_size=16).digest()
+
+
+class BrailleCache:
+    """
+    크기 제한 LRU 캐시
+
+    - max_entries: 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+    - ttl: 항목 유효 시간(초), 0이면 만료 없음
+    - max_bytes: 점자 결과(UTF-8) 전체 크기 상한, 0이면 제한 없음 (이보다 큰 결과 하나는 저장하지 않음)
+    - clock: 저장/만료 시각 기준 (기본 time.monotonic)
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 0.0, max_bytes: int = 0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        # 키 → (점자 결과, 저장 시각, 결과 바이트 수)
+        self._entries: "OrderedDict[bytes, Tuple[str, float, int]]" = OrderedDict()
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.too_large = 0
+        self.saved_chars = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["BrailleCache"]:
+        """
+        BRAILLE_CACHE_SIZE (0이면 비활성화), BRAILLE_CACHE_TTL, BRAILLE_CACHE_MAX_BYTES (0이면 제한 없음)
+        환경 변수로 생성
+        """
+        max_entries = int(os.getenv("BRAILLE_CACHE_SIZE", "4096"))
+        if max_entries <= 0:
+            return None
+        return cls(
+            max_entries=max_entries,
+            ttl=float(os.getenv("BRAILLE_CACHE_TTL", "0")),
+            max_bytes=int(os.getenv("BRAILLE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        )
+
+    def get(self, sanitized_text: str) -> Optional[str]:
+        key = text_digest(sanitized_text)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        braille, stored_at, size = entry
+        if self.ttl and self._clock() - stored_at > self.ttl:
+            del self._entries[key]
+            self.total_bytes -= size
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self.saved_chars += len(sanitized_text)
+        return braille
+
+    def put(self, sanitized_text: str, braille: str):
+        size = len(braille.encode("utf-8"))
+        if self.max_bytes and size > self.max_bytes:
+            self.too_large += 1
+            return
+        key = text_digest(sanitized_text)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= previous[2]
+        self._entries[key] = (braille, self._clock(), size)
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or (self.max_bytes and self.total_bytes > self.max_bytes):
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "too_large": self.too_large,
+            "saved_chars": self.saved_chars,
+        }
@@ -0,0 +1,350 @@
+"""
+점역 실행 엔진 - CPU를 많이 쓰는 KorToBraille 변환을 프로세스 풀에서 수행
+게이트웨이 이벤트 루프가 긴 문서 점역 동안 다른 SSE 스트림을 멈추지 않게 한다.
+프로세스 풀 관련 모듈(multiprocessing)은 풀을 처음 만들 때 import한다 (인라인 모드/콜드 스타트 단축).
+"""
+from concurrent.futures import BrokenExecutor
+from typing import Dict, Any, Optional, Set, Tuple, Union
+import asyncio
+import logging
+import os
+import time
+
+from KorToBraille.KorToBraille import KorToBraille
+from KorToBraille import NumberFunc, PunctuationFunc
+
+from admission import INTERACTIVE, AdmissionLimiter, AdmissionRejected, Permit
+from braille_cache import BrailleCache
+from metrics import REGISTRY
+from shared_braille_cache import SharedBrailleCache
+
+logger = logging.getLogger(__name__)
+
+# korTranslate 자체 실행 시간 (워커 안에서 잰 값) / 대기열·프로세스 간 전달을 포함한 점역 요청 시간
+KORTRANSLATE_SECONDS = REGISTRY.histogram(
+    "gateway_braille_kortranslate_seconds",
+    "KorToBraille.korTranslate execution time inside the converter process")
+TRANSLATE_SECONDS = REGISTRY.histogram(
+    "gateway_braille_translate_seconds",
+    "Braille translate request time including queueing and worker round trip (cache misses)", ("priority",))
+
+# 워커 프로세스마다 하나씩 유지하는 변환기 (프로세스 풀 initializer에서 생성)
+_worker_converter: Optional[KorToBraille] = None
+
+# 예열에 쓰는 문장 (한글, 숫자, 공백 경로를 한 번씩 거치게)
+WARMUP_TEXT = "점자 변환 준비 1"
+# 예열 확인 작업 하나가 워커를 붙잡는 시간(초)
+WARMUP_PROBE_HOLD = 0.02
+# 예열 중 워커 풀이 깨졌을 때 새 풀로 다시 예열하기 전 대기 시간(초)
+WARMUP_RETRY_DELAY = 0.5
+
+
+def translate_sanitized(converter: KorToBraille, sanitized_text: str) -> str:
+    """
+    정제된 텍스트를 점자로 변환합니다.
+    KorToBraille은 숫자/따옴표 플래그를 모듈 전역에 남기므로, 이전 요청의 상태가
+    결과에 섞이지 않도록 매 호출 전에 초기화합니다.
+    """
+    NumberFunc.isdigit_flag = False
+    PunctuationFunc.open_flag = False
+    return converter.korTranslate(sanitized_text)
+
+
+def _init_worker():
+    """워커 프로세스 시작 시 변환기 생성 및 예열"""
+    global _worker_converter
+    _worker_converter = KorToBraille()
+    translate_sanitized(_worker_converter, WARMUP_TEXT)
+
+
+def _worker_translate(sanitized_text: str) -> Tuple[str, float]:
+    """(점자, korTranslate 실행 시간) - 실행 시간은 부모 프로세스 메트릭에 기록"""
+    started = time.perf_counter()
+    braille = translate_sanitized(_worker_converter, sanitized_text)
+    return braille, time.perf_counter() - started
+
+
+def _worker_ready(hold: float = 0.0) -> int:
+    """
+    워커 pid - 작업은 initializer(_init_worker) 예열이 끝난 프로세스만 받으므로 돌아온 pid는 예열 완료된 워커다.
+    hold만큼 붙잡아 먼저 뜬 워커 하나가 확인 작업을 모두 가져가지 않게 한다.
+    """
+    if hold:
+        time.sleep(hold)
+    return os.getpid()
+
+
+def _release_on_loop(loop: asyncio.AbstractEventLoop, permit: Permit):
+    """워커 작업 완료 콜백(풀 관리 스레드)에서 이벤트 루프로 슬롯 반환을 넘김"""
+    try:
+        loop.call_soon_threadsafe(permit.release)
+    except RuntimeError:
+        pass  # 이벤트 루프가 이미 닫힘 (종료 중)
+
+
+class BrailleEngineBusy(Exception):
+    """대기열이 가득 차서 점역 요청을 받을 수 없음"""
+
+
+class BrailleEngine:
+    """
+    KorToBraille 프로세스 풀 실행기
+
+    - workers: 워커 프로세스 수 (0이면 이벤트 루프 프로세스에서 직접 변환, 개발용)
+    - max_queue: 동시에 처리 중이거나 대기 중인 요청 수 상한 (초과 시 BrailleEngineBusy)
+    - timeout: 요청당 대기 시간 상한 (초과 시 asyncio.TimeoutError)
+    - cache: 결과 캐시 (적중 시 워커를 거치지 않음, 다중 워커 배포에서는 프로세스 간 공유 캐시)
+
+    워커 수만큼만 프로세스 풀에 넘기고 나머지는 우선순위 대기열에서 기다리게 해,
+    일괄 점역이 풀 대기열을 채워도 음성/대화 요청이 그 뒤에 줄 서지 않게 한다.
+    start()는 예열을 백그라운드로 시작만 하고, 예열 완료 여부는 ready로 확인한다.
+    """
+
+    def __init__(self, workers: int, max_queue: int = 256, timeout: float = 10.0,
+                 start_method: str = "spawn", cache: Optional[Union[BrailleCache, SharedBrailleCache]] = None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.start_method = start_method
+        self.cache = cache
+        self._executor = None  # ProcessPoolExecutor (처음 필요할 때 생성)
+        self._inline_converter: Optional[KorToBraille] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._ready = False
+        self._warmup_seconds: Optional[float] = None
+        self._warm_pids: Set[int] = set()
+        self._scheduler = AdmissionLimiter(
+            "braille", max(workers, 1), max(max_queue - max(workers, 1), 1), timeout,
+        )
+
+        self._pending = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._total_seconds = 0.0
+        self._total_chars = 0
+
+    @classmethod
+    def from_env(cls) -> "BrailleEngine":
+        """
+        BRAILLE_WORKERS, BRAILLE_MAX_QUEUE, BRAILLE_TIMEOUT, BRAILLE_START_METHOD, BRAILLE_CACHE_* 환경 변수로 생성
+        BRAILLE_SHARED_CACHE_PATH가 있으면 프로세스 안 LRU 대신 그 파일의 공유 캐시를 사용
+        """
+        workers = os.getenv("BRAILLE_WORKERS")
+        cache = SharedBrailleCache.from_env() if os.getenv("BRAILLE_SHARED_CACHE_PATH") else BrailleCache.from_env()
+        return cls(
+            workers=int(workers) if workers else (os.cpu_count() or 1),
+            max_queue=int(os.getenv("BRAILLE_MAX_QUEUE", "256")),
+            timeout=float(os.getenv("BRAILLE_TIMEOUT", "10.0")),
+            start_method=os.getenv("BRAILLE_START_METHOD", "spawn"),
+            cache=cache,
+        )
+
+    def _create_executor(self):
+        from concurrent.futures import ProcessPoolExecutor
+        import multiprocessing
+
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_worker,
+        )
+
+    async def start(self):
+        """
+        변환기 예열을 백그라운드 태스크로 시작하고 바로 반환 (서버는 예열을 기다리지 않고 요청을 받음)
+        예열 중 들어온 점역 요청은 워커 프로세스가 뜨는 대로 처리된다.
+        """
+        if self._warmup_task is None or self._warmup_task.done():
+            self._warmup_task = asyncio.create_task(self._warm_up())
+
+    async def _warm_up(self):
+        """워커 프로세스를 띄우고 모든 워커의 변환기를 예열 (인라인 모드면 이 프로세스의 변환기)"""
+        started = time.perf_counter()
+        try:
+            if self.workers <= 0:
+                if self._inline_converter is None:
+                    self._inline_converter = KorToBraille()
+                translate_sanitized(self._inline_converter, WARMUP_TEXT)
+                self._warm_pids = {os.getpid()}
+            else:
+                loop = asyncio.get_running_loop()
+                # 확인 작업 N개가 서로 다른 N개 프로세스에서 돈다는 보장은 없으므로
+                # 서로 다른 pid가 워커 수만큼 모일 때까지 반복
+                while len(self._warm_pids) < self.workers:
+                    if self._executor is None:
+                        self._executor = self._create_executor()
+                    executor = self._executor
+                    try:
+                        pids = await asyncio.gather(*[
+                            loop.run_in_executor(executor, _worker_ready, WARMUP_PROBE_HOLD)
+                            for _ in range(self.workers)
+                        ])
+                    except BrokenExecutor:
+                        # 예열 중 워커가 죽음 - 새 풀을 만들어 처음부터 다시 예열
+                        self._discard_pool(executor)
+                        logger.warning("Braille worker died during warm-up, retrying with a new pool")
+                        await asyncio.sleep(WARMUP_RETRY_DELAY)
+                        continue
+                    # 그 사이 점역 요청이 풀을 바꿨으면 이전 풀의 pid는 세지 않는다
+                    if self._executor is executor:
+                        self._warm_pids.update(pids)
+        except Exception as e:
+            logger.error("Braille engine warm-up failed: %s", e, exc_info=True)
+            return
+        self._warmup_seconds = time.perf_counter() - started
+        self._ready = True
+        logger.info("Braille engine ready in %.0f ms: %s", self._warmup_seconds * 1000,
+                    f"{self.workers} worker processes {sorted(self._warm_pids)}" if self.workers > 0
+                    else "inline (BRAILLE_WORKERS=0)")
+
+    async def wait_ready(self):
+        """예열이 끝날 때까지 대기 (start() 이후)"""
+        if self._warmup_task is not None:
+            await asyncio.shield(self._warmup_task)
+
+    @property
+    def ready(self) -> bool:
+        """모든 변환기 예열 완료 여부 (/ready)"""
+        return self._ready
+
+    @property
+    def warmup_seconds(self) -> Optional[float]:
+        """start()부터 예열 완료까지 걸린 시간 (완료 전이면 None)"""
+        return self._warmup_seconds
+
+    def _discard_pool(self, broken) -> bool:
+        """깨진 풀을 버림 (이미 다른 요청이 새 풀로 바꿨으면 False) - 새 풀은 예열이 끝날 때까지 ready가 아니다"""
+        if self._executor is not broken:
+            return False
+        self._executor = None
+        self._warm_pids = set()
+        self._ready = False
+        broken.shutdown(wait=False, cancel_futures=True)
+        return True
+
+    def _recreate_pool(self, broken):
+        """점역 중 워커가 비정상 종료됨 - 풀을 버리고 새 풀 예열 (예열이 진행 중이면 그 예열이 새 풀을 만든다)"""
+        if not self._discard_pool(broken):
+            return
+        logger.error("Braille worker pool broken, recreating")
+        if self._warmup_task is None or self._warmup_task.done():
+            self._warmup_task = asyncio.create_task(self._warm_up())
+
+    def shutdown(self):
+        """워커 프로세스 종료 (대기 중인 작업은 취소)"""
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._warm_pids = set()
+
+    async def _run_in_worker(self, sanitized_text: str, priority: str) -> str:
+        """우선순위 순서로 워커 슬롯을 받아 실행 - 슬롯 대기와 변환을 합쳐 timeout 안에 끝나야 함"""
+        started = time.perf_counter()
+        try:
+            permit = await self._scheduler.acquire(priority)
+        except AdmissionRejected as e:
+            if e.reason == "queue wait timeout":
+                raise asyncio.TimeoutError() from e
+            raise BrailleEngineBusy(f"점역 대기열이 가득 찼습니다 ({self.max_queue})") from e
+
+        if self._executor is None:
+            self._executor = self._create_executor()
+        executor = self._executor
+        try:
+            job = executor.submit(_worker_translate, sanitized_text)
+        except BaseException as e:
+            permit.release()
+            if isinstance(e, BrokenExecutor):
+                self._recreate_pool(executor)
+            raise
+        # 슬롯은 워커 작업이 끝날 때 반환 (타임아웃으로 먼저 포기해도 실행 중인 작업은 슬롯을 계속 차지)
+        loop = asyncio.get_running_loop()
+        job.add_done_callback(lambda _: _release_on_loop(loop, permit))
+        remaining = self.timeout - (time.perf_counter() - started)
+        try:
+            braille, elapsed = await asyncio.wait_for(asyncio.wrap_future(job), timeout=max(remaining, 0.0))
+        except BrokenExecutor:
+            self._recreate_pool(executor)
+            raise
+        KORTRANSLATE_SECONDS.observe(elapsed)
+        return braille
+
+    async def translate(self, sanitized_text: str, priority: str = INTERACTIVE) -> str:
+        """정제된 텍스트를 점자로 변환 (워커 프로세스에서 실행, priority는 admission 우선순위)"""
+        if not sanitized_text:
+            return ""
+
+        if self.cache is not None:
+            cached = self.cache.get(sanitized_text)
+            if cached is not None:
+                return cached
+
+        self._pending += 1
+        self._peak_pending = max(self._peak_pending, self._pending)
+        started = time.perf_counter()
+        try:
+            if self.workers <= 0:
+                if self._inline_converter is None:
+                    self._inline_converter = KorToBraille()
+                result = translate_sanitized(self._inline_converter, sanitized_text)
+                KORTRANSLATE_SECONDS.observe(time.perf_counter() - started)
+            else:
+                # 타임아웃 시 결과를 기다리지 않을 뿐, 이미 실행 중인 워커 작업은 끝까지 진행된다
+                result = await self._run_in_worker(sanitized_text, priority)
+        except BrailleEngineBusy:
+            self._rejected += 1
+            raise
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise
+        except BrokenExecutor:
+            # 워커가 비정상 종료됨 - 풀은 _run_in_worker가 새로 만들어 다시 예열한다
+            self._failed += 1
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self._completed += 1
+        elapsed = time.perf_counter() - started
+        self._total_seconds += elapsed
+        TRANSLATE_SECONDS.observe(elapsed, priority)
+        self._total_chars += len(sanitized_text)
+        if self.cache is not None:
+            self.cache.put(sanitized_text, result)
+        return result
+
+    @property
+    def pending(self) -> int:
+        """처리 중이거나 대기 중인 점역 요청 수"""
+        return self._pending
+
+    def stats(self) -> Dict[str, Any]:
+        """대기열 깊이 및 처리 통계"""
+        in_flight = min(self._pending, self.workers) if self.workers > 0 else self._pending
+        return {
+            "ready": self._ready,
+            "warmup_ms": round(self._warmup_seconds * 1000, 1) if self._warmup_seconds is not None else None,
+            "warm_pids": sorted(self._warm_pids),
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "timeout": self.timeout,
+            "pending": self._pending,
+            "in_flight": in_flight,
+            "queue_depth": self._pending - in_flight,
+            "peak_pending": self._peak_pending,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "timeouts": self._timeouts,
+            "avg_latency_ms": round(self._total_seconds / self._completed * 1000, 3) if self._completed else 0.0,
+            "chars_translated": self._total_chars,
+            "scheduler": self._scheduler.stats(),
+        }
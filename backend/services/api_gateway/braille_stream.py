@@ -0,0 +1,89 @@
+"""
+스트리밍 점역 유틸리티 - Dify 응답 청크에서 완성된 문장을 잘라내 점자로 먼저 변환
+"""
+from typing import Callable, List
+
+# 문장 종결 부호 (뒤에 공백이 오면 문장 경계로 본다)
+SENTENCE_TERMINATORS = frozenset(".?!…。")
+
+# KorToBraille 숫자 플래그를 끊지 않는 문장 부호 (NumberFunc.number_punctuation_valid)
+NUMBER_CONTINUATION = frozenset(".,:-·")
+
+
+def leaves_translator_state(sanitized_text: str) -> bool:
+    """
+    korTranslate가 이 텍스트를 변환한 뒤 모듈 전역 상태가 초기값이 아닌지 확인.
+
+    KorToBraille은 숫자 플래그(숫자 뒤 단어의 수표 생략)와 따옴표 플래그(여는/닫는
+    따옴표)를 호출 사이에 유지하므로, 상태가 남는 지점에서 자르면 조각별 변환 결과가
+    전체 변환 결과와 달라진다.
+    """
+    if sanitized_text.count('"') % 2:
+        return True
+    for char in reversed(sanitized_text):
+        if char.isspace() or char in NUMBER_CONTINUATION:
+            continue
+        return char.isdigit()
+    return False
+
+
+class SentenceSegmenter:
+    """
+    스트리밍 텍스트 청크를 누적하면서 독립적으로 점역 가능한 문장 단위로 잘라낸다.
+
+    경계는 줄바꿈, 또는 문장 종결 부호 뒤의 공백이다. 잘라낸 조각은 항상 공백으로
+    끝나므로, 조각별 점역 결과를 이어 붙이면 전체 텍스트를 한 번에 점역한 결과와 같다
+    (korTranslate는 공백 단위로 단어를 변환하고, sanitize의 마크다운 규칙은 한 줄
+    안에서만 동작한다). 마크다운 링크 `[text](url)`가 걸쳐 있을 수 있는 줄은 줄바꿈이
+    올 때까지, 번역기 상태가 남는 조각은 다음 조각과 합쳐질 때까지 내보내지 않는다.
+    """
+
+    def __init__(self, sanitize: Callable[[str], str]):
+        self._sanitize = sanitize
+        self._buffer = ""
+        self._scan_from = 0
+        self._pending = ""
+
+    def _split(self, chunk: str) -> List[str]:
+        buffer = self._buffer + chunk
+        segments = []
+        cut = 0
+        for i in range(self._scan_from, len(buffer)):
+            char = buffer[i]
+            if char == "\n":
+                pass
+            elif char.isspace() and i > cut and buffer[i - 1] in SENTENCE_TERMINATORS:
+                if "[" in buffer[cut:i]:
+                    continue
+            else:
+                continue
+            segments.append(buffer[cut:i + 1])
+            cut = i + 1
+
+        self._buffer = buffer[cut:]
+        self._scan_from = len(self._buffer)
+        return segments
+
+    def feed(self, chunk: str) -> List[str]:
+        """청크를 추가하고 새로 완성된 문장 조각들을 정제(sanitize)된 형태로 반환"""
+        if not chunk:
+            return []
+
+        ready = []
+        for segment in self._split(chunk):
+            self._pending += segment
+            sanitized = self._sanitize(self._pending)
+            if leaves_translator_state(sanitized):
+                continue
+            self._pending = ""
+            if sanitized:
+                ready.append(sanitized)
+        return ready
+
+    def flush(self) -> str:
+        """스트림 종료 시 남은 조각을 정제된 형태로 반환"""
+        tail = self._pending + self._buffer
+        self._pending = ""
+        self._buffer = ""
+        self._scan_from = 0
+        return self._sanitize(tail)
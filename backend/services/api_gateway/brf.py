@@ -0,0 +1,204 @@
+"""
+BRF(Braille Ready Format) 변환 - 유니코드 점자 → BRF ASCII 변환 및 쪽/줄 배치
+긴 문서도 쪽 단위로 만들어 내보내므로 전체 결과를 한 번에 메모리에 올리지 않는다.
+"""
+from typing import Iterator, List, Tuple
+import os
+
+# 유니코드 점자 패턴을 BRF ASCII 문자로 변환하는 딕셔너리 (새로운 정확한 테이블)
+UNICODE_TO_BRF = {
+    '⠀': ' ',   # 20 (space)
+    '⠮': '!',   # 21 !
+    '⠐': '"',   # 22 "
+    '⠼': '#',   # 23 #
+    '⠫': '$',   # 24 $
+    '⠩': '%',   # 25 %
+    '⠯': '&',   # 26 &
+    '⠄': "'",   # 27 '
+    '⠷': '(',   # 28 (
+    '⠾': ')',   # 29 )
+    '⠡': '*',   # 2A *
+    '⠬': '+',   # 2B +
+    '⠠': ',',   # 2C ,
+    '⠤': '-',   # 2D -
+    '⠨': '.',   # 2E .
+    '⠌': '/',   # 2F /
+    '⠴': '0',   # 30 0
+    '⠂': '1',   # 31 1
+    '⠆': '2',   # 32 2
+    '⠒': '3',   # 33 3
+    '⠲': '4',   # 34 4
+    '⠢': '5',   # 35 5
+    '⠖': '6',   # 36 6
+    '⠶': '7',   # 37 7
+    '⠦': '8',   # 38 8
+    '⠔': '9',   # 39 9
+    '⠱': ':',   # 3A :
+    '⠰': ';',   # 3B ;
+    '⠣': '<',   # 3C <
+    '⠿': '=',   # 3D =
+    '⠜': '>',   # 3E >
+    '⠹': '?',   # 3F ?
+    '⠈': '@',   # 40 @
+    '⠁': 'A',   # 41 A
+    '⠃': 'B',   # 42 B
+    '⠉': 'C',   # 43 C
+    '⠙': 'D',   # 44 D
+    '⠑': 'E',   # 45 E
+    '⠋': 'F',   # 46 F
+    '⠛': 'G',   # 47 G
+    '⠓': 'H',   # 48 H
+    '⠊': 'I',   # 49 I
+    '⠚': 'J',   # 4A J
+    '⠅': 'K',   # 4B K
+    '⠇': 'L',   # 4C L
+    '⠍': 'M',   # 4D M
+    '⠝': 'N',   # 4E N
+    '⠕': 'O',   # 4F O
+    '⠏': 'P',   # 50 P
+    '⠟': 'Q',   # 51 Q
+    '⠗': 'R',   # 52 R
+    '⠎': 'S',   # 53 S
+    '⠞': 'T',   # 54 T
+    '⠥': 'U',   # 55 U
+    '⠧': 'V',   # 56 V
+    '⠺': 'W',   # 57 W
+    '⠭': 'X',   # 58 X
+    '⠽': 'Y',   # 59 Y
+    '⠵': 'Z',   # 5A Z
+    '⠪': '[',   # 5B [
+    '⠳': '\\',  # 5C \
+    '⠻': ']',   # 5D ]
+    '⠘': '^',   # 5E ^
+    '⠸': '_',   # 5F _
+}
+
+
+class _BrfTranslateTable(dict):
+    """str.translate용 코드 포인트 → BRF 문자 테이블 (테이블에 없는 문자는 '?')"""
+
+    def __missing__(self, codepoint: int) -> str:
+        # 처음 본 문자는 '?'로 기록해 두어 이후에는 C 수준 조회로 끝나게 한다
+        self[codepoint] = '?'
+        return '?'
+
+
+_BRF_TABLE = _BrfTranslateTable({ord(braille): ascii_char for braille, ascii_char in UNICODE_TO_BRF.items()})
+
+# 쪽/줄 배치용 테이블 - 원문의 줄바꿈은 강제 줄바꿈으로 남긴다
+_BRF_LAYOUT_TABLE = _BrfTranslateTable(_BRF_TABLE)
+_BRF_LAYOUT_TABLE.update({ord("\n"): "\n", ord("\r"): None})
+
+# 쪽 구분 (Form Feed) 및 줄 끝
+FORM_FEED = "\f"
+LINE_END = "\r\n"
+
+# 한 번에 변환할 원문 길이 (스트리밍 시 메모리 사용량 상한)
+SOURCE_CHUNK_CHARS = 64 * 1024
+
+
+def convert_unicode_braille_to_brf(unicode_text: str) -> str:
+    """
+    유니코드 점자 문자열을 BRF 아스키 문자열로 변환합니다.
+    매핑 테이블에 없는 문자는 '?'로 처리합니다.
+    """
+    return unicode_text.translate(_BRF_TABLE)
+
+
+class BrfPageFormatter:
+    """
+    BRF 텍스트를 쪽/줄 단위로 배치
+
+    - cells_per_line: 한 줄의 칸 수 (단어 경계에서 줄을 바꾸고, 한 줄보다 긴 단어는 잘라서 넘김)
+      0이면 줄 배치 없이 변환 결과를 그대로 내보낸다.
+    - lines_per_page: 한 쪽의 줄 수 (0이면 쪽 나눔 없음). 둘째 쪽부터는 앞에 Form Feed를 붙인다.
+
+    원문의 줄바꿈은 강제 줄바꿈으로 유지하며, 단어 사이 공백은 한 칸으로 배치한다.
+    """
+
+    def __init__(self, cells_per_line: int = 40, lines_per_page: int = 25):
+        self.cells_per_line = cells_per_line
+        self.lines_per_page = lines_per_page
+        self.pages = 0
+        self._carry = ""
+        self._line = ""
+        self._lines: List[str] = []
+
+    def feed(self, brf_text: str) -> List[str]:
+        """BRF 텍스트를 추가하고 새로 완성된 쪽들을 반환 (마지막 단어는 다음 입력과 이어질 수 있어 보류)"""
+        if self.cells_per_line <= 0:
+            return [brf_text] if brf_text else []
+
+        text = self._carry + brf_text
+        cut = max(text.rfind(" "), text.rfind("\n"))
+        self._carry = text[cut + 1:]
+        pages = []
+        for paragraph_index, paragraph in enumerate(text[:cut + 1].split("\n")):
+            if paragraph_index:
+                self._end_line(pages, force=True)
+            for word in paragraph.split(" "):
+                if word:
+                    self._add_word(word, pages)
+        return pages
+
+    def finish(self) -> List[str]:
+        """남은 단어와 줄을 마지막 쪽으로 내보냄"""
+        if self.cells_per_line <= 0:
+            return []
+
+        pages = []
+        if self._carry:
+            self._add_word(self._carry, pages)
+            self._carry = ""
+        if self._line:
+            self._end_line(pages)
+        if self._lines:
+            pages.append(self._render_page())
+        return pages
+
+    def _add_word(self, word: str, pages: List[str]):
+        width = self.cells_per_line
+        if self._line and len(self._line) + 1 + len(word) <= width:
+            self._line += " " + word
+            return
+        if self._line:
+            self._end_line(pages)
+        while len(word) > width:
+            self._line = word[:width]
+            self._end_line(pages)
+            word = word[width:]
+        self._line = word
+
+    def _end_line(self, pages: List[str], force: bool = False):
+        if not self._line and not force:
+            return
+        self._lines.append(self._line)
+        self._line = ""
+        if self.lines_per_page > 0 and len(self._lines) >= self.lines_per_page:
+            pages.append(self._render_page())
+
+    def _render_page(self) -> str:
+        page = LINE_END.join(self._lines) + LINE_END
+        if self.pages:
+            page = FORM_FEED + page
+        self.pages += 1
+        self._lines = []
+        return page
+
+
+def iter_brf_pages(unicode_text: str, cells_per_line: int = 40, lines_per_page: int = 25,
+                   chunk_chars: int = SOURCE_CHUNK_CHARS) -> Iterator[str]:
+    """유니코드 점자 텍스트를 일정 길이씩 BRF로 변환하면서 완성된 쪽을 차례로 생성"""
+    formatter = BrfPageFormatter(cells_per_line, lines_per_page)
+    table = _BRF_LAYOUT_TABLE if cells_per_line > 0 else _BRF_TABLE
+    for start in range(0, len(unicode_text), chunk_chars):
+        yield from formatter.feed(unicode_text[start:start + chunk_chars].translate(table))
+    yield from formatter.finish()
+
+
+def layout_from_env() -> Tuple[int, int]:
+    """BRF_CELLS_PER_LINE, BRF_LINES_PER_PAGE 환경 변수 (기본 40칸 x 25줄)"""
+    return (
+        int(os.getenv("BRF_CELLS_PER_LINE", "40")),
+        int(os.getenv("BRF_LINES_PER_PAGE", "25")),
+    )
@@ -0,0 +1,307 @@
+"""
+디스크 캐시 - 키 해시를 파일 이름으로 쓰는 응답 본문 캐시 (전체 크기 제한 LRU)
+업스트림 응답을 클라이언트로 흘려보내면서 임시 파일에 함께 기록하고, 끝까지 받은 경우에만
+rename으로 확정하므로 중간에 끊긴 응답이 캐시에 남지 않는다.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(*parts: Any) -> str:
+    """캐시 키 - 구성 요소들의 JSON 표현 해시 (파일 이름으로 사용)"""
+    raw = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# 캐시 파일을 읽어 보낼 때의 청크 크기
+READ_CHUNK_BYTES = 64 * 1024
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Range 헤더("bytes=0-99", "bytes=100-", "bytes=-100")를 [start, end] 구간으로 변환
+    헤더가 없거나 여러 구간/해석할 수 없는 형식이면 None (전체 전송),
+    만족할 수 없는 구간이면 ValueError (416 응답).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, sep, last = header[len("bytes="):].strip().partition("-")
+    if not sep or not (first or last) or not (first or "0").isdigit() or not (last or "0").isdigit():
+        return None
+    if not first:
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("unsatisfiable range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+
+def iter_file_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    """
+    파일의 [start, end] 구간을 청크 단위로 읽는 이터레이터 (StreamingResponse가 스레드 풀에서 실행)
+    파일은 호출 시점에 바로 열어 두므로, 전송 중 LRU 제거로 파일이 지워져도 끝까지 읽을 수 있다.
+    """
+    f = open(path, "rb")
+
+    def chunks() -> Iterator[bytes]:
+        with f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(READ_CHUNK_BYTES, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    return chunks()
+
+
+@dataclass
+class DiskCacheEntry:
+    key: str
+    path: str
+    size: int
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class DiskCache:
+    """
+    디렉터리 하나를 쓰는 LRU 캐시
+
+    - directory: 캐시 파일 위치 (<key>.bin 본문 + <key>.json 메타데이터)
+    - max_bytes: 본문 파일 전체 크기 상한 (초과 시 가장 오래 사용하지 않은 항목부터 삭제)
+    - max_entry_bytes: 항목 하나의 최대 크기 (더 큰 응답은 전달만 하고 저장하지 않음)
+
+    - worker_slots: 다중 워커 모드의 워커 수 (0이면 단일 프로세스, directory를 바로 사용)
+
+    재시작 후에도 디렉터리의 기존 항목을 마지막 사용 시각(mtime) 순서로 다시 읽어 들인다.
+    파일 쓰기는 페이지 캐시에 들어가는 작은 청크 단위라 이벤트 루프에서 바로 수행한다.
+
+    인덱스는 프로세스 메모리에 있으므로 한 디렉터리는 한 프로세스만 써야 한다. worker_slots를 주면
+    생성 시에는 디렉터리를 읽지 않고, 워커가 claim_worker_directory()로 자기 하위 디렉터리를 잡은 뒤 사용한다.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_entry_bytes: Optional[int] = None, name: str = "cache",
+                 worker_slots: int = 0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes or max_bytes, max_bytes)
+        self.name = name
+        self.worker_slots = worker_slots
+        self._slot_lock: Optional[int] = None
+        self._entries: "OrderedDict[str, DiskCacheEntry]" = OrderedDict()
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.aborted = 0
+        self.served_bytes = 0
+
+        if not worker_slots:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+    @classmethod
+    def from_env(cls, prefix: str, default_dir: str, default_max_bytes: int,
+                 default_entry_bytes: Optional[int] = None, workers: int = 1) -> Optional["DiskCache"]:
+        """
+        <PREFIX>_DIR, <PREFIX>_MAX_BYTES (0이면 비활성화), <PREFIX>_MAX_ENTRY_BYTES 환경 변수로 생성
+        workers > 1이면 워커마다 <PREFIX>_DIR/worker-<i>를 따로 쓰고, 전체 상한이 설정값을 넘지 않도록
+        <PREFIX>_MAX_BYTES를 워커 수로 나눈다.
+        """
+        max_bytes = int(os.getenv(f"{prefix}_MAX_BYTES", str(default_max_bytes)))
+        if max_bytes <= 0:
+            return None
+        entry_bytes = os.getenv(f"{prefix}_MAX_ENTRY_BYTES")
+        return cls(
+            os.getenv(f"{prefix}_DIR", default_dir),
+            max_bytes // workers if workers > 1 else max_bytes,
+            int(entry_bytes) if entry_bytes else default_entry_bytes,
+            name=prefix.lower(),
+            worker_slots=workers if workers > 1 else 0,
+        )
+
+    def claim_worker_directory(self) -> bool:
+        """
+        다중 워커 모드 - <directory>/worker-<i> 중 다른 워커가 잠그지 않은 슬롯을 잠그고(flock) 그 디렉터리를 사용
+        잠금은 프로세스가 끝날 때까지 유지되므로 각 하위 디렉터리는 한 워커만 쓰고(_load의 임시 파일 정리도 안전),
+        죽은 워커를 대신해 뜬 워커는 같은 슬롯의 기존 항목을 이어받는다. 빈 슬롯이 없으면 False.
+        """
+        if not self.worker_slots or self._slot_lock is not None:
+            return self._slot_lock is not None
+        os.makedirs(self.directory, exist_ok=True)
+        for slot in range(self.worker_slots):
+            fd = os.open(os.path.join(self.directory, f"worker-{slot}.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            self._slot_lock = fd
+            self.directory = os.path.join(self.directory, f"worker-{slot}")
+            os.makedirs(self.directory, exist_ok=True)
+            self._load()
+            return True
+        return False
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    def _load(self):
+        """기존 캐시 파일 목록 복원 (남아 있는 임시 파일과 짝이 없는 파일은 삭제)"""
+        found = []
+        bodies = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".tmp"):
+                self._unlink(path)
+                continue
+            if name.endswith(".bin"):
+                bodies.append(name[:-len(".bin")])
+                continue
+            if not name.endswith(".json"):
+                continue
+            key = name[:-len(".json")]
+            body = self._path(key, ".bin")
+            try:
+                with open(path, encoding="utf-8") as f:
+                    meta = json.load(f)
+                stat = os.stat(body)
+            except (OSError, ValueError):
+                self._unlink(path)
+                self._unlink(body)
+                continue
+            found.append((stat.st_mtime, DiskCacheEntry(key, body, stat.st_size, meta)))
+        # 메타데이터가 없거나 깨져 위에서 지운 본문 파일 (_commit 도중 종료 등)
+        loaded = {entry.key for _, entry in found}
+        for key in bodies:
+            if key not in loaded:
+                self._unlink(self._path(key, ".bin"))
+        for _, entry in sorted(found, key=lambda item: item[0]):
+            self._entries[entry.key] = entry
+            self.total_bytes += entry.size
+        self._evict()
+        if found:
+            logger.info("%s: loaded %d entries (%d bytes)", self.name, len(self._entries), self.total_bytes)
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: str) -> Optional[DiskCacheEntry]:
+        """적중하면 항목을 최근 사용으로 옮기고 반환"""
+        entry = self._entries.get(key)
+        if entry is None or not os.path.exists(entry.path):
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        try:
+            os.utime(entry.path)  # 재시작 후 LRU 순서 복원용
+        except OSError:
+            pass
+        self.hits += 1
+        self.served_bytes += entry.size
+        return entry
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry.size
+        self._unlink(entry.path)
+        self._unlink(self._path(key, ".json"))
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def _commit(self, key: str, tmp_path: str, size: int, meta: Dict[str, Any]):
+        meta_tmp = self._path(key, f".{uuid.uuid4().hex}.json.tmp")
+        with open(meta_tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        self._remove(key)
+        os.replace(tmp_path, self._path(key, ".bin"))
+        os.replace(meta_tmp, self._path(key, ".json"))
+        self._entries[key] = DiskCacheEntry(key, self._path(key, ".bin"), size, meta)
+        self.total_bytes += size
+        self.stores += 1
+        self._evict()
+
+    async def tee(self, key: str, source: AsyncIterator[bytes], meta: Dict[str, Any] = None) -> AsyncIterator[bytes]:
+        """
+        source의 청크를 그대로 생성하면서 캐시 파일에 기록
+        끝까지 받으면 항목으로 확정하고, 중간에 끊기거나 크기 제한을 넘으면 임시 파일을 버린다.
+        """
+        tmp_path = self._path(key, f".{uuid.uuid4().hex}.tmp")
+        size = 0
+        started = time.perf_counter()
+        f = open(tmp_path, "wb")
+        completed = False
+        try:
+            async for chunk in source:
+                if f is not None:
+                    size += len(chunk)
+                    if size > self.max_entry_bytes:
+                        f.close()
+                        f = None
+                        self._unlink(tmp_path)
+                    else:
+                        f.write(chunk)
+                yield chunk
+            completed = True
+        finally:
+            if f is not None:
+                f.close()
+                if completed:
+                    self._commit(key, tmp_path, size, meta or {})
+                    logger.debug("%s: stored %s (%d bytes, %.1f ms)", self.name, key, size,
+                                 (time.perf_counter() - started) * 1000)
+                else:
+                    self._unlink(tmp_path)
+            if f is None or not completed:
+                self.aborted += 1
+
+    def clear(self):
+        for key in list(self._entries):
+            self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "directory": self.directory,
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "max_entry_bytes": self.max_entry_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "aborted": self.aborted,
+            "served_bytes": self.served_bytes,
+        }
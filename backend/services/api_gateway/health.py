@@ -0,0 +1,126 @@
+"""
+헬스 체크 집계 - 서비스별 프로브를 동시에 실행하고 결과를 짧은 TTL 동안 캐시
+/health는 캐시된 결과를 바로 반환하고, 갱신은 백그라운드 태스크 하나만 수행하므로
+느리거나 죽은 서비스가 있어도 헬스 요청이 타임아웃을 기다리거나 쌓이지 않는다.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+Probe = Callable[[], Awaitable[str]]
+
+
+class HealthMonitor:
+    """
+    프로브 결과 캐시
+
+    - probes: 이름 → 상태 문자열("healthy" 등)을 반환하는 코루틴 함수
+    - timeout: 프로브 하나의 최대 대기 시간(초)
+    - ttl: 결과를 새것으로 보는 시간(초), 지나면 이전 결과를 반환하면서 백그라운드로 갱신
+    - interval: start() 이후 주기적으로 갱신하는 간격(초), 0이면 요청 시점 갱신만 사용
+    """
+
+    def __init__(self, probes: Dict[str, Probe], timeout: float = 5.0, ttl: float = 5.0, interval: float = 0.0):
+        self.probes = probes
+        self.timeout = timeout
+        self.ttl = ttl
+        self.interval = interval
+        self._results: Dict[str, str] = {}
+        self._latency_ms: Dict[str, float] = {}
+        self._checked_at = 0.0
+        self._refreshing: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+        self.refreshes = 0
+        self.timeouts = 0
+        self.stale_served = 0
+
+    @classmethod
+    def from_env(cls, probes: Dict[str, Probe]) -> "HealthMonitor":
+        """HEALTH_PROBE_TIMEOUT, HEALTH_CACHE_TTL, HEALTH_REFRESH_INTERVAL 환경 변수로 생성"""
+        ttl = float(os.getenv("HEALTH_CACHE_TTL", "5"))
+        return cls(
+            probes,
+            timeout=float(os.getenv("HEALTH_PROBE_TIMEOUT", "5")),
+            ttl=ttl,
+            interval=float(os.getenv("HEALTH_REFRESH_INTERVAL", str(ttl))),
+        )
+
+    async def _probe(self, name: str, probe: Probe):
+        started = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(probe(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            status = f"error: timeout after {self.timeout}s"
+        except Exception as e:
+            status = f"error: {str(e)}"
+        self._latency_ms[name] = round((time.perf_counter() - started) * 1000, 3)
+        return name, status
+
+    async def _refresh(self):
+        results = await asyncio.gather(*(self._probe(name, probe) for name, probe in self.probes.items()))
+        self._results = dict(results)
+        self._checked_at = time.monotonic()
+        self.refreshes += 1
+        unhealthy = [name for name, status in self._results.items() if status != "healthy"]
+        if unhealthy:
+            logger.warning("Health probes not healthy: %s", unhealthy)
+
+    def refresh(self) -> asyncio.Task:
+        """갱신 태스크 (이미 진행 중이면 같은 태스크를 공유)"""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._refresh())
+        return self._refreshing
+
+    async def results(self) -> Dict[str, str]:
+        """
+        서비스별 상태 - TTL 안이면 캐시, 지났으면 이전 결과를 주고 백그라운드 갱신,
+        아직 결과가 없을 때만 진행 중인 갱신을 기다림
+        """
+        if not self._checked_at:
+            await asyncio.shield(self.refresh())
+        elif time.monotonic() - self._checked_at > self.ttl:
+            self.stale_served += 1
+            self.refresh()
+        return self._results
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.shield(self.refresh())
+            except Exception as e:
+                logger.error("Health refresh failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """주기적 백그라운드 갱신 시작 (interval이 0이면 아무것도 하지 않음)"""
+        if self.interval > 0 and self._loop_task is None:
+            self._loop_task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        for task in (self._loop_task, self._refreshing):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._loop_task = None
+        self._refreshing = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "age_seconds": round(time.monotonic() - self._checked_at, 3) if self._checked_at else None,
+            "ttl": self.ttl,
+            "timeout": self.timeout,
+            "interval": self.interval,
+            "refreshes": self.refreshes,
+            "timeouts": self.timeouts,
+            "stale_served": self.stale_served,
+            "latency_ms": dict(self._latency_ms),
+        }
@@ -0,0 +1,134 @@
+"""
+대화 기록 캐시 - 사용자별 대화 목록/메시지 내역 응답을 짧은 TTL 동안 보관
+Dify 조회와 응답 변환(파일 ID 추출, 정렬)을 반복하지 않도록 변환이 끝난 JSON 본문과
+ETag를 함께 저장하고, 대화에 새 메시지가 생기거나 대화가 삭제되면 관련 항목을 지운다.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import os
+import time
+
+# (종류, 사용자, 대화 ID, 페이지 커서, limit) - 대화 목록은 대화 ID 자리에 ""를 쓴다
+HistoryKey = Tuple[str, str, str, str, int]
+
+
+@dataclass
+class CachedHistory:
+    body: bytes
+    etag: str
+    stored_at: float
+
+
+def render_json(content: Any) -> bytes:
+    """JSONResponse와 같은 형식으로 직렬화"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def history_entry(content: Any) -> CachedHistory:
+    """응답 본문을 한 번 직렬화하고 본문 해시로 ETag 생성"""
+    body = render_json(content)
+    etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+    return CachedHistory(body, etag, time.monotonic())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더에 ETag가 포함되어 있는지 (약한 비교)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+class HistoryCache:
+    """
+    크기 제한 LRU + TTL 캐시
+
+    - ttl: 항목 유효 시간(초) - 무효화를 놓친 경우(다른 클라이언트가 Dify에서 직접 변경 등)의 상한
+    - max_entries: 최대 항목 수
+    """
+
+    def __init__(self, ttl: float = 15.0, max_entries: int = 2048):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[HistoryKey, CachedHistory]" = OrderedDict()
+        # 사용자별 마지막 무효화 시점(전역 순번) - 조회 도중 무효화되면 그 조회 결과는 저장하지 않는다
+        # 최근 무효화된 max_entries명만 기억하고, 밀려난 사용자는 밀려난 순번 중 최댓값(_floor)을 쓴다
+        # (사용자별 값은 줄어들지 않고 무효화마다 커지므로, 밀려나도 저장을 건너뛰는 경우만 생긴다)
+        self._epoch = 0
+        self._floor = 0
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["HistoryCache"]:
+        """HISTORY_CACHE_TTL (0이면 비활성화), HISTORY_CACHE_SIZE 환경 변수로 생성"""
+        ttl = float(os.getenv("HISTORY_CACHE_TTL", "15"))
+        if ttl <= 0:
+            return None
+        return cls(ttl=ttl, max_entries=int(os.getenv("HISTORY_CACHE_SIZE", "2048")))
+
+    def get(self, key: HistoryKey) -> Optional[CachedHistory]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.stored_at > self.ttl:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def generation(self, user: str) -> int:
+        """Dify 조회 전에 읽어 두고 put()에 넘기는 값"""
+        return self._generations.get(user, self._floor)
+
+    def put(self, key: HistoryKey, content: Any, generation: int) -> CachedHistory:
+        """변환이 끝난 응답을 직렬화해서 저장 (조회 시작 후 무효화되었으면 저장하지 않음)"""
+        entry = history_entry(content)
+        if generation != self.generation(key[1]):
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate_conversation(self, user: str, conversation_id: str):
+        """대화에 변화가 생김 - 사용자의 대화 목록 전체와 해당 대화의 메시지 페이지들을 제거"""
+        stale = [
+            key for key in self._entries
+            if key[1] == user and (key[0] == "conversations" or key[2] == conversation_id)
+        ]
+        for key in stale:
+            del self._entries[key]
+        self._epoch += 1
+        self._generations[user] = self._epoch
+        self._generations.move_to_end(user)
+        while len(self._generations) > self.max_entries:
+            _, evicted = self._generations.popitem(last=False)
+            self._floor = max(self._floor, evicted)
+        self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            "tracked_users": len(self._generations),
+        }
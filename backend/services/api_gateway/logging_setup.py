@@ -0,0 +1,190 @@
+"""
+게이트웨이 로깅 설정 - 레벨/형식/큐 처리/페이로드 표시 방식을 환경 변수로 조정
+로그 레코드는 큐에 넣고 별도 스레드가 stdout에 쓰므로 이벤트 루프가 출력 I/O를 기다리지 않는다.
+"""
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import sys
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(funcName)s:%(lineno)d] - %(message)s"
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class LogSettings:
+    """
+    로깅 설정
+
+    - level: 루트 로그 레벨 (LOG_LEVEL)
+    - logger_levels: 로거별 레벨, "httpx=WARNING,sse=DEBUG" 형식 (LOG_LEVELS)
+    - format: text 또는 json (LOG_FORMAT)
+    - queue: 큐 + 백그라운드 스레드로 출력 (LOG_QUEUE)
+    - sample_every: 스트리밍 루프의 같은 종류 로그는 처음과 이후 N번째마다만 기록 (LOG_SAMPLE_EVERY)
+    - payload_mode: 본문 표시 방식 truncate / redact / full (LOG_PAYLOADS)
+    - payload_max_chars: truncate 모드에서 남길 글자 수 (LOG_PAYLOAD_MAX_CHARS)
+    """
+    level: str = "INFO"
+    logger_levels: str = ""
+    format: str = "text"
+    queue: bool = True
+    sample_every: int = 50
+    payload_mode: str = "truncate"
+    payload_max_chars: int = 120
+
+    @classmethod
+    def from_env(cls) -> "LogSettings":
+        return cls(
+            level=os.getenv("LOG_LEVEL", "INFO").upper(),
+            logger_levels=os.getenv("LOG_LEVELS", ""),
+            format=os.getenv("LOG_FORMAT", "text").lower(),
+            queue=_env_bool("LOG_QUEUE", True),
+            sample_every=int(os.getenv("LOG_SAMPLE_EVERY", "50")),
+            payload_mode=os.getenv("LOG_PAYLOADS", "truncate").lower(),
+            payload_max_chars=int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "120")),
+        )
+
+
+settings = LogSettings.from_env()
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄짜리 JSON 로그 - logger.info(..., extra={...})로 넘긴 필드도 함께 기록"""
+
+    _RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in self._RESERVED:
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    메시지 인자만 합쳐서 큐에 넣는 핸들러 - 시간/예외 포맷과 출력은 리스너 스레드에서 수행
+    (같은 프로세스 안의 큐이므로 기본 구현처럼 레코드를 복사하거나 예외 정보를 지울 필요가 없다)
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listeners: List[QueueListener] = []
+_configured = False
+
+
+def _queue_handlers(logger: logging.Logger):
+    """로거에 직접 붙은 핸들러들을 큐 뒤로 옮김 (출력은 리스너 스레드가 담당)"""
+    handlers = [handler for handler in logger.handlers if not isinstance(handler, QueueHandler)]
+    if not handlers:
+        return
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(_DeferredQueueHandler(records))
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+
+
+def configure_logging(log_settings: LogSettings = None):
+    """
+    루트 로거에 stdout 핸들러를 설정하고, 큐 모드면 루트와 uvicorn 로거의 출력을 백그라운드 스레드로 옮김
+    (uvicorn CLI로 실행하면 uvicorn이 먼저 자기 로거를 설정한 뒤 앱을 import하므로 import 시점에 호출)
+    """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+    log_settings = log_settings or settings
+
+    root = logging.getLogger()
+    root.setLevel(log_settings.level)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if log_settings.format == "json" else logging.Formatter(TEXT_FORMAT))
+    if log_settings.queue:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        root.addHandler(_DeferredQueueHandler(records))
+        listener = QueueListener(records, handler, respect_handler_level=True)
+        listener.start()
+        _listeners.append(listener)
+        for name in ("uvicorn", "uvicorn.access"):
+            _queue_handlers(logging.getLogger(name))
+        atexit.register(stop_logging)
+    else:
+        root.addHandler(handler)
+
+    for item in filter(None, (part.strip() for part in log_settings.logger_levels.split(","))):
+        name, _, level = item.partition("=")
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+
+def stop_logging():
+    """큐에 남은 레코드를 모두 출력하고 리스너 스레드 종료"""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+class LogSampler:
+    """
+    스트리밍 루프용 로그 샘플러 - 종류(key)별로 처음 한 번과 이후 every번째마다만 True
+    토큰마다 도는 루프에서 모든 줄을 로그로 남기지 않기 위해 사용한다.
+    """
+
+    def __init__(self, every: int = None):
+        self.every = settings.sample_every if every is None else every
+        self._counts: Dict[str, int] = {}
+
+    def __call__(self, key: str) -> bool:
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        return self.every <= 1 or count % self.every == 1
+
+
+def format_payload(value: Any) -> str:
+    """본문을 LOG_PAYLOADS 설정에 따라 잘라내거나(truncate) 길이/해시만 남김(redact)"""
+    text = value if isinstance(value, str) else repr(value)
+    if settings.payload_mode == "redact":
+        digest = hashlib.blake2b(text.encode("utf-8", "replace"), digest_size=4).hexdigest()
+        return f"<{len(text)} chars #{digest}>"
+    limit = settings.payload_max_chars
+    if settings.payload_mode == "full" or len(text) <= limit:
+        return repr(text)
+    return f"{text[:limit]!r}...(+{len(text) - limit} chars)"
+
+
+class Payload:
+    """지연 포맷용 래퍼 - 로그가 실제로 기록될 때만 format_payload를 수행 (logger.debug("%s", Payload(text)))"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __str__(self) -> str:
+        return format_payload(self.value)
+
+    __repr__ = __str__
@@ -2,112 +2,53 @@
 API Gateway 메인 서비스 - Dify 중심 단순화 아키텍처
 순수 L7 라우팅만 담당 (매핑, 인증, 인가, 로드밸런싱 제외)
 """
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask, BackgroundTasks
+from contextlib import asynccontextmanager, aclosing
 import httpx
 import asyncio
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 import json
 import os
-import re # 정규식 모듈 임포트
 import uuid
-from dotenv import load_dotenv
 from datetime import datetime, timedelta
-from KorToBraille.KorToBraille import KorToBraille
 from pydantic import BaseModel
-import jwt as pyjwt  # PyJWT 라이브러리를 pyjwt로 alias
 import hashlib
-
-# 로깅 설정
+import tempfile
+import time
+
+from admission import BULK, INTERACTIVE, VOICE, AdmissionRejected, Permit, admission_from_env
+from auth import AuthError, JWTAuthenticator
+from logging_setup import configure_logging, LogSampler, Payload
+from upstream import UpstreamClients, UpstreamConfig, filter_hop_by_hop
+from braille_stream import SentenceSegmenter
+from sanitizer import extract_quoted_text_for_braille
+import sanitizer
+from brf import iter_brf_pages, layout_from_env
+from sse import SSEEmitter, resolve_pacing, scan_dify_frame, sse_stream_stats
+from braille_engine import BrailleEngine, BrailleEngineBusy
+from health import HealthMonitor
+from single_flight import SingleFlight
+from history_cache import CachedHistory, HistoryCache, etag_matches, history_entry
+from disk_cache import DiskCache, DiskCacheEntry, cache_key, iter_file_range, parse_byte_range
+from upload_relay import MultipartRelay, UploadInvalid, UploadTooLarge, upload_stats
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY as METRICS, MetricsMiddleware
+
+# 로깅 설정 (LOG_* 환경 변수, 출력은 큐 + 백그라운드 스레드)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-# 점자 변환기 인스턴스 생성
-braille_converter = KorToBraille()
-
-# =============================================================================
-# BRF 변환 유틸리티
-# =============================================================================
-
-# 유니코드 점자 패턴을 BRF ASCII 문자로 변환하는 딕셔너리 (새로운 정확한 테이블)
-UNICODE_TO_BRF = {
-    '⠀': ' ',   # 20 (space)
-    '⠮': '!',   # 21 !
-    '⠐': '"',   # 22 "
-    '⠼': '#',   # 23 #
-    '⠫': '$',   # 24 $
-    '⠩': '%',   # 25 %
-    '⠯': '&',   # 26 &
-    '⠄': "'",   # 27 '
-    '⠷': '(',   # 28 (
-    '⠾': ')',   # 29 )
-    '⠡': '*',   # 2A *
-    '⠬': '+',   # 2B +
-    '⠠': ',',   # 2C ,
-    '⠤': '-',   # 2D -
-    '⠨': '.',   # 2E .
-    '⠌': '/',   # 2F /
-    '⠴': '0',   # 30 0
-    '⠂': '1',   # 31 1
-    '⠆': '2',   # 32 2
-    '⠒': '3',   # 33 3
-    '⠲': '4',   # 34 4
-    '⠢': '5',   # 35 5
-    '⠖': '6',   # 36 6
-    '⠶': '7',   # 37 7
-    '⠦': '8',   # 38 8
-    '⠔': '9',   # 39 9
-    '⠱': ':',   # 3A :
-    '⠰': ';',   # 3B ;
-    '⠣': '<',   # 3C <
-    '⠿': '=',   # 3D =
-    '⠜': '>',   # 3E >
-    '⠹': '?',   # 3F ?
-    '⠈': '@',   # 40 @
-    '⠁': 'A',   # 41 A
-    '⠃': 'B',   # 42 B
-    '⠉': 'C',   # 43 C
-    '⠙': 'D',   # 44 D
-    '⠑': 'E',   # 45 E
-    '⠋': 'F',   # 46 F
-    '⠛': 'G',   # 47 G
-    '⠓': 'H',   # 48 H
-    '⠊': 'I',   # 49 I
-    '⠚': 'J',   # 4A J
-    '⠅': 'K',   # 4B K
-    '⠇': 'L',   # 4C L
-    '⠍': 'M',   # 4D M
-    '⠝': 'N',   # 4E N
-    '⠕': 'O',   # 4F O
-    '⠏': 'P',   # 50 P
-    '⠟': 'Q',   # 51 Q
-    '⠗': 'R',   # 52 R
-    '⠎': 'S',   # 53 S
-    '⠞': 'T',   # 54 T
-    '⠥': 'U',   # 55 U
-    '⠧': 'V',   # 56 V
-    '⠺': 'W',   # 57 W
-    '⠭': 'X',   # 58 X
-    '⠽': 'Y',   # 59 Y
-    '⠵': 'Z',   # 5A Z
-    '⠪': '[',   # 5B [
-    '⠳': '\\',  # 5C \
-    '⠻': ']',   # 5D ]
-    '⠘': '^',   # 5E ^
-    '⠸': '_',   # 5F _
-}
+# 점자 변환 엔진 (워커 프로세스마다 KorToBraille 인스턴스 보유, BRAILLE_* 환경 변수로 조정)
+braille_engine = BrailleEngine.from_env()
 
-def convert_unicode_braille_to_brf(unicode_text: str) -> str:
-    """
-    유니코드 점자 문자열을 BRF 아스키 문자열로 변환합니다.
-    매핑 테이블에 없는 문자는 '?'로 처리합니다.
-    """
-    brf_string = ""
-    for char in unicode_text:
-        brf_string += UNICODE_TO_BRF.get(char, '?')
-    return brf_string
+# 점역 전 텍스트 정제 시간 (/metrics)
+sanitize_text_for_braille = METRICS.histogram(
+    "gateway_braille_sanitize_seconds", "sanitize_text_for_braille execution time",
+).timed(sanitizer.sanitize_text_for_braille)
 
 # JWT 시크릿 키 (실제 운영에서는 환경변수로 관리)
 JWT_SECRET = "sapie-braille-secret-key-2024"
@@ -132,7 +73,9 @@ class LoginResponse(BaseModel):
     username: str
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
-    """JWT 토큰 생성"""
+    """JWT 토큰 생성 (PyJWT는 로그인할 때 처음 import)"""
+    import jwt as pyjwt  # PyJWT 라이브러리를 pyjwt로 alias
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -147,103 +90,146 @@ def verify_password(plain_password: str, password_hash: str) -> bool:
     """비밀번호 검증"""
     return hashlib.sha256(plain_password.encode()).hexdigest() == password_hash
 
-def sanitize_text_for_braille(text: str) -> str:
-    """점자 변환 전 텍스트에서 마크다운, 이모지 등 불필요한 요소를 제거합니다."""
-    # 입력 텍스트가 비어있거나 None인 경우 처리
-    if not text or not text.strip():
-        return ""
-    
-    # 1. 이모지 제거 (다양한 유니코드 범위)
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map symbols
-        "\U0001F700-\U0001F77F"  # alchemical symbols
-        "\U0001F780-\U0001F7FF"  # Geometric Shapes Extended
-        "\U0001F800-\U0001F8FF"  # Supplemental Arrows-C
-        "\U0001F900-\U0001F9FF"  # Supplemental Symbols and Pictographs
-        "\U0001FA00-\U0001FA6F"  # Chess Symbols
-        "\U0001FA70-\U0001FAFF"  # Symbols and Pictographs Extended-A
-        "\U00002600-\U000026FF"  # Miscellaneous Symbols
-        "\U00002700-\U000027BF"  # Dingbats
-        "\U0000FE00-\U0000FE0F"  # Variation Selectors
-        "\U0001F1E0-\U0001F1FF"  # Regional Indicator Symbols
-        "\U0001F004"             # Mahjong Tile Red Dragon
-        "\U0001F0CF"             # Playing Card Black Joker
-        "\U0001F18E"             # Negative squared AB
-        "\U0001F191-\U0001F19A"  # Squared symbols
-        "\U0001F201-\U0001F202"  # Squared Katakana
-        "\U0001F21A"             # Squared CJK Unified Ideograph-7121
-        "\U0001F22F"             # Squared CJK Unified Ideograph-6307
-        "\U0001F232-\U0001F23A"  # Squared CJK Unified Ideographs
-        "\U0001F250-\U0001F251"  # Circled Ideographs
-        "]+"
-    )
-    text = emoji_pattern.sub('', text)
-    
-    # 2. 최소한의 마크다운 정리만 수행
-    # 마크다운 링크 제거 ([text](url) -> text)
-    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
-
-    # 3. 기본 마크다운 서식 제거
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # **bold**
-    text = re.sub(r'__(.*?)__', r'\1', text)      # __bold__
-    text = re.sub(r'\*(.*?)\*', r'\1', text)      # *italic*
-    text = re.sub(r'_(.*?)_', r'\1', text)        # _italic_
-    text = re.sub(r'`(.*?)`', r'\1', text)        # `code`
-
-    # 4. 헤더 기호만 제거
-    text = re.sub(r'^#{1,6}\s*', '', text, flags=re.MULTILINE)
-
-    # 5. 여러 줄바꿈 정리 및 양쪽 공백 제거
-    text = re.sub(r'\n\s*\n', '\n', text).strip()
-    
-    # 6. 한글, 숫자, 기본 문장 부호 제외한 나머지 문자(영어 포함) 제거
-    # 허용할 문자: 한글(가-힣), 숫자(0-9), 공백, 그리고 일부 문장 부호(.,?!")
-    text = re.sub(r'[^가-힣0-9\s\.,\?!"]', '', text)
+# 토큰 검증기 (검증된 토큰의 클레임을 만료 시각까지 캐시, AUTH_CACHE_SIZE / AUTH_CACHE_MAX_SECONDS)
+authenticator = JWTAuthenticator.from_env(JWT_SECRET, JWT_ALGORITHM)
 
-    return text
+# 모든 라우트에 인증 적용 여부 - 프론트엔드가 /process 등에 아직 토큰을 보내지 않으므로 기본값은 false
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "false").strip().lower() in ("1", "true", "yes", "on")
+AUTH_PUBLIC_PATHS = frozenset(
+    path.strip() for path in os.getenv(
+        "AUTH_PUBLIC_PATHS", "/,/auth/login,/auth/verify,/health,/ready,/docs,/redoc,/openapi.json"
+    ).split(",") if path.strip()
+)
 
-def extract_quoted_text_for_braille(text: str) -> str:
-    """점역변환 에이전트(agent_id == 1)에서만 사용: 따옴표 안의 텍스트만 추출합니다."""
-    if not text or not text.strip():
-        return text
-    
-    # 다양한 따옴표 패턴 정의 (순서 중요: 길고 구체적인 패턴부터)
-    quote_patterns = [
-        r"'([^']+)'",     
-        r'"([^"]+)"',    
-        r'`([^`]+)`',        
-        r'"([^"]+)"',     
-    ]
-    
-    extracted_texts = []
-    
-    # 각 패턴에 대해 매칭되는 텍스트 추출
-    for pattern in quote_patterns:
-        matches = re.findall(pattern, text)
-        extracted_texts.extend(matches)
-    
-    # 따옴표 안의 텍스트가 있으면 그것들을 공백으로 연결하여 반환
-    if extracted_texts:
-        result = ' '.join(extracted_texts).strip()
-        logger.info(f"Extracted quoted text: '{text}' -> '{result}'")
-        return result
-    
-    # 따옴표가 없으면 원본 텍스트 반환
-    logger.info(f"No quotes found, using original text: '{text}'")
-    return text
+async def current_user(request: Request) -> Dict[str, Any]:
+    """인증 의존성 - Bearer 토큰을 검증하고 클레임 반환 (request.state.user에도 저장)"""
+    try:
+        claims = authenticator.authenticate(request.headers.get("Authorization"))
+    except AuthError as e:
+        raise HTTPException(status_code=401, detail=e.detail, headers={"WWW-Authenticate": "Bearer"})
+    request.state.user = claims
+    return claims
+
+async def enforce_auth(request: Request):
+    """앱 전역 의존성 - AUTH_REQUIRED일 때 공개 경로와 CORS preflight를 제외한 모든 요청에 인증 요구"""
+    if not AUTH_REQUIRED or request.method == "OPTIONS" or request.url.path in AUTH_PUBLIC_PATHS:
+        return
+    await current_user(request)
+
+def load_env_files(*paths: str):
+    """환경 변수 파일 로드 - 실제로 있는 파일이 있을 때만 python-dotenv를 import"""
+    existing = [path for path in paths if os.path.isfile(path)]
+    if not existing:
+        return
+    from dotenv import load_dotenv
+
+    for path in existing:
+        load_dotenv(dotenv_path=path)
 
 # 환경 변수 로드
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '..', '.env.dify'))
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__) , '..', '..', '.env.openAI'))
+load_env_files(
+    os.path.join(os.path.dirname(__file__), '..', '..', '.env.dify'),
+    os.path.join(os.path.dirname(__file__), '..', '..', '.env.openAI'),
+)
+
+# Dify 스트림 중계 기본 방식 (parsed: 이벤트를 다시 만들어 전송, raw: message 프레임 원본 전달)
+DIFY_RELAY_MODE = os.getenv("DIFY_RELAY_MODE", "parsed")
+
+# 업로드 중계 파트 크기 제한 (Dify 문서 업로드 / Whisper 음성 파일, Whisper API 제한은 25MB)
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+TRANSCRIBE_MAX_BYTES = int(os.getenv("TRANSCRIBE_MAX_BYTES", str(25 * 1024 * 1024)))
+
+# 다중 워커 모드의 워커 수 (run_workers가 띄운 워커도 같은 값을 환경 변수로 물려받는다)
+GATEWAY_WORKERS = int(os.getenv("GATEWAY_WORKERS", "1"))
+
+# TTS 음성 / Dify 첨부 파일 미리보기 디스크 캐시 - lifespan에서 연다 (open_disk_caches)
+# 캐시를 열면 디렉터리의 임시 파일을 정리하므로 import만으로는 디렉터리를 건드리지 않는다
+# (spawn 방식 점역 워커가 main을 __mp_main__으로 다시 import해도 서비스 중인 캐시에 영향이 없도록)
+tts_cache: Optional[DiskCache] = None
+file_cache: Optional[DiskCache] = None
+
+# 대화 목록/메시지 내역 캐시 (HISTORY_CACHE_TTL=0이면 비활성화, HISTORY_CACHE_SIZE)
+# 무효화가 요청을 받은 워커에만 적용되므로 다중 워커 모드에서는 사용하지 않는다
+history_cache = HistoryCache.from_env() if GATEWAY_WORKERS <= 1 else None
+
+# 업스트림별 입장 제어 - (동시 요청 수, 대기열 길이, 최대 대기 초), ADMISSION_<NAME>_* 환경 변수로 조정
+# 빈 슬롯은 음성(VOICE) > 일반 텍스트(INTERACTIVE) > 대화 기록 조회/일괄 작업(BULK) 순으로 배정
+admission = admission_from_env({
+    "dify_chat": (32, 64, 10.0),
+    "dify_files": (8, 32, 15.0),
+    "openai_stt": (8, 16, 10.0),
+    "openai_tts": (16, 32, 10.0),
+    "services": (32, 64, 5.0),
+})
+
+async def admit(upstream: str, priority: str = INTERACTIVE) -> Permit:
+    """업스트림 실행 슬롯 획득 - 대기열이 가득 찼거나 너무 오래 기다리면 503 + Retry-After"""
+    try:
+        return await admission.acquire(upstream, priority)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요. ({e.upstream}: {e.reason})",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+@asynccontextmanager
+async def admitted(upstream: str, priority: str = INTERACTIVE):
+    """응답을 다 받은 뒤 바로 슬롯을 반환하는 요청용"""
+    permit = await admit(upstream, priority)
+    try:
+        yield permit
+    finally:
+        permit.release()
+
+# 업스트림 커넥션 풀 (호스트별 공유 클라이언트, UPSTREAM_<NAME>_* 환경 변수로 조정)
+upstream_clients = UpstreamClients({
+    "dify": UpstreamConfig.from_env("dify", "http://agent.sapie.ai/v1", timeout=60.0),
+    "openai": UpstreamConfig.from_env("openai", "https://api.openai.com/v1", timeout=60.0),
+    "services": UpstreamConfig.from_env("services", "", timeout=30.0, http2=False),
+})
+
+def open_disk_cache(cache: Optional[DiskCache]) -> Optional[DiskCache]:
+    """다중 워커 모드면 이 워커 전용 디렉터리 확보 - 빈 슬롯이 없으면 해당 캐시 없이 동작"""
+    if cache is None or not cache.worker_slots or cache.claim_worker_directory():
+        return cache
+    logger.warning("No free %s worker slot in %s, cache disabled", cache.name, cache.directory)
+    return None
+
+def open_disk_caches():
+    """
+    TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES(0이면 비활성화), TTS_CACHE_MAX_ENTRY_BYTES /
+    FILE_CACHE_DIR, FILE_CACHE_MAX_BYTES(0이면 비활성화), FILE_CACHE_MAX_ENTRY_BYTES 환경 변수로 디스크 캐시 생성
+    """
+    global tts_cache, file_cache
+    tts_cache = open_disk_cache(DiskCache.from_env(
+        "TTS_CACHE", os.path.join(tempfile.gettempdir(), "sapie-tts-cache"),
+        default_max_bytes=256 * 1024 * 1024, default_entry_bytes=16 * 1024 * 1024, workers=GATEWAY_WORKERS,
+    ))
+    file_cache = open_disk_cache(DiskCache.from_env(
+        "FILE_CACHE", os.path.join(tempfile.gettempdir(), "sapie-file-cache"),
+        default_max_bytes=1024 * 1024 * 1024, default_entry_bytes=100 * 1024 * 1024, workers=GATEWAY_WORKERS,
+    ))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 서비스하는 앱에서만 디스크 캐시를 연다 (다중 워커 모드의 워커 슬롯도 여기서 잡는다)
+    open_disk_caches()
+    await upstream_clients.start()
+    # 변환기 예열은 백그라운드로 진행 - 서버는 바로 요청을 받고, 예열 완료는 /ready로 알린다
+    await braille_engine.start()
+    health_monitor.start()
+    yield
+    await health_monitor.stop()
+    braille_engine.shutdown()
+    await upstream_clients.aclose()
 
 app = FastAPI(
     title="API Gateway",
     description="Dify 중심 단순화 아키텍처를 위한 순수 L7 게이트웨이",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    dependencies=[Depends(enforce_auth)]
 )
 
 @app.exception_handler(HTTPException)
@@ -256,6 +242,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content=jsonable_encoder({"detail": exc.detail}),
+        headers=exc.headers,
     )
 
 origins = [
@@ -270,6 +257,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 라우트별 요청 수/지연 시간 (/metrics) - 가장 바깥에서 CORS 처리까지 포함해 측정
+app.add_middleware(MetricsMiddleware)
 
 # 로그인 엔드포인트 추가
 @app.post("/auth/login", response_model=LoginResponse)
@@ -308,25 +297,14 @@ async def login(login_data: LoginRequest):
     )
 
 @app.get("/auth/verify")
-async def verify_token(request: Request):
+async def verify_token(claims: Dict[str, Any] = Depends(current_user)):
     """토큰 검증"""
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="토큰이 없습니다.")
-    
-    token = auth_header.split(" ")[1]
-    
-    try:
-        payload = pyjwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        username = payload.get("sub")
-        if username is None:
-            raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
-        
-        return {"username": username, "valid": True}
-    except pyjwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="토큰이 만료되었습니다.")
-    except pyjwt.JWTError:
-        raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
+    return {"username": claims["sub"], "valid": True}
+
+@app.get("/admin/auth-cache")
+async def auth_cache_stats():
+    """토큰 검증 캐시 적중/실패/만료 통계"""
+    return {"required": AUTH_REQUIRED, **authenticator.stats()}
 
 # 서비스 엔드포인트 매핑
 SERVICE_ROUTES = {
@@ -345,24 +323,127 @@ async def root():
         "available_services": list(SERVICE_ROUTES.keys())
     }
 
+def service_health_probe(service_url: str):
+    """내부 서비스 /health 프로브 (타임아웃은 HealthMonitor가 프로브마다 적용)"""
+    async def probe() -> str:
+        response = await upstream_clients.get("services").get(f"{service_url}/health")
+        return "healthy" if response.status_code == 200 else "unhealthy"
+    return probe
+
+# 서비스 헬스 체크 캐시 (동시 실행 + TTL + 백그라운드 갱신, HEALTH_* 환경 변수로 조정)
+health_monitor = HealthMonitor.from_env({
+    service_name: service_health_probe(service_url)
+    for service_name, service_url in SERVICE_ROUTES.items()
+})
+
 @app.get("/health")
 async def health_check():
-    """전체 시스템 상태 확인"""
-    health_status = {"gateway": "healthy", "services": {}}
-    
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        for service_name, service_url in SERVICE_ROUTES.items():
-            try:
-                response = await client.get(f"{service_url}/health")
-                health_status["services"][service_name] = "healthy" if response.status_code == 200 else "unhealthy"
-            except Exception as e:
-                health_status["services"][service_name] = f"error: {str(e)}"
+    """전체 시스템 상태 확인 (캐시된 프로브 결과)"""
+    health_status = {"gateway": "healthy", "services": dict(await health_monitor.results())}
     
     services_healthy = all(status == "healthy" for status in health_status["services"].values())
     overall_status = "healthy" if services_healthy else "degraded"
     
     return {"status": overall_status, **health_status}
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    준비 상태 (readiness 프로브용) - 점역 변환기 예열이 끝나면 200, 아직이면 503
+    /health는 시작 직후부터 응답하므로 생존 확인에, /ready는 트래픽을 보내도 되는지 판단에 쓴다.
+    """
+    warmup = braille_engine.warmup_seconds
+    braille = {
+        "ready": braille_engine.ready,
+        "warmup_ms": round(warmup * 1000, 1) if warmup is not None else None,
+        "workers": braille_engine.workers,
+    }
+    if not braille_engine.ready:
+        return JSONResponse(status_code=503, content={"status": "warming", "braille": braille})
+    return {"status": "ready", "braille": braille}
+
+@app.get("/admin/health")
+async def health_monitor_stats():
+    """헬스 프로브 캐시 상태 (결과 나이, 프로브별 지연, 타임아웃 수)"""
+    return health_monitor.stats()
+
+@app.get("/admin/upstreams")
+async def upstream_pool_stats():
+    """업스트림 커넥션 풀 사용 현황"""
+    return upstream_clients.stats()
+
+@app.get("/admin/braille-engine")
+async def braille_engine_stats():
+    """점역 프로세스 풀 대기열/처리 현황"""
+    return braille_engine.stats()
+
+@app.get("/admin/sse-streams")
+async def sse_streams_status():
+    """SSE 스트림 누적 통계 (직렬화/프레임 수, 프레임당 청크 수)"""
+    return sse_stream_stats.stats()
+
+@app.get("/admin/uploads")
+async def upload_relay_stats():
+    """업로드 중계 누적 통계 (전달 바이트, 평균 전송 시간, 거절 수)"""
+    return upload_stats.stats()
+
+@app.get("/admin/tts-cache")
+async def tts_cache_stats():
+    """TTS 음성 디스크 캐시 적중/저장/제거 통계"""
+    if tts_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **tts_cache.stats()}
+
+@app.get("/admin/file-cache")
+async def file_cache_stats():
+    """파일 미리보기 디스크 캐시 적중/저장/제거 통계"""
+    if file_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **file_cache.stats()}
+
+@app.get("/admin/history-cache")
+async def history_cache_stats():
+    """대화 목록/메시지 내역 캐시 적중/304/무효화 통계"""
+    if history_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **history_cache.stats()}
+
+@app.get("/admin/single-flight")
+async def single_flight_stats():
+    """동시 조회 합치기 현황 (업스트림 호출 수, 합쳐진 요청 수)"""
+    return {flight.name: flight.stats() for flight in (dify_read_flight, preview_flight)}
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 텍스트 형식 메트릭 (라우트별 지연 시간, 스트림 단계별 시간, 점역 시간, 업스트림 상태 코드)"""
+    return Response(METRICS.render(), headers={"Content-Type": METRICS_CONTENT_TYPE})
+
+# 조회 시점에 계산하는 현재 상태 게이지
+METRICS.gauge(
+    "gateway_admission_active", "Upstream slots in use", ("upstream",),
+    lambda: [((name,), limiter.active) for name, limiter in admission.items()],
+)
+METRICS.gauge(
+    "gateway_admission_waiting", "Requests waiting for an upstream slot", ("upstream",),
+    lambda: [((name,), limiter.waiting) for name, limiter in admission.items()],
+)
+METRICS.gauge(
+    "gateway_braille_pending", "Braille translations in flight or queued", (),
+    lambda: [((), braille_engine.pending)],
+)
+
+@app.get("/admin/admission")
+async def admission_stats():
+    """업스트림별 입장 제어 현황 (실행/대기 수, 대기 시간, 거절 수)"""
+    return admission.stats()
+
+@app.get("/admin/braille-cache")
+async def braille_cache_stats():
+    """점역 결과 캐시 적중/미스/제거 통계"""
+    if braille_engine.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **braille_engine.cache.stats()}
+
 # =============================================================================
 # Dify API 프록시 엔드포인트들
 # =============================================================================
@@ -377,69 +458,143 @@ async def convert_to_braille(request: BrailleConversionRequest):
         if not request.text:
             return JSONResponse(status_code=400, content={"detail": "Text is required"})
         
-        logger.info(f"=== BRAILLE CONVERSION DEBUG ===")
-        logger.info(f"Original text: {repr(request.text)}")
-        logger.info(f"Original length: {len(request.text)}")
-        
+        logger.debug("Braille conversion input: %s", Payload(request.text))
         sanitized_text = sanitize_text_for_braille(request.text)
-        logger.info(f"Sanitized text: {repr(sanitized_text)}")
-        logger.info(f"Sanitized length: {len(sanitized_text)}")
-        
-        braille_text = braille_converter.korTranslate(sanitized_text)
-        logger.info(f"Braille result: {repr(braille_text)}")
-        logger.info(f"Braille length: {len(braille_text)}")
-        logger.info(f"=== END BRAILLE DEBUG ===")
+        braille_text = await braille_engine.translate(sanitized_text)
+        logger.info("Braille conversion: %d chars -> %d sanitized -> %d braille",
+                    len(request.text), len(sanitized_text), len(braille_text))
         
         return {"braille": braille_text}
+    except BrailleEngineBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Braille conversion timed out")
     except Exception as e:
-        logger.error(f"Error converting to braille: {e}")
-        logger.error(f"Exception type: {type(e)}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.error("Error converting to braille: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Braille conversion failed")
 
+class BrailleBatchItem(BaseModel):
+    id: Optional[str] = None
+    text: str
+
+class BrailleBatchRequest(BaseModel):
+    items: List[BrailleBatchItem]
+    stream: bool = False   # True면 완료되는 순서대로 NDJSON 한 줄씩 전송
+
+# 배치 점역 항목 수 상한 및 배치 하나가 동시에 점역 엔진에 넣는 요청 수
+BRAILLE_BATCH_MAX_ITEMS = int(os.getenv("BRAILLE_BATCH_MAX_ITEMS", "500"))
+BRAILLE_BATCH_CONCURRENCY = int(os.getenv(
+    "BRAILLE_BATCH_CONCURRENCY",
+    str(min(max(braille_engine.workers, 1) * 2, braille_engine.max_queue))
+))
+
+@app.post("/convert-to-braille/batch")
+async def convert_to_braille_batch(request: BrailleBatchRequest):
+    """
+    여러 텍스트를 한 번에 점자로 변환 (대화 기록 일괄 변환용)
+    같은 내용은 한 번만 점역하고, 결과는 요청 순서대로 반환하거나 NDJSON으로 완료 순서대로 스트리밍
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Items are required")
+    if len(request.items) > BRAILLE_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Too many items (max {BRAILLE_BATCH_MAX_ITEMS})")
+
+    # 정제된 텍스트 → 해당 텍스트를 가진 항목 인덱스들 (원문이 같으면 정제도 한 번만)
+    groups: Dict[str, List[int]] = {}
+    sanitized_by_text: Dict[str, str] = {}
+    for index, item in enumerate(request.items):
+        sanitized = sanitized_by_text.get(item.text)
+        if sanitized is None:
+            sanitized = sanitized_by_text[item.text] = sanitize_text_for_braille(item.text)
+        groups.setdefault(sanitized, []).append(index)
+
+    logger.info("Batch braille conversion: %d items, %d unique", len(request.items), len(groups))
+
+    semaphore = asyncio.Semaphore(max(BRAILLE_BATCH_CONCURRENCY, 1))
+
+    async def translate_group(sanitized: str):
+        """(정제 텍스트, 점자, 오류) - 항목별 실패가 배치 전체를 실패시키지 않도록 오류를 값으로 반환"""
+        async with semaphore:
+            try:
+                return sanitized, await braille_engine.translate(sanitized, BULK), None
+            except BrailleEngineBusy:
+                return sanitized, None, "busy"
+            except asyncio.TimeoutError:
+                return sanitized, None, "timeout"
+            except Exception as e:
+                logger.error("Error converting batch item to braille: %s", e)
+                return sanitized, None, "failed"
+
+    def item_result(index: int, braille: Optional[str], error: Optional[str]) -> Dict[str, Any]:
+        result = {"index": index, "id": request.items[index].id, "braille": braille}
+        if error:
+            result["error"] = error
+        return result
+
+    tasks = [asyncio.create_task(translate_group(sanitized)) for sanitized in groups]
+
+    if not request.stream:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(request.items)
+        for sanitized, braille, error in await asyncio.gather(*tasks):
+            for index in groups[sanitized]:
+                results[index] = item_result(index, braille, error)
+        return {"results": results, "count": len(results), "unique": len(groups)}
+
+    async def generate_ndjson():
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                sanitized, braille, error = await next_done
+                for index in groups[sanitized]:
+                    yield json.dumps(item_result(index, braille, error), ensure_ascii=False) + "\n"
+        finally:
+            # 클라이언트가 연결을 끊으면 남은 점역 작업 취소
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+
 class BrfDownloadRequest(BaseModel):
     braille_text: str
     filename: Optional[str] = None
+    cells_per_line: Optional[int] = None   # 한 줄 칸 수 (0이면 줄 배치 없음, 기본 BRF_CELLS_PER_LINE)
+    lines_per_page: Optional[int] = None   # 한 쪽 줄 수 (0이면 쪽 나눔 없음, 기본 BRF_LINES_PER_PAGE)
+
+# BRF 쪽/줄 배치 기본값 (BRF_CELLS_PER_LINE, BRF_LINES_PER_PAGE 환경 변수)
+BRF_CELLS_PER_LINE, BRF_LINES_PER_PAGE = layout_from_env()
 
 @app.post("/download-brf")
 async def download_brf(request: BrfDownloadRequest):
-    """점자 텍스트를 BRF 파일로 변환하여 다운로드"""
-    try:
-        if not request.braille_text:
-            raise HTTPException(status_code=400, detail="Braille text is required")
-        
-        logger.info(f"=== BRF CONVERSION DEBUG ===")
-        logger.info(f"Input braille text: {repr(request.braille_text)}")
-        logger.info(f"Input length: {len(request.braille_text)}")
-        
-        # 유니코드 점자를 BRF ASCII로 변환
-        brf_content = convert_unicode_braille_to_brf(request.braille_text)
-        logger.info(f"BRF result: {repr(brf_content)}")
-        logger.info(f"BRF length: {len(brf_content)}")
-        logger.info(f"=== END BRF DEBUG ===")
-        
-        # 파일명 설정
-        filename = request.filename or f"braille_conversion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.brf"
-        
-        # BRF 파일 내용을 바이트로 변환
-        brf_bytes = brf_content.encode('ascii', errors='replace')
-        
-        return StreamingResponse(
-            iter([brf_bytes]),
-            media_type="application/octet-stream",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(len(brf_bytes)),
-                "Cache-Control": "no-cache"
-            }
-        )
-    except Exception as e:
-        logger.error(f"Error creating BRF file: {e}")
-        logger.error(f"Exception type: {type(e)}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail="BRF file creation failed")
+    """점자 텍스트를 BRF 파일로 변환하여 쪽 단위로 스트리밍 다운로드"""
+    if not request.braille_text:
+        raise HTTPException(status_code=400, detail="Braille text is required")
+
+    cells_per_line = BRF_CELLS_PER_LINE if request.cells_per_line is None else request.cells_per_line
+    lines_per_page = BRF_LINES_PER_PAGE if request.lines_per_page is None else request.lines_per_page
+    if cells_per_line < 0 or lines_per_page < 0:
+        raise HTTPException(status_code=400, detail="cells_per_line and lines_per_page must be >= 0")
+
+    logger.info("BRF conversion: %d chars, %d cells x %d lines", len(request.braille_text), cells_per_line, lines_per_page)
+
+    # 파일명 설정
+    filename = request.filename or f"braille_conversion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.brf"
+
+    def generate_pages():
+        try:
+            for page in iter_brf_pages(request.braille_text, cells_per_line, lines_per_page):
+                yield page.encode('ascii', errors='replace')
+        except Exception as e:
+            # 응답 헤더가 이미 전송된 뒤이므로 로그만 남기고 스트림을 끊는다
+            logger.error("Error creating BRF file: %s", e, exc_info=True)
+            raise
+
+    return StreamingResponse(
+        generate_pages(),
+        media_type="application/octet-stream",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Cache-Control": "no-cache"
+        }
+    )
 
 async def get_dify_api_key() -> str:
     """Dify API 키 가져오기"""
@@ -448,30 +603,81 @@ async def get_dify_api_key() -> str:
         raise HTTPException(status_code=500, detail="Dify API 키가 설정되지 않았습니다")
     return api_key
 
-async def call_dify_api(method: str, endpoint: str, **kwargs) -> httpx.Response:
-    """Dify API 호출 헬퍼 함수"""
+# 동시에 들어온 같은 Dify 조회(GET)는 한 번만 보내고 결과를 공유
+dify_read_flight = SingleFlight("dify_get")
+# 같은 파일 미리보기를 받는 중이면 그 요청이 디스크 캐시에 저장할 때까지 기다렸다가 캐시에서 전송
+preview_flight = SingleFlight("file_preview")
+PREVIEW_COALESCE_WAIT = float(os.getenv("PREVIEW_COALESCE_WAIT", "30"))
+
+async def call_dify_api(method: str, endpoint: str, flight_scope: Any = None, **kwargs) -> httpx.Response:
+    """
+    Dify API 호출 헬퍼 함수 (동시에 들어온 같은 GET은 합쳐서 한 번만 호출)
+    flight_scope: 합치는 조회를 더 나누는 값 - 대화 기록은 캐시 세대를 넘겨 무효화 전에 시작된 조회에 합류하지 않는다
+    """
     api_key = await get_dify_api_key()
     headers = kwargs.get('headers', {})
     headers.update({"Authorization": f"Bearer {api_key}"})
     kwargs['headers'] = headers
     
-    url = f"http://agent.sapie.ai/v1/{endpoint}"
-    logger.info(f"Calling Dify API: {method} {url}")
-    
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.request(method, url, **kwargs)
-        logger.info(f"Dify API response: {response.status_code}")
+    async def send() -> httpx.Response:
+        logger.info("Calling Dify API: %s %s", method, endpoint)
+        try:
+            # 대화 기록 조회는 기다려도 되는 요청 - 채팅 턴에 슬롯을 먼저 양보
+            async with admitted("dify_chat", BULK if method == "GET" else INTERACTIVE):
+                response = await upstream_clients.get("dify").request(method, endpoint, **kwargs)
+        except httpx.TransportError:
+            upstream_clients.record_error("dify")
+            raise
+        logger.info("Dify API response: %s", response.status_code)
         return response
+    
+    if method != "GET" or set(kwargs) - {"headers", "params"}:
+        return await send()
+    params = kwargs.get("params") or {}
+    key = (endpoint, tuple(sorted((k, str(v)) for k, v in params.items())), flight_scope)
+    return await dify_read_flight.do(key, send)
+
+def turn_priority(request_data: Dict[str, Any]) -> str:
+    """대화 턴의 처리 우선순위 - 음성 대화(is_voice=1)는 가장 먼저"""
+    return VOICE if str(request_data.get("is_voice", 0)).lower() in ("1", "true") else INTERACTIVE
+
+def history_response(request: Request, entry: CachedHistory, cache_status: str) -> Response:
+    """대화 기록 응답 - 클라이언트가 가진 ETag와 같으면 본문 없이 304"""
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache", "X-History-Cache": cache_status}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        if history_cache is not None:
+            history_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+def store_history(key, content: Dict[str, Any], generation: int) -> CachedHistory:
+    """변환이 끝난 응답을 캐시에 저장 (캐시를 끈 경우에도 ETag는 계산)"""
+    if history_cache is None:
+        return history_entry(content)
+    return history_cache.put(key, content, generation)
+
+def invalidate_history(user: str, *conversation_ids: str):
+    """대화에 새 메시지가 생기거나 삭제됨 - 해당 사용자의 대화 목록과 대화 메시지 캐시 제거"""
+    if history_cache is None:
+        return
+    for conversation_id in {conversation_id for conversation_id in conversation_ids if conversation_id}:
+        history_cache.invalidate_conversation(user, conversation_id)
 
 @app.get("/conversations")
-async def get_conversations(user: str = "default-user", last_id: str = "", limit: int = 20):
-    """대화 목록 조회 - Dify API 직접 프록시"""
+async def get_conversations(request: Request, user: str = "default-user", last_id: str = "", limit: int = 20):
+    """대화 목록 조회 - Dify API 직접 프록시 (사용자별 캐시 + ETag)"""
     try:
+        key = ("conversations", user, "", last_id, limit)
+        cached = history_cache.get(key) if history_cache is not None else None
+        if cached is not None:
+            return history_response(request, cached, "hit")
+        generation = history_cache.generation(user) if history_cache is not None else 0
+
         params = {"user": user, "limit": limit}
         if last_id:
             params["last_id"] = last_id
             
-        response = await call_dify_api("GET", "conversations", params=params)
+        response = await call_dify_api("GET", "conversations", flight_scope=generation, params=params)
         
         if response.status_code == 200:
             dify_data = response.json()
@@ -489,15 +695,18 @@ async def get_conversations(user: str = "default-user", last_id: str = "", limit
             # timestamp 기준 최신순 정렬
             conversations.sort(key=lambda x: x["timestamp"], reverse=True)
             
-            return JSONResponse(content={
+            entry = store_history(key, {
                 "limit": dify_data.get("limit", limit),
                 "has_more": dify_data.get("has_more", False),
                 "data": conversations
-            })
+            }, generation)
+            return history_response(request, entry, "miss")
         else:
-            logger.error(f"Dify API error: {response.status_code}, {response.text}")
+            logger.error("Dify API error: %s, %s", response.status_code, Payload(response.text))
             raise HTTPException(status_code=response.status_code, detail=f"Dify API 오류: {response.text}")
             
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Dify API 응답 시간 초과")
     except httpx.ConnectError:
@@ -507,16 +716,25 @@ async def get_conversations(user: str = "default-user", last_id: str = "", limit
         raise HTTPException(status_code=502, detail=f"대화 목록 조회 오류: {str(e)}")
 
 @app.get("/conversations/{conversation_id}/messages")
-async def get_conversation_messages(conversation_id: str, user: str = "default-user", limit: int = 20):
-    """특정 대화의 메시지 내역 조회 - Dify API 직접 프록시"""
+async def get_conversation_messages(conversation_id: str, request: Request, user: str = "default-user",
+                                    first_id: str = "", limit: int = 20):
+    """특정 대화의 메시지 내역 조회 - Dify API 직접 프록시 (사용자/대화/페이지별 캐시 + ETag)"""
     try:
+        key = ("messages", user, conversation_id, first_id, limit)
+        cached = history_cache.get(key) if history_cache is not None else None
+        if cached is not None:
+            return history_response(request, cached, "hit")
+        generation = history_cache.generation(user) if history_cache is not None else 0
+
         params = {
             "user": user,
             "conversation_id": conversation_id,
             "limit": limit
         }
+        if first_id:
+            params["first_id"] = first_id
         
-        response = await call_dify_api("GET", "messages", params=params)
+        response = await call_dify_api("GET", "messages", flight_scope=generation, params=params)
         
         if response.status_code == 200:
             dify_data = response.json()
@@ -539,9 +757,9 @@ async def get_conversation_messages(conversation_id: str, user: str = "default-u
                                     url_parts = file_url.split("/files/")[1].split("/")
                                     if url_parts and url_parts[0]:
                                         actual_file_id = url_parts[0]
-                                        logger.info(f"Extracted actual file ID: {actual_file_id} from URL: {file_url}")
+                                        logger.debug("Extracted actual file ID: %s from URL: %s", actual_file_id, file_url)
                                 except Exception as e:
-                                    logger.warning(f"Failed to extract file ID from URL {file_url}: {e}")
+                                    logger.warning("Failed to extract file ID from URL %s: %s", file_url, e)
                             
                             files.append({
                                 "id": actual_file_id,
@@ -573,16 +791,19 @@ async def get_conversation_messages(conversation_id: str, user: str = "default-u
             # 시간순 정렬
             messages.sort(key=lambda x: x["timestamp"])
             
-            return JSONResponse(content={
+            entry = store_history(key, {
                 "conversation_id": conversation_id,
                 "messages": messages,
                 "limit": dify_data.get("limit", limit),
                 "has_more": dify_data.get("has_more", False)
-            })
+            }, generation)
+            return history_response(request, entry, "miss")
         else:
-            logger.error(f"Dify messages API error: {response.status_code}, {response.text}")
+            logger.error("Dify messages API error: %s, %s", response.status_code, Payload(response.text))
             raise HTTPException(status_code=response.status_code, detail=f"Dify API 오류: {response.text}")
             
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Dify API 응답 시간 초과")
     except httpx.ConnectError:
@@ -607,6 +828,8 @@ async def delete_conversation(conversation_id: str, request: Request):
             f"conversations/{conversation_id}",
             json={"user": user}
         )
+        if response.status_code in [200, 204, 404]:
+            invalidate_history(user, conversation_id)
         
         if response.status_code in [200, 204]:
             logger.info(f"Successfully deleted conversation {conversation_id}")
@@ -618,7 +841,7 @@ async def delete_conversation(conversation_id: str, request: Request):
             from starlette.responses import Response
             return Response(status_code=204)
         else:
-            logger.error(f"Dify delete API error: {response.status_code}, {response.text}")
+            logger.error("Dify delete API error: %s, %s", response.status_code, Payload(response.text))
             raise HTTPException(status_code=response.status_code, detail=f"Dify API 삭제 오류: {response.text}")
 
     except HTTPException:
@@ -630,6 +853,7 @@ async def delete_conversation(conversation_id: str, request: Request):
 @app.post("/process")
 async def process_request(request: Request):
     """통합 처리 요청 - Dify chat-messages API 직접 프록시"""
+    received_at = time.monotonic()  # 스트림 단계별 시간 측정 기준 (/metrics)
     try:
         body = await request.body()
         if body:
@@ -645,49 +869,55 @@ async def process_request(request: Request):
         else:
             request_data = {}
         
-        # 상세 로깅 - 요청 분석
-        logger.info(f"=== PROCESS REQUEST DEBUG ===")
-        logger.info(f"Raw request_data: {request_data}")
+        # 상세 로깅 - 요청 분석 (본문은 DEBUG에서만, LOG_PAYLOADS에 따라 잘라서)
+        logger.debug("Process request data: %s", Payload(request_data))
         
         # conversation_id 처리 로직
         raw_conversation_id = request_data.get("conversation_id")
-        logger.info(f"Raw conversation_id: '{raw_conversation_id}' (type: {type(raw_conversation_id)})")
         
         # 첫 메시지인 경우 (빈값, None, 또는 빈 문자열) 빈 문자열로 설정
         if not raw_conversation_id or raw_conversation_id == "" or raw_conversation_id is None:
             conversation_id = ""  # 빈 문자열로 새 대화 생성
             is_new_conversation = True
-            logger.info(f"NEW CONVERSATION: Using conversation_id '' (empty string)")
+            logger.info("NEW CONVERSATION: Using conversation_id '' (empty string)")
         else:
             conversation_id = str(raw_conversation_id)
             is_new_conversation = False
-            logger.info(f"EXISTING CONVERSATION: Using conversation_id '{conversation_id}'")
+            logger.info("EXISTING CONVERSATION: Using conversation_id '%s'", conversation_id)
         
         # 동적 agent 처리 로직 - agent_id를 받아서 문자열로 변환
         agent_id = request_data.get("agent_id", request_data.get("agent", 0))  # agent_id 우선, 후순위 agent
 
         # Agent ID 유효성 검증 (0: 일반, 1: 점역변환, 2: 뉴스, 3: 복지정보, 4: 날씨정보, 5: 문서변환, 6-8: 장애인 서비스)
         if not isinstance(agent_id, int) or agent_id < 0 or agent_id > 8:
-            logger.warning(f"Invalid agent_id received: {agent_id}, defaulting to 0")
+            logger.warning("Invalid agent_id received: %s, defaulting to 0", agent_id)
             agent_id = 0
         
-        logger.info(f"Using agent_id: {agent_id}")
+        logger.info("Using agent_id: %s", agent_id)
+
+        # message 이벤트 전송 방식 (passthrough / coalesce / typewriter, 기본 SSE_PACING)
+        pacing = resolve_pacing(request_data.get("pacing"))
         
+        # 음성 대화 턴은 업스트림 슬롯과 점역 워커를 먼저 배정받음
+        priority = turn_priority(request_data)
+
         # 점역변환 에이전트(agent_id == 1)인 경우 직접 처리
         if agent_id == 1:
             logger.info("Processing braille conversion directly without Dify")
             
             async def stream_braille_response():
+                emitter = SSEEmitter(pacing, source="braille", started=received_at)
                 try:
                     query_text = request_data.get("query", request_data.get("message", "")).strip()
                     if not query_text:
-                        yield f"data: {json.dumps({'event': 'error', 'message': '변환할 텍스트가 입력되지 않았습니다.'})}\n\n"
+                        for frame in emitter.event({'event': 'error', 'message': '변환할 텍스트가 입력되지 않았습니다.'}):
+                            yield frame
                         return
                     
                     # 점자 변환 수행 (따옴표 안의 텍스트만 추출)
                     quoted_text = extract_quoted_text_for_braille(query_text)
                     sanitized_text = sanitize_text_for_braille(quoted_text)
-                    braille_text = braille_converter.korTranslate(sanitized_text)
+                    braille_text = await braille_engine.translate(sanitized_text, priority)
                     
                     # 구조화된 마크다운 응답 생성
                     structured_response = f'''**"{query_text}" 점자로 변환하겠습니다.**
@@ -699,12 +929,9 @@ async def process_request(request: Request):
 
 점자 변환이 완료되었습니다. 위의 점자를 스크린 리더로 읽어보시거나 점자 디스플레이로 확인하실 수 있습니다.'''
                     
-                    # 스트리밍으로 응답 전송 (message 이벤트) - 문자별로 스트리밍
-                    for i, char in enumerate(structured_response):
-                        yield f"data: {json.dumps({'event': 'message', 'chunk': char}, ensure_ascii=False)}\n\n"
-                        # 약간의 지연을 주어 실제 스트리밍처럼 보이게 함 (선택사항)
-                        if i % 10 == 0:  # 10글자마다 약간의 지연
-                            await asyncio.sleep(0.01)
+                    # 스트리밍으로 응답 전송 (message 이벤트) - 타자기 효과는 pacing=typewriter일 때만
+                    async for frame in emitter.text(structured_response):
+                        yield frame
 
                     # 대화 ID 생성 (새로운 대화인 경우)
                     final_conversation_id = conversation_id if conversation_id else str(uuid.uuid4())
@@ -716,11 +943,15 @@ async def process_request(request: Request):
                         'agent_type': '점역변환'
                     }
 
-                    yield f"data: {json.dumps({'event': 'message_end', 'conversation_id': final_conversation_id, 'metadata': metadata}, ensure_ascii=False)}\n\n"
+                    for frame in emitter.event({'event': 'message_end', 'conversation_id': final_conversation_id, 'metadata': metadata}):
+                        yield frame
                     
                 except Exception as e:
-                    logger.error(f"Error in braille conversion: {str(e)}")
-                    yield f"data: {json.dumps({'event': 'error', 'message': f'점자 변환 중 오류가 발생했습니다: {str(e)}'}, ensure_ascii=False)}\n\n"
+                    logger.error("Error in braille conversion: %s", e)
+                    for frame in emitter.event({'event': 'error', 'message': f'점자 변환 중 오류가 발생했습니다: {str(e)}'}):
+                        yield frame
+                finally:
+                    emitter.close()
             
             return StreamingResponse(
                 stream_braille_response(),
@@ -757,11 +988,154 @@ async def process_request(request: Request):
         if request_data.get("files") and len(request_data.get("files", [])) > 0:
             dify_payload["files"] = request_data.get("files")
         
-        logger.info(f"Final Dify payload: {dify_payload}")
-        logger.info(f"Is new conversation: {is_new_conversation}")
+        logger.debug("Final Dify payload: %s", Payload(dify_payload))
+        logger.info("Is new conversation: %s", is_new_conversation)
         
+        # 문장 단위 점역 스트리밍 (braille_delta 이벤트) - 기본 활성화, braille_stream=false로 끌 수 있음
+        braille_stream_enabled = request_data.get("braille_stream", True) is not False
+
+        # Dify message 프레임 중계 방식 - raw면 event/answer만 훑어보고 원본 프레임을 그대로 전달
+        relay_raw = (request_data.get("relay") or DIFY_RELAY_MODE) == "raw"
+
+        async def relay_dify_events(response: httpx.Response, emitter: SSEEmitter, is_retry: bool = False):
+            """Dify SSE 스트림을 프론트엔드 이벤트(message, braille_delta, message_end, error)로 중계"""
+            tag = "[RETRY] " if is_retry else ""
+            # 줄/청크 단위 로그는 DEBUG에서만, 종류별로 샘플링해서 기록
+            trace = logger.isEnabledFor(logging.DEBUG)
+            sample = LogSampler()
+            segmenter = SentenceSegmenter(sanitize_text_for_braille)
+            stream_braille = braille_stream_enabled
+            braille_parts = []
+            full_answer = "" # 스트리밍 시작 전 전체 답변 초기화
+            line_count = 0
+
+            async def braille_deltas(chunk: str):
+                """완성된 문장은 답변 도중에 미리 점역해서 전송"""
+                nonlocal stream_braille
+                if not stream_braille:
+                    return
+                try:
+                    for sentence in segmenter.feed(chunk):
+                        braille_delta = await braille_engine.translate(sentence, priority)
+                        braille_parts.append(braille_delta)
+                        for frame in emitter.event({'event': 'braille_delta', 'index': len(braille_parts) - 1, 'braille': braille_delta}):
+                            yield frame
+                except Exception as e:
+                    # 실패하면 message_end에서 전체 텍스트를 한 번에 변환
+                    logger.error("Error in incremental braille conversion: %s", e)
+                    stream_braille = False
+
+            # 중계가 끝나면 (message_end 등으로 일찍 끝나도) 업스트림 읽기 태스크를 바로 정리
+            async with aclosing(emitter.ticking(response.aiter_lines())) as upstream_lines:
+                async for line in upstream_lines:
+                    if line is None:
+                        # 업스트림이 조용한 동안 모아 둔 텍스트가 플러시 간격을 넘김
+                        for frame in emitter.flush():
+                            yield frame
+                        continue
+
+                    line = line.strip()
+                    if not line:
+                        continue
+
+                    line_count += 1
+
+                    # raw 중계: message 프레임은 JSON 파싱/재직렬화 없이 원본 그대로 전달
+                    if relay_raw and line.startswith("data: "):
+                        event_type, chunk = scan_dify_frame(line)
+                        if event_type == "message" and chunk is not None:
+                            if chunk:
+                                full_answer += chunk
+                                for frame in emitter.raw(line + "\n\n"):
+                                    yield frame
+                                async for frame in braille_deltas(chunk):
+                                    yield frame
+                            continue
+
+                    if trace and sample("line"):
+                        logger.debug("📨 %s[Line %d] Raw: %s", tag, line_count, Payload(line))
+
+                    if not line.startswith("data: "):
+                        continue
+
+                    try:
+                        json_data = json.loads(line[6:])
+                    except json.JSONDecodeError as e:
+                        logger.error("Failed to parse JSON: %s, error: %s", Payload(line), e)
+                        continue
+
+                    event_type = json_data.get("event", "")
+                    if trace and sample(event_type):
+                        logger.debug("🔹 %sEvent type: %s, agent_id=%s", tag, event_type, agent_id)
+
+                    if event_type == "message":
+                        chunk = json_data.get("answer", "")
+                        if trace and sample("chunk"):
+                            logger.debug("🔵 %sReceived chunk from Dify: length=%d, content=%s", tag, len(chunk or ""), Payload(chunk))
+                        if chunk:
+                            full_answer += chunk # 전체 응답 저장
+
+                            # 작은 토큰 청크는 모아서 전송 (pacing 프로필에 따라)
+                            async for frame in emitter.text(chunk):
+                                yield frame
+
+                            async for frame in braille_deltas(chunk):
+                                yield frame
+
+                    elif event_type == "message_end":
+                        received_conversation_id = json_data.get("conversation_id", "")
+                        metadata = json_data.get("metadata", {})
+
+                        # 대화 목록 순서/메시지 내역이 바뀌었으므로 캐시 무효화
+                        invalidate_history(dify_payload["user"], conversation_id, received_conversation_id)
+
+                        # 전체 응답을 점자로 변환 (스트리밍 모드에서는 남은 조각만 변환해서 이어 붙임)
+                        try:
+                            logger.debug("%sFull answer: %s", tag, Payload(full_answer))
+                            if stream_braille:
+                                braille_text = "".join(braille_parts) + await braille_engine.translate(segmenter.flush(), priority)
+                            else:
+                                braille_text = await braille_engine.translate(sanitize_text_for_braille(full_answer), priority)
+                            logger.info("%sChat braille conversion: %d answer chars -> %d braille (%d streamed sentences, %d lines)",
+                                        tag, len(full_answer), len(braille_text), len(braille_parts), line_count)
+
+                            metadata['braille'] = braille_text
+                        except Exception as e:
+                            logger.error("Error converting to braille: %s", e, exc_info=True)
+                            metadata['braille'] = "점자 변환 오류"
+
+                        # 상세 로깅 - 응답 분석
+                        logger.info("%sMessage end: conversation_id sent='%s' received='%s' new=%s",
+                                    tag, conversation_id, received_conversation_id, is_new_conversation or is_retry)
+
+                        response_data = {
+                            'event': 'message_end', 
+                            'conversation_id': received_conversation_id, 
+                            'metadata': metadata
+                        }
+
+                        logger.debug("Sending to frontend: %s", Payload(response_data))
+                        for frame in emitter.event(response_data):
+                            yield frame
+                        return
+
+                    elif event_type == "error":
+                        error_msg = json_data.get("message", "알 수 없는 오류")
+                        logger.error("Dify %sstreaming error: %s", tag, error_msg)
+                        for frame in emitter.event({'event': 'error', 'message': error_msg}):
+                            yield frame
+                        return
+
+            # message_end 없이 스트림이 끝난 경우 모아 둔 텍스트 전송
+            for frame in emitter.flush():
+                yield frame
+
+        # Dify 채팅 동시 스트림 제한 - 슬롯은 스트림이 끝날 때(클라이언트가 끊어도) 반환
+        permit = await admit("dify_chat", priority)
+
         # 스트리밍 응답 제너레이터
         async def stream_dify_response():
+            emitter = SSEEmitter(pacing, source="dify", started=received_at)
             try:
                 api_key = await get_dify_api_key()
                 headers = {
@@ -769,202 +1143,64 @@ async def process_request(request: Request):
                     "Content-Type": "application/json"
                 }
                 
-                async with httpx.AsyncClient(timeout=60.0) as client:
-                    logger.info(f"🚀 Sending request to Dify with agent_id={agent_id}")
-                    async with client.stream(
-                        "POST",
-                        "http://agent.sapie.ai/v1/chat-messages",
-                        headers=headers,
-                        json=dify_payload
-                    ) as response:
-                        logger.info(f"📥 Dify response status: {response.status_code}")
-                        if response.status_code != 200:
-                            error_text = await response.aread()
-                            error_text_decoded = error_text.decode()
-                            logger.error(f"Dify API error: {response.status_code}, {error_text_decoded}")
-                            
-                            # 404 Conversation Not Exists 에러인 경우 새 대화로 재시도
-                            full_answer = "" # 스트리밍 시작 전 전체 답변 초기화
-                            if response.status_code == 404 and "Conversation Not Exists" in error_text_decoded:
-                                logger.warning(f"Conversation {conversation_id} not found, retrying as new conversation")
-
-                                # 새 대화로 재시도
-                                retry_payload = dify_payload.copy()
-                                retry_payload["conversation_id"] = ""  # 빈 값으로 새 대화 생성
-
-                                logger.info(f"🔄 Retrying with new conversation")
-                                logger.info(f"🔄 Retry payload keys: {list(retry_payload.keys())}")
-                                
-                                async with client.stream(
-                                    "POST",
-                                    "http://agent.sapie.ai/v1/chat-messages",
-                                    headers=headers,
-                                    json=retry_payload
-                                ) as retry_response:
-                                    logger.info(f"✅ Retry response status: {retry_response.status_code}")
-                                    if retry_response.status_code != 200:
-                                        retry_error = await retry_response.aread()
-                                        logger.error(f"❌ Retry also failed: {retry_response.status_code}, {retry_error.decode()}")
-                                        yield f"data: {json.dumps({'event': 'error', 'message': f'대화 생성 실패: {retry_response.status_code}'}, ensure_ascii=False)}\n\n"
-                                        return
-
-                                    logger.info(f"✅ Retry succeeded, starting streaming processing")
-                                    # 재시도 성공 시 스트리밍 처리
-                                    async for line in retry_response.aiter_lines():
-                                        line = line.strip()
-                                        if not line:
-                                            continue
-                                            
-                                        if line.startswith("data: "):
-                                            try:
-                                                json_data = json.loads(line[6:])
-                                                event_type = json_data.get("event", "")
-                                                
-                                                if event_type == "message":
-                                                    chunk = json_data.get("answer", "")
-                                                    logger.info(f"🟢 [RETRY] Received chunk from Dify: length={len(chunk) if chunk else 0}, content={repr(chunk[:100]) if chunk else 'None'}")
-                                                    if chunk:
-                                                        full_answer += chunk  # 전체 응답 저장
-
-                                                        # 큰 청크를 작은 청크로 분할하여 스트리밍 효과 제공
-                                                        chunk_size = 10  # 10글자씩 전송
-                                                        for i in range(0, len(chunk), chunk_size):
-                                                            mini_chunk = chunk[i:i+chunk_size]
-                                                            logger.info(f"📤 [RETRY] Sending mini-chunk to frontend: length={len(mini_chunk)}")
-                                                            yield f"data: {json.dumps({'event': 'message', 'chunk': mini_chunk}, ensure_ascii=False)}\n\n"
-                                                            await asyncio.sleep(0.02)  # 20ms 지연으로 스트리밍 효과
-                                                
-                                                elif event_type == "message_end":
-                                                    received_conversation_id = json_data.get("conversation_id", "")
-                                                    metadata = json_data.get("metadata", {})
-                                                    
-                                                    # 전체 응답을 점자로 변환
-                                                    try:
-                                                        if full_answer.strip():
-                                                            sanitized_text = sanitize_text_for_braille(full_answer)
-                                                            braille_text = braille_converter.korTranslate(sanitized_text)
-                                                            metadata['braille'] = braille_text
-                                                            logger.info(f"Braille conversion successful for retry response (length: {len(braille_text)})")
-                                                        else:
-                                                            metadata['braille'] = ""
-                                                            logger.warning("Empty response, skipping braille conversion")
-                                                    except Exception as e:
-                                                        logger.error(f"Error converting to braille in retry: {e}")
-                                                        metadata['braille'] = "점자 변환 오류"
-
-                                                    logger.info(f"=== NEW CONVERSATION CREATED ===")
-                                                    logger.info(f"New conversation_id: '{received_conversation_id}'")
-                                                    
-                                                    response_data = {
-                                                        'event': 'message_end', 
-                                                        'conversation_id': received_conversation_id, 
-                                                        'metadata': metadata
-                                                    }
-                                                    
-                                                    logger.info(f"Sending new conversation to frontend: {response_data}")
-                                                    yield f"data: {json.dumps(response_data, ensure_ascii=False)}\n\n"
-                                                    return
-
-                                                elif event_type == "error":
-                                                    error_msg = json_data.get("message", "알 수 없는 오류")
-                                                    logger.error(f"Dify retry streaming error: {error_msg}")
-                                                    yield f"data: {json.dumps({'event': 'error', 'message': error_msg}, ensure_ascii=False)}\n\n"
-                                                    return
-                                                    
-                                            except json.JSONDecodeError as e:
-                                                logger.error(f"Failed to parse retry JSON: {line}, error: {e}")
-                                                continue
-                                return
-                            else:
-                                # 다른 종류의 에러
-                                yield f"data: {json.dumps({'event': 'error', 'message': f'Dify API 오류: {response.status_code}'}, ensure_ascii=False)}\n\n"
-                                return
-                        
-                        full_answer = "" # 스트리밍 시작 전 전체 답변 초기화
-                        line_count = 0
-                        async for line in response.aiter_lines():
-                            line = line.strip()
-                            if not line:
-                                continue
-
-                            line_count += 1
-                            logger.info(f"📨 [Line {line_count}] Raw: {line[:100]}")
-
-                            if line.startswith("data: "):
-                                try:
-                                    json_data = json.loads(line[6:])
-                                    event_type = json_data.get("event", "")
-                                    logger.info(f"🔹 Event type: {event_type}, agent_id={agent_id}")
-
-                                    if event_type == "message":
-                                        chunk = json_data.get("answer", "")
-                                        logger.info(f"🔵 Received chunk from Dify: length={len(chunk) if chunk else 0}, content={repr(chunk[:100]) if chunk else 'None'}")
-                                        if chunk:
-                                            full_answer += chunk # 전체 응답 저장
-
-                                            # 큰 청크를 작은 청크로 분할하여 스트리밍 효과 제공
-                                            chunk_size = 10  # 10글자씩 전송
-                                            for i in range(0, len(chunk), chunk_size):
-                                                mini_chunk = chunk[i:i+chunk_size]
-                                                logger.info(f"📤 Sending mini-chunk to frontend: length={len(mini_chunk)}")
-                                                yield f"data: {json.dumps({'event': 'message', 'chunk': mini_chunk}, ensure_ascii=False)}\n\n"
-                                                await asyncio.sleep(0.02)  # 20ms 지연으로 스트리밍 효과
-                                    
-                                    elif event_type == "message_end":
-                                        received_conversation_id = json_data.get("conversation_id", "")
-                                        metadata = json_data.get("metadata", {})
-
-                                        # 전체 응답을 점자로 변환
-                                        try:
-                                            logger.info(f"=== CHAT BRAILLE CONVERSION DEBUG (MAIN) ===")
-                                            logger.info(f"Full answer: {repr(full_answer)}")
-                                            logger.info(f"Full answer length: {len(full_answer)}")
-                                            
-                                            sanitized_text = sanitize_text_for_braille(full_answer)
-                                            logger.info(f"Sanitized: {repr(sanitized_text)}")
-                                            logger.info(f"Sanitized length: {len(sanitized_text)}")
-                                            
-                                            braille_text = braille_converter.korTranslate(sanitized_text)
-                                            logger.info(f"Braille result: {repr(braille_text)}")
-                                            logger.info(f"Braille length: {len(braille_text)}")
-                                            logger.info(f"=== END CHAT BRAILLE DEBUG (MAIN) ===")
-                                            
-                                            metadata['braille'] = braille_text
-                                        except Exception as e:
-                                            logger.error(f"Error converting to braille: {e}")
-                                            import traceback
-                                            logger.error(f"Traceback: {traceback.format_exc()}")
-                                            metadata['braille'] = "점자 변환 오류"
-                                        
-                                        # 상세 로깅 - 응답 분석
-                                        logger.info(f"=== MESSAGE_END EVENT ===")
-                                        logger.info(f"Original conversation_id sent: '{conversation_id}'")
-                                        logger.info(f"Received conversation_id from Dify: '{received_conversation_id}'")
-                                        logger.info(f"Is new conversation: {is_new_conversation}")
-                                        
-                                        response_data = {
-                                            'event': 'message_end', 
-                                            'conversation_id': received_conversation_id, 
-                                            'metadata': metadata
-                                        }
-                                        
-                                        logger.info(f"Sending to frontend: {response_data}")
-                                        yield f"data: {json.dumps(response_data, ensure_ascii=False)}\n\n"
-                                        break
-
-                                    elif event_type == "error":
-                                        error_msg = json_data.get("message", "알 수 없는 오류")
-                                        logger.error(f"Dify streaming error: {error_msg}")
-                                        yield f"data: {json.dumps({'event': 'error', 'message': error_msg}, ensure_ascii=False)}\n\n"
-                                        break
-                                        
-                                except json.JSONDecodeError as e:
-                                    logger.error(f"Failed to parse JSON: {line}, error: {e}")
-                                    continue
+                client = upstream_clients.get("dify")
+                logger.info("🚀 Sending request to Dify with agent_id=%s", agent_id)
+                async with client.stream(
+                    "POST",
+                    "chat-messages",
+                    headers=headers,
+                    json=dify_payload
+                ) as response:
+                    emitter.upstream_connected()
+                    logger.info("📥 Dify response status: %s", response.status_code)
+                    if response.status_code == 200:
+                        async for event in relay_dify_events(response, emitter):
+                            yield event
+                        return
+
+                    error_text = await response.aread()
+                    error_text_decoded = error_text.decode()
+                    logger.error("Dify API error: %s, %s", response.status_code, Payload(error_text_decoded))
+
+                    # 404 Conversation Not Exists 에러가 아니면 그대로 에러 전달
+                    if not (response.status_code == 404 and "Conversation Not Exists" in error_text_decoded):
+                        for frame in emitter.event({'event': 'error', 'message': f'Dify API 오류: {response.status_code}'}):
+                            yield frame
+                        return
+
+                # 새 대화로 재시도
+                logger.warning("Conversation %s not found, retrying as new conversation", conversation_id)
+                retry_payload = dify_payload.copy()
+                retry_payload["conversation_id"] = ""  # 빈 값으로 새 대화 생성
+
+                logger.info("🔄 Retrying with new conversation")
+
+                async with client.stream(
+                    "POST",
+                    "chat-messages",
+                    headers=headers,
+                    json=retry_payload
+                ) as retry_response:
+                    emitter.upstream_connected()
+                    logger.info("✅ Retry response status: %s", retry_response.status_code)
+                    if retry_response.status_code != 200:
+                        retry_error = await retry_response.aread()
+                        logger.error("❌ Retry also failed: %s, %s", retry_response.status_code, Payload(retry_error.decode()))
+                        for frame in emitter.event({'event': 'error', 'message': f'대화 생성 실패: {retry_response.status_code}'}):
+                            yield frame
+                        return
+
+                    logger.info("✅ Retry succeeded, starting streaming processing")
+                    async for event in relay_dify_events(retry_response, emitter, is_retry=True):
+                        yield event
                                     
             except Exception as e:
-                logger.error(f"Error during streaming: {str(e)}")
-                yield f"data: {json.dumps({'event': 'error', 'message': f'스트리밍 중 오류 발생: {str(e)}'}, ensure_ascii=False)}\n\n"
+                logger.error("Error during streaming: %s", e)
+                for frame in emitter.event({'event': 'error', 'message': f'스트리밍 중 오류 발생: {str(e)}'}):
+                    yield frame
+            finally:
+                emitter.close()
+                permit.release()
         
         return StreamingResponse(
             stream_dify_response(),
@@ -974,9 +1210,12 @@ async def process_request(request: Request):
                 "Connection": "keep-alive",
                 "Access-Control-Allow-Origin": "*",
                 "Access-Control-Allow-Headers": "*",
-            }
+            },
+            background=BackgroundTask(permit.release)
         )
                 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in process_request: {str(e)}")
         raise HTTPException(status_code=500, detail=f"요청 처리 중 오류 발생: {str(e)}")
@@ -985,35 +1224,70 @@ async def process_request(request: Request):
 # 기존 서비스 프록시 엔드포인트들
 # =============================================================================
 
+async def relay_upload(relay: MultipartRelay, send) -> httpx.Response:
+    """
+    업로드 본문을 업스트림으로 흘려보내고 전송량/시간을 기록
+    크기 제한 초과는 413, 필수 파일 누락/형식 오류는 400으로 변환한다.
+    """
+    rejected = False
+    try:
+        return await send(relay.stream())
+    except UploadTooLarge as e:
+        rejected = True
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadInvalid as e:
+        rejected = True
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        upload_stats.record(relay, rejected=rejected)
+        logger.info(
+            "Upload relayed: bytes_in=%d bytes_out=%d duration_ms=%.1f parts=%s rejected=%s",
+            relay.bytes_in, relay.bytes_out, relay.duration * 1000,
+            [(part.name, part.size) for part in relay.parts], rejected,
+        )
+
+def open_upload_relay(request: Request, max_part_bytes: int, **options) -> MultipartRelay:
+    """요청 헤더로 업로드 중계 준비 (본문은 아직 읽지 않음)"""
+    try:
+        return MultipartRelay(
+            request.stream(),
+            request.headers.get("content-type", ""),
+            request.headers.get("content-length"),
+            max_part_bytes,
+            **options,
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadInvalid as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def upload_headers(relay: MultipartRelay) -> Dict[str, str]:
+    """클라이언트 응답에 붙이는 전송량/시간 헤더"""
+    return {
+        "X-Upload-Bytes": str(relay.bytes_in),
+        "X-Upload-Duration-Ms": f"{relay.duration * 1000:.1f}",
+    }
+
 @app.post("/dify-files-upload")
 async def dify_files_upload(request: Request):
-    """Dify 파일 업로드 API 프록시"""
+    """Dify 파일 업로드 API 프록시 (본문을 메모리에 모으지 않고 그대로 중계)"""
     try:
         api_key = await get_dify_api_key()
+        relay = open_upload_relay(request, UPLOAD_MAX_BYTES)
+
+        async with admitted("dify_files"):
+            response = await relay_upload(relay, lambda body: upstream_clients.get("dify").post(
+                "files/upload",
+                headers={"Authorization": f"Bearer {api_key}", **relay.headers()},
+                content=body,
+            ))
         
-        form_data = await request.form()
-        files = {}
-        data = {}
-        
-        for key, value in form_data.items():
-            if hasattr(value, "filename"):
-                files[key] = (value.filename, await value.read(), value.content_type)
-            else:
-                data[key] = value
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                "http://agent.sapie.ai/v1/files/upload",
-                headers={"Authorization": f"Bearer {api_key}"},
-                files=files,
-                data=data
-            )
-            
-            if response.status_code == 201:
-                return JSONResponse(content=response.json(), status_code=response.status_code)
-            else:
-                logger.error(f"Dify file upload error: {response.status_code}, {response.text}")
-                raise HTTPException(status_code=response.status_code, detail=f"Dify 파일 업로드 오류: {response.text}")
+        if response.status_code == 201:
+            return JSONResponse(content=response.json(), status_code=response.status_code,
+                                headers=upload_headers(relay))
+        else:
+            logger.error("Dify file upload error: %s, %s", response.status_code, Payload(response.text))
+            raise HTTPException(status_code=response.status_code, detail=f"Dify 파일 업로드 오류: {response.text}")
 
     except HTTPException:
         raise
@@ -1021,34 +1295,78 @@ async def dify_files_upload(request: Request):
         logger.error(f"Error in dify_files_upload: {str(e)}")
         raise HTTPException(status_code=500, detail=f"파일 업로드 오류: {str(e)}")
 
-@app.get("/files/{file_id}/preview")
-async def dify_file_preview(file_id: str, as_attachment: bool = False):
-    """Dify 파일 미리보기/다운로드 API 프록시"""
+# 미리보기 응답에 전달하는 업스트림 헤더 (캐시 항목 메타데이터로도 저장)
+PREVIEW_HEADERS = ("content-type", "content-disposition", "cache-control")
+
+def cached_file_response(request: Request, entry: DiskCacheEntry):
+    """
+    캐시된 파일 전송 - If-None-Match가 맞으면 304, Range 요청이면 206 부분 응답
+    (Dify 파일 ID의 내용은 바뀌지 않으므로 캐시 키를 강한 ETag로 사용)
+    """
+    etag = f'"{entry.key}"'
+    headers = {k: v for k, v in entry.meta.items() if k != "content-type"}
+    headers.update({"ETag": etag, "Accept-Ranges": "bytes", "X-File-Cache": "hit"})
+    media_type = entry.meta.get("content-type")
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != etag:
+        range_header = None
     try:
-        api_key = await get_dify_api_key()
-        params = {"as_attachment": str(as_attachment).lower()}
-
-        client = httpx.AsyncClient(timeout=60.0)
-        req = client.build_request(
-            "GET",
-            f"http://agent.sapie.ai/v1/files/{file_id}/preview",
-            headers={"Authorization": f"Bearer {api_key}"},
-            params=params
-        )
-        r = await client.send(req, stream=True)
+        byte_range = parse_byte_range(range_header, entry.size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{entry.size}"})
 
-        if r.status_code != 200:
-            error_text = await r.aread()
-            raise HTTPException(status_code=r.status_code, detail=f"Dify 파일 미리보기 오류: {error_text.decode()}")
+    if byte_range is None:
+        start, end, status_code = 0, entry.size - 1, 200
+    else:
+        (start, end), status_code = byte_range, 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{entry.size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file_range(entry.path, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
 
-        return StreamingResponse(
-            r.aiter_bytes(),
-            status_code=r.status_code,
-            headers={k: v for k, v in r.headers.items() if k.lower() in [
-                "content-type", "content-disposition", "content-length",
-                "cache-control", "accept-ranges"
-            ]}
-        )
+@app.get("/files/{file_id}/preview")
+async def dify_file_preview(file_id: str, request: Request, as_attachment: bool = False):
+    """
+    Dify 파일 미리보기/다운로드 API 프록시
+    처음 요청은 Dify에서 받아 전달하면서 디스크에 저장하고, 이후 요청은 로컬 파일에서
+    Range/ETag 조건부 요청까지 처리한다 (첫 요청의 Range는 무시하고 전체 전송).
+    """
+    try:
+        key = cache_key("file-preview", file_id, as_attachment)
+        cached = file_cache.get(key) if file_cache is not None else None
+        if cached is not None:
+            return cached_file_response(request, cached)
+
+        flight = None
+        if file_cache is not None:
+            pending = preview_flight.join(key)
+            if pending is not None:
+                # 같은 파일을 받는 요청이 있음 - 저장이 끝나면 디스크에서 전송 (실패했으면 직접 조회)
+                try:
+                    await asyncio.wait_for(asyncio.shield(pending), PREVIEW_COALESCE_WAIT)
+                except asyncio.TimeoutError:
+                    pass
+                cached = file_cache.get(key)
+                if cached is not None:
+                    return cached_file_response(request, cached)
+            flight = preview_flight.start(key)
+
+        try:
+            return await fetch_file_preview(file_id, as_attachment, key, flight)
+        except BaseException:
+            if flight is not None:
+                preview_flight.finish(key, flight)
+            raise
 
     except HTTPException:
         raise
@@ -1056,46 +1374,101 @@ async def dify_file_preview(file_id: str, as_attachment: bool = False):
         logger.error(f"Error in dify_file_preview: {str(e)}")
         raise HTTPException(status_code=500, detail=f"파일 미리보기 오류: {str(e)}")
 
+async def fetch_file_preview(file_id: str, as_attachment: bool, key: str,
+                             flight: Optional[asyncio.Future]) -> StreamingResponse:
+    """
+    Dify에서 파일을 받아 전달 (캐시가 켜져 있으면 디스크에도 저장)
+    flight: 이 요청이 리더면 preview_flight.start()가 돌려준 Future - 전송 후 대기 요청들에 알림
+    """
+    api_key = await get_dify_api_key()
+    params = {"as_attachment": str(as_attachment).lower()}
+
+    client = upstream_clients.get("dify")
+    req = client.build_request(
+        "GET",
+        f"files/{file_id}/preview",
+        headers={"Authorization": f"Bearer {api_key}"},
+        params=params
+    )
+    permit = await admit("dify_files")
+    try:
+        r = await client.send(req, stream=True)
+    except BaseException:
+        permit.release()
+        raise
+
+    if r.status_code != 200:
+        error_text = await r.aread()
+        await r.aclose()
+        permit.release()
+        raise HTTPException(status_code=r.status_code, detail=f"Dify 파일 미리보기 오류: {error_text.decode()}")
+
+    headers = {k: v for k, v in r.headers.items() if k.lower() in PREVIEW_HEADERS}
+    if file_cache is None:
+        headers.update({k: v for k, v in r.headers.items() if k.lower() in (
+            "content-length", "accept-ranges", "content-encoding"
+        )})
+        body = r.aiter_raw()
+    else:
+        # 캐시에는 압축을 푼 본문을 저장하므로 content-encoding 없이 전달
+        if "content-length" in r.headers and "content-encoding" not in r.headers:
+            headers["content-length"] = r.headers["content-length"]
+            if flight is not None and int(r.headers["content-length"]) > file_cache.max_entry_bytes:
+                # 캐시에 저장하지 않을 크기 - 기다리는 요청들은 바로 직접 조회
+                preview_flight.finish(key, flight)
+        headers["ETag"] = f'"{key}"'
+        headers["X-File-Cache"] = "miss"
+        body = file_cache.tee(
+            key, r.aiter_bytes(),
+            {k.lower(): v for k, v in r.headers.items() if k.lower() in PREVIEW_HEADERS},
+        )
+
+    # 응답 전송이 끝나면 (클라이언트가 끊어도) 커넥션을 풀로 반환하고 대기 요청들에 알림
+    background = BackgroundTasks()
+    background.add_task(r.aclose)
+    background.add_task(permit.release)
+    if flight is not None:
+        background.add_task(preview_flight.finish, key, flight)
+    return StreamingResponse(
+        body,
+        status_code=r.status_code,
+        headers=headers,
+        background=background
+    )
+
 @app.post("/transcribe")
 async def transcribe_audio(request: Request):
-    """음성 인식 - OpenAI Whisper API 직접 호출"""
+    """음성 인식 - OpenAI Whisper API 직접 호출 (녹음 파일은 받는 대로 중계)"""
     try:
         openai_api_key = os.getenv("OPENAI_API_KEY")
         if not openai_api_key:
             raise HTTPException(status_code=500, detail="OpenAI API 키가 설정되지 않았습니다")
         
-        form = await request.form()
-        if "file" not in form:
-            raise HTTPException(status_code=400, detail="오디오 파일이 필요합니다")
-        
-        audio_file = form["file"]
-        if not hasattr(audio_file, 'read'):
-            raise HTTPException(status_code=400, detail="유효하지 않은 파일입니다")
-        
-        files = {"file": (audio_file.filename, await audio_file.read(), audio_file.content_type)}
-        data = {"model": "whisper-1", "response_format": "json"}
+        # file/language 파트만 전달하고 모델 설정은 게이트웨이가 지정
+        relay = open_upload_relay(
+            request, TRANSCRIBE_MAX_BYTES,
+            fields={"file", "language"},
+            extra_fields={"model": "whisper-1", "response_format": "json"},
+            required_files=("file",),
+        )
         
-        if "language" in form:
-            data["language"] = form["language"]
+        async with admitted("openai_stt", VOICE):
+            response = await relay_upload(relay, lambda body: upstream_clients.get("openai").post(
+                "audio/transcriptions",
+                headers={"Authorization": f"Bearer {openai_api_key}", **relay.headers()},
+                content=body,
+            ))
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                "https://api.openai.com/v1/audio/transcriptions",
-                headers={"Authorization": f"Bearer {openai_api_key}"},
-                files=files,
-                data=data
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return JSONResponse(content={
-                    "success": True,
-                    "text": result.get("text", ""),
-                    "language": result.get("language", "unknown")
-                })
-            else:
-                logger.error(f"OpenAI API error: {response.status_code}, {response.text}")
-                raise HTTPException(status_code=response.status_code, detail=f"OpenAI API 오류: {response.text}")
+        if response.status_code == 200:
+            result = response.json()
+            return JSONResponse(content={
+                "success": True,
+                "text": result.get("text", ""),
+                "language": result.get("language", "unknown")
+            }, headers=upload_headers(relay))
+        else:
+            logger.error("OpenAI API error: %s, %s", response.status_code, Payload(response.text))
+            raise HTTPException(status_code=response.status_code, detail=f"OpenAI API 오류: {response.text}")
                 
     except HTTPException:
         raise
@@ -1147,31 +1520,65 @@ async def synthesize_speech(request: Request):
             "response_format": response_format,
             "speed": speed
         }
+        audio_headers = {
+            "Content-Disposition": f"inline; filename=tts_output.{response_format}",
+            "Cache-Control": "no-cache"
+        }
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                "https://api.openai.com/v1/audio/speech",
+        # 같은 문장/음성/속도/형식은 디스크 캐시에서 바로 전송 (OpenAI 호출 없음)
+        key = cache_key("tts-1", text, voice, float(speed), response_format)
+        cached = tts_cache.get(key) if tts_cache is not None else None
+        if cached is not None:
+            # 파일을 먼저 열어 두고 전송 - 그 사이 LRU 제거로 지워졌으면 미스로 처리
+            try:
+                audio = iter_file_range(cached.path, 0, cached.size - 1)
+            except FileNotFoundError:
+                cached = None
+            else:
+                return StreamingResponse(
+                    audio,
+                    media_type=f"audio/{response_format}",
+                    headers={**audio_headers, "Content-Length": str(cached.size), "X-TTS-Cache": "hit"},
+                )
+        
+        client = upstream_clients.get("openai")
+        permit = await admit("openai_tts", VOICE)
+        try:
+            response = await client.send(client.build_request(
+                "POST",
+                "audio/speech",
                 headers={
                     "Authorization": f"Bearer {openai_api_key}",
                     "Content-Type": "application/json"
                 },
                 json=tts_payload
+            ), stream=True)
+        except BaseException:
+            permit.release()
+            raise
+        
+        if response.status_code == 200:
+            # 받는 대로 클라이언트에 전달 (첫 오디오까지의 시간 단축), 끝까지 받으면 캐시에 저장
+            audio = response.aiter_bytes()
+            if tts_cache is not None:
+                audio = tts_cache.tee(key, audio)
+            if "content-length" in response.headers and "content-encoding" not in response.headers:
+                audio_headers["Content-Length"] = response.headers["content-length"]
+            background = BackgroundTasks()
+            background.add_task(response.aclose)
+            background.add_task(permit.release)
+            return StreamingResponse(
+                audio,
+                media_type=f"audio/{response_format}",
+                headers={**audio_headers, "X-TTS-Cache": "miss" if tts_cache is not None else "off"},
+                background=background
             )
-            
-            if response.status_code == 200:
-                audio_content = response.content
-                return StreamingResponse(
-                    iter([audio_content]),
-                    media_type=f"audio/{response_format}",
-                    headers={
-                        "Content-Disposition": f"inline; filename=tts_output.{response_format}",
-                        "Content-Length": str(len(audio_content)),
-                        "Cache-Control": "no-cache"
-                    }
-                )
-            else:
-                logger.error(f"OpenAI TTS API error: {response.status_code}, {response.text}")
-                raise HTTPException(status_code=response.status_code, detail=f"OpenAI TTS API 오류: {response.text}")
+        else:
+            await response.aread()
+            await response.aclose()
+            permit.release()
+            logger.error("OpenAI TTS API error: %s, %s", response.status_code, Payload(response.text))
+            raise HTTPException(status_code=response.status_code, detail=f"OpenAI TTS API 오류: {response.text}")
                 
     except HTTPException:
         raise
@@ -1187,88 +1594,99 @@ async def proxy_request(service_name: str, path: str, request: Request):
         raise HTTPException(status_code=404, detail=f"서비스 '{service_name}'를 찾을 수 없습니다.")
     
     target_url = f"{SERVICE_ROUTES[service_name]}/{path}"
-    logger.info(f"Proxying {request.method} {request.url} -> {target_url}")
+    logger.info("Proxying %s %s -> %s", request.method, request.url, target_url)
     
+    client = upstream_clients.get("services")
+
+    # 요청 본문은 읽어 두지 않고 받는 대로 업스트림에 흘려보낸다 (본문이 없는 요청은 그대로)
+    has_body = request.headers.get("content-length", "0") != "0" or "transfer-encoding" in request.headers
+    upstream_request = client.build_request(
+        request.method,
+        target_url,
+        headers=filter_hop_by_hop(request.headers.items(), drop=("host",)),
+        params=request.query_params,
+        content=request.stream() if has_body else None,
+    )
+
+    permit = await admit("services")
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            headers = dict(request.headers)
-            headers.pop('host', None)
-            body = await request.body()
-            
-            response = await client.request(
-                method=request.method,
-                url=target_url,
-                headers=headers,
-                params=request.query_params,
-                content=body
-            )
-            
-            response_headers = dict(response.headers)
-            response_headers.pop('content-encoding', None)
-            response_headers.pop('content-length', None)
-            
-            return JSONResponse(
-                content=response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text,
-                status_code=response.status_code,
-                headers=response_headers
-            )
-            
+        response = await client.send(upstream_request, stream=True)
     except httpx.TimeoutException:
+        permit.release()
+        upstream_clients.record_error("services")
         raise HTTPException(status_code=504, detail="서비스 응답 시간 초과")
     except httpx.ConnectError:
+        permit.release()
+        upstream_clients.record_error("services")
         raise HTTPException(status_code=503, detail=f"서비스 '{service_name}'에 연결할 수 없습니다")
     except Exception as e:
-        logger.error(f"Error proxying to {target_url}: {str(e)}")
+        permit.release()
+        logger.error("Error proxying to %s: %s", target_url, e)
         raise HTTPException(status_code=502, detail=f"서비스 프록시 오류: {str(e)}")
+    except BaseException:
+        permit.release()
+        raise
+
+    # 응답 본문은 디코딩/재직렬화 없이 원본 바이트 그대로 전달 (Content-Encoding, Content-Length 유지)
+    # 전송이 끝나거나 클라이언트가 끊으면 커넥션과 입장 슬롯을 반환
+    background = BackgroundTasks()
+    background.add_task(response.aclose)
+    background.add_task(permit.release)
+    proxied = StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        background=background,
+    )
+    # Set-Cookie처럼 같은 이름이 여러 번 오는 헤더도 그대로 유지
+    # date/server는 uvicorn이 붙이므로 업스트림 값을 함께 보내면 중복 헤더가 된다
+    raw_headers = [(name.decode("latin-1"), value.decode("latin-1")) for name, value in response.headers.raw]
+    proxied.raw_headers = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in filter_hop_by_hop(raw_headers, drop=("date", "server"))
+    ]
+    return proxied
+
+def run_workers(workers: int, host: str, port: int):
+    """
+    다중 워커 프로세스 모드 - 워커들이 하나의 공유 점역 캐시 파일(BRAILLE_SHARED_CACHE_PATH)을 함께 쓴다.
+    워커는 각자 main을 다시 import해 lifespan에서 자기 점역 엔진(KorToBraille)을 예열하고,
+    점역 프로세스 풀 크기(BRAILLE_WORKERS)는 지정하지 않으면 CPU 수를 워커 수로 나눈 값이다.
+
+    공유되지 않는 캐시는 워커 간 불일치가 없도록 다음과 같이 동작한다.
+    - TTS/파일 디스크 캐시: 워커마다 <DIR>/worker-<i> 하위 디렉터리를 잠가 따로 쓰고, 상한(<PREFIX>_MAX_BYTES)은
+      워커 수로 나눠 전체 디스크 사용량이 설정값을 넘지 않는다. 같은 응답도 워커마다 따로 저장될 수 있다.
+    - 대화 내역 캐시(HISTORY_CACHE_*): 사용하지 않는다 (한 워커의 무효화가 다른 워커에 전달되지 않으므로).
+    워커 수는 GATEWAY_WORKERS로만 알 수 있으므로 `uvicorn --workers`로 직접 띄우지 말고 이 함수를 사용한다.
+    """
+    import uvicorn
+    from shared_braille_cache import default_shared_path
+
+    created_path = None
+    if not os.getenv("BRAILLE_SHARED_CACHE_PATH"):
+        created_path = os.environ["BRAILLE_SHARED_CACHE_PATH"] = default_shared_path()
+    os.environ.setdefault("BRAILLE_WORKERS", str(max((os.cpu_count() or 1) // workers, 1)))
+    logger.info("Starting %d gateway workers (shared braille cache %s, %s braille processes each)",
+                workers, os.environ["BRAILLE_SHARED_CACHE_PATH"], os.environ["BRAILLE_WORKERS"])
+    try:
+        uvicorn.run("main:app", host=host, port=port, workers=workers, log_config=None,
+                    app_dir=os.path.dirname(os.path.abspath(__file__)))
+    finally:
+        if created_path is not None:
+            try:
+                os.unlink(created_path)
+            except FileNotFoundError:
+                pass
 
 if __name__ == "__main__":
     import uvicorn
-    
-    # 커스텀 로깅 설정
-    LOGGING_CONFIG = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "default": {
-                "()": "uvicorn.logging.DefaultFormatter",
-                "fmt": "%(levelprefix)s %(asctime)s - %(message)s",
-                "use_colors": True,
-            },
-            "custom": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - [%(funcName)s:%(lineno)d] - %(message)s",
-            },
-        },
-        "handlers": {
-            "default": {
-                "formatter": "default",
-                "class": "logging.StreamHandler",
-                "stream": "ext://sys.stderr",
-            },
-            "custom": {
-                "formatter": "custom",
-                "class": "logging.StreamHandler",
-                "stream": "ext://sys.stdout",
-            },
-        },
-        "loggers": {
-            "": {
-                "handlers": ["custom"],
-                "level": "DEBUG",
-            },
-            "uvicorn.error": {
-                "handlers": ["custom"],
-                "level": "INFO",
-                "propagate": False
-            },
-            "uvicorn.access": {
-                "handlers": ["default"],
-                "level": "INFO",
-                "propagate": False
-            },
-        },
-    }
 
-    from logging.config import dictConfig
-    dictConfig(LOGGING_CONFIG)
+    # GATEWAY_WORKERS > 1이면 워커 프로세스 여러 개로 실행 (GATEWAY_HOST / GATEWAY_PORT)
+    gateway_host = os.getenv("GATEWAY_HOST", "0.0.0.0")
+    gateway_port = int(os.getenv("GATEWAY_PORT", "8080"))
+
+    # 로깅은 configure_logging()이 설정하므로 uvicorn 로거는 루트(큐 핸들러)로 전달만 한다
     logger.info("Dify 중심 단순화 아키텍처 적용 완료, 서버 시작")
-    uvicorn.run(app, host="0.0.0.0", port=8080, log_config=LOGGING_CONFIG)
\ No newline at end of file
+    if GATEWAY_WORKERS > 1:
+        run_workers(GATEWAY_WORKERS, gateway_host, gateway_port)
+    else:
+        uvicorn.run(app, host=gateway_host, port=gateway_port, log_config=None)
@@ -0,0 +1,245 @@
+"""
+Prometheus 텍스트 형식 메트릭 (/metrics) - 카운터, 히스토그램, 조회 시점에 계산하는 게이지
+운영에서 항상 켜 두도록 기록 비용을 최소화한다: 값 기록은 딕셔너리 조회 + 버킷 이분 탐색뿐이고,
+문자열 생성은 수집(스크레이프) 시에만 한다. 외부 라이브러리(prometheus_client) 없이 동작한다.
+"""
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import functools
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 지연 시간 버킷 (초) - 점역 한 문장(ms 이하)부터 긴 스트림(수십 초)까지
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# 개수 버킷 (스트림당 청크 수 등)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _label_order(item) -> Tuple[str, ...]:
+    return tuple(str(label) for label in item[0])
+
+
+class Counter:
+    """
+    단조 증가 카운터 - inc(*라벨 값)
+    라벨 값 튜플을 그대로 키로 쓰므로 같은 라벨은 항상 같은 타입(예: 상태 코드는 int)으로 넘긴다.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.exposed_name = f"{name}_total"
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: Any) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self._values.items(), key=_label_order):
+            yield f"{self.exposed_name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size  # 버킷별 (누적 아님) 개수, 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """
+    히스토그램 - observe(값, *라벨 값)
+    라벨 값 튜플을 그대로 키로 쓰고, 버킷 개수는 누적하지 않고 칸별로 세고, 출력할 때만 누적한다.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.exposed_name = name
+        self._series: Dict[Tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, *labels: Any):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _HistogramSeries(len(self.buckets) + 1)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+        series.count += 1
+
+    def timed(self, fn: Callable, *labels: Any) -> Callable:
+        """fn 실행 시간을 기록하는 래퍼 (동기 함수용)"""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.observe(time.perf_counter() - started, *labels)
+        return wrapper
+
+    def count(self, *labels: Any) -> int:
+        series = self._series.get(labels)
+        return series.count if series is not None else 0
+
+    def samples(self) -> Iterable[str]:
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, series in sorted(self._series.items(), key=_label_order):
+            cumulative = 0
+            for bound, count in zip(bounds, series.counts):
+                cumulative += count
+                le = 'le="' + bound + '"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            suffix = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{suffix} {_format_value(series.sum)}"
+            yield f"{self.name}_count{suffix} {series.count}"
+
+
+class CallbackGauge:
+    """수집할 때 callback()으로 값을 계산하는 게이지 - callback은 (라벨 값 튜플, 값) 목록 반환"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 callback: Callable[[], Iterable[Tuple[Sequence[Any], float]]]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.exposed_name = name
+        self.callback = callback
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self.callback():
+            yield f"{self.name}{_format_labels(self.labelnames, [str(label) for label in labels])} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """메트릭 모음 - 이름이 같은 메트릭을 다시 만들면 기존 객체를 돌려준다 (모듈 재로딩/테스트 대비)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric):
+                raise ValueError(f"metric {metric.name} already registered as {existing.kind}")
+            if isinstance(metric, CallbackGauge):
+                existing.callback = metric.callback
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str],
+              callback: Callable[[], Iterable[Tuple[Sequence[Any], float]]]) -> CallbackGauge:
+        return self._register(CallbackGauge(name, documentation, labelnames, callback))
+
+    def get(self, name: str) -> Optional[Any]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식 (version 0.0.4)"""
+        lines: List[str] = []
+        for _, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {metric.exposed_name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.exposed_name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# 게이트웨이 전체가 공유하는 기본 레지스트리
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "gateway_http_request_duration_seconds",
+    "HTTP request duration until the last response byte, by route template",
+    ("method", "route"),
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "gateway_http_requests",
+    "HTTP requests by route template and status code",
+    ("method", "route", "status"),
+)
+
+
+class MetricsMiddleware:
+    """
+    라우트별 요청 수/지연 시간 기록 (순수 ASGI 미들웨어 - 스트리밍 응답을 감싸지 않음)
+
+    라벨은 실제 경로가 아닌 라우트 템플릿(/conversations/{conversation_id}/messages)이라
+    경로 파라미터 때문에 시계열이 늘어나지 않는다. 스트리밍 응답은 마지막 바이트를 보낸 시점까지 잰다.
+    """
+
+    def __init__(self, app, exclude: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        recorded = False
+
+        def record():
+            nonlocal recorded
+            recorded = True
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, scope["method"], template)
+            HTTP_REQUESTS.inc(scope["method"], template, status)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False) and not recorded:
+                record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not recorded:
+                record()
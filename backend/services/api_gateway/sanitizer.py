@@ -0,0 +1,114 @@
+"""
+점역 전처리 - 마크다운/이모지 제거 및 점역 대상 문자 필터링
+모든 정규식은 모듈 로드 시 한 번만 컴파일하고, 적용할 필요가 없는 단계는 건너뛴다.
+"""
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# 1. 이모지 (다양한 유니코드 범위, 인접한 범위는 하나로 합쳐 문자당 비교 횟수를 줄임)
+_EMOJI_PATTERN = re.compile(
+    "["
+    "\U00002600-\U000027BF"  # Miscellaneous Symbols, Dingbats
+    "\U0000FE00-\U0000FE0F"  # Variation Selectors
+    "\U0001F004"             # Mahjong Tile Red Dragon
+    "\U0001F0CF"             # Playing Card Black Joker
+    "\U0001F18E"             # Negative squared AB
+    "\U0001F191-\U0001F19A"  # Squared symbols
+    "\U0001F1E0-\U0001F1FF"  # Regional Indicator Symbols
+    "\U0001F201-\U0001F202"  # Squared Katakana
+    "\U0001F21A"             # Squared CJK Unified Ideograph-7121
+    "\U0001F22F"             # Squared CJK Unified Ideograph-6307
+    "\U0001F232-\U0001F23A"  # Squared CJK Unified Ideographs
+    "\U0001F250-\U0001F251"  # Circled Ideographs
+    "\U0001F300-\U0001F64F"  # symbols & pictographs, emoticons
+    "\U0001F680-\U0001FAFF"  # transport & map ~ Symbols and Pictographs Extended-A
+    "]+"
+)
+
+# 이모지 후보 (위 범위를 모두 포함하는 단순한 범위) - 첫 후보 위치부터만 이모지 제거를 수행
+_EMOJI_CANDIDATE_PATTERN = re.compile("[\U00002600-\U000027BF\U0000FE00-\U0000FE0F\U0001F000-\U0001FAFF]")
+
+# 2~3. 마크다운 규칙 (적용 순서 유지, 각 규칙이 매칭되려면 반드시 포함되어야 하는 문자열과 함께)
+_MARKDOWN_RULES = (
+    ("](", re.compile(r'\[(.*?)\]\(.*?\)'), r'\1'),   # [text](url) -> text
+    ("](", re.compile(r'!\[.*?\]\(.*?\)'), ''),       # ![alt](url) 제거
+    ("**", re.compile(r'\*\*(.*?)\*\*'), r'\1'),      # **bold**
+    ("__", re.compile(r'__(.*?)__'), r'\1'),          # __bold__
+    ("*", re.compile(r'\*(.*?)\*'), r'\1'),           # *italic*
+    ("_", re.compile(r'_(.*?)_'), r'\1'),             # _italic_
+    ("`", re.compile(r'`(.*?)`'), r'\1'),             # `code`
+)
+
+# 4. 헤더 기호
+_HEADER_PATTERN = re.compile(r'^#{1,6}\s*', flags=re.MULTILINE)
+
+# 5. 여러 줄바꿈 정리
+_BLANK_LINES_PATTERN = re.compile(r'\n\s*\n')
+
+# 6. 한글, 숫자, 공백, 일부 문장 부호(.,?!") 외 문자
+_DISALLOWED_PATTERN = re.compile(r'[^가-힣0-9\s\.,\?!"]+')
+
+
+def sanitize_text_for_braille(text: str) -> str:
+    """점자 변환 전 텍스트에서 마크다운, 이모지 등 불필요한 요소를 제거합니다."""
+    # 입력 텍스트가 비어있거나 None인 경우 처리
+    if not text or not text.strip():
+        return ""
+
+    # 이모지는 문자 단위 규칙이므로 첫 후보 앞부분은 그대로 두고 뒷부분만 치환한다
+    candidate = _EMOJI_CANDIDATE_PATTERN.search(text)
+    if candidate:
+        start = candidate.start()
+        text = text[:start] + _EMOJI_PATTERN.sub('', text[start:])
+
+    # 필요한 문자열이 없는 규칙은 매칭될 수 없으므로 건너뛴다 (in 검사는 전체 치환보다 훨씬 싸다)
+    for trigger, pattern, replacement in _MARKDOWN_RULES:
+        if trigger in text:
+            text = pattern.sub(replacement, text)
+
+    if '#' in text:
+        text = _HEADER_PATTERN.sub('', text)
+
+    if text.count('\n') > 1:
+        text = _BLANK_LINES_PATTERN.sub('\n', text)
+    text = text.strip()
+
+    return _DISALLOWED_PATTERN.sub('', text)
+
+
+# 따옴표 패턴 (순서 중요: 패턴 순서대로 결과를 이어 붙인다)
+_QUOTE_PATTERNS = (
+    ("'", re.compile(r"'([^']+)'")),
+    ('"', re.compile(r'"([^"]+)"')),
+    ("`", re.compile(r'`([^`]+)`')),
+    ('"', re.compile(r'"([^"]+)"')),
+)
+
+
+def extract_quoted_text_for_braille(text: str) -> str:
+    """점역변환 에이전트(agent_id == 1)에서만 사용: 따옴표 안의 텍스트만 추출합니다."""
+    if not text or not text.strip():
+        return text
+
+    extracted_texts = []
+    found = {}
+    for quote, pattern in _QUOTE_PATTERNS:
+        if quote not in text:
+            continue
+        # 같은 패턴이 두 번 나오면 (큰따옴표) 이전 결과를 재사용 - 결과에는 두 번 포함된다
+        matches = found.get(pattern.pattern)
+        if matches is None:
+            matches = found[pattern.pattern] = pattern.findall(text)
+        extracted_texts.extend(matches)
+
+    # 따옴표 안의 텍스트가 있으면 그것들을 공백으로 연결하여 반환
+    if extracted_texts:
+        result = ' '.join(extracted_texts).strip()
+        logger.info("Extracted quoted text: %d chars -> %d chars", len(text), len(result))
+        return result
+
+    # 따옴표가 없으면 원본 텍스트 반환
+    logger.info("No quotes found, using original text (%d chars)", len(text))
+    return text
@@ -0,0 +1,245 @@
+"""
+프로세스 간 공유 점역 결과 캐시 - mmap 파일 위의 고정 크기 해시 테이블
+게이트웨이를 여러 워커 프로세스로 띄워도 모든 워커가 서로의 정제 텍스트 → 점자 결과를 재사용한다.
+
+파일 구조: 헤더(레이아웃 + 공유 통계) 뒤에 같은 크기의 슬롯이 이어진다. 키 해시로 버킷(ways개 슬롯)을 고르고,
+버킷이 차면 그 안에서 가장 오래 사용하지 않은 슬롯을 덮어쓴다. 읽기/쓰기는 모두 파일 잠금(flock) 안에서 하므로
+다른 워커가 쓰는 중인 슬롯을 읽지 않는다. 슬롯보다 큰 결과는 저장하지 않는다.
+"""
+from typing import Any, Dict, Optional, Tuple
+import contextlib
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from braille_cache import text_digest
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SBRLCACH"
+LAYOUT_VERSION = 1
+
+# magic, 레이아웃 버전, 슬롯 수, 버킷 크기(ways), 슬롯당 결과 최대 바이트 / 사용 시각 카운터, 적중, 실패, 저장, 제거
+_HEADER = struct.Struct("<8sIIIIQQQQQ")
+HEADER_SIZE = 128
+_TICK_OFFSET = 24
+_COUNTER_OFFSETS = {"hits": 32, "misses": 40, "stores": 48, "evictions": 56}
+
+# 키 해시, 결과 바이트 수, 원문 글자 수, 마지막 사용 시각 카운터(0이면 빈 슬롯), 저장 시각(epoch 초)
+_SLOT = struct.Struct("<16sIIQd")
+_U64 = struct.Struct("<Q")
+
+
+def default_shared_path() -> str:
+    """공유 캐시 파일 기본 경로 - 메모리 파일 시스템(/dev/shm)이 있으면 그곳에"""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"sapie-braille-cache-{os.getpid()}")
+
+
+class SharedBrailleCache:
+    """
+    여러 프로세스가 같은 파일을 열어 함께 쓰는 점역 결과 캐시 (BrailleCache와 같은 get/put/stats 인터페이스)
+
+    - path: 캐시 파일 경로 (모든 워커가 같은 경로를 사용)
+    - max_entries: 슬롯 수 (ways의 배수로 올림)
+    - ttl: 항목 유효 시간(초), 0이면 만료 없음
+    - entry_bytes: 슬롯 하나에 담을 점자 결과의 최대 UTF-8 바이트 수
+    - ways: 버킷 하나의 슬롯 수 (키 하나가 들어갈 수 있는 후보 슬롯 수)
+
+    파일이 이미 있고 헤더가 올바르면 먼저 띄운 워커가 만든 레이아웃을 그대로 따른다.
+    """
+
+    def __init__(self, path: str, max_entries: int = 4096, ttl: float = 0.0,
+                 entry_bytes: int = 4096, ways: int = 4):
+        self.path = path
+        self.ttl = ttl
+        self.ways = max(ways, 1)
+        self.max_entries = -(-max(max_entries, 1) // self.ways) * self.ways
+        self.entry_bytes = entry_bytes
+        self._thread_lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._locked():
+                self._attach()
+            self._mm = mmap.mmap(self._fd, self._total_size())
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._buckets = self.max_entries // self.ways
+
+        # 이 프로세스에서의 통계 (워커 전체 합계는 파일 헤더의 공유 통계)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.too_large = 0
+        self.saved_chars = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["SharedBrailleCache"]:
+        """
+        BRAILLE_SHARED_CACHE_PATH (없으면 비활성화), BRAILLE_CACHE_SIZE (0이면 비활성화), BRAILLE_CACHE_TTL,
+        BRAILLE_SHARED_CACHE_ENTRY_BYTES, BRAILLE_SHARED_CACHE_WAYS 환경 변수로 생성
+        """
+        path = os.getenv("BRAILLE_SHARED_CACHE_PATH")
+        max_entries = int(os.getenv("BRAILLE_CACHE_SIZE", "4096"))
+        if not path or max_entries <= 0:
+            return None
+        return cls(
+            path,
+            max_entries=max_entries,
+            ttl=float(os.getenv("BRAILLE_CACHE_TTL", "0")),
+            entry_bytes=int(os.getenv("BRAILLE_SHARED_CACHE_ENTRY_BYTES", "4096")),
+            ways=int(os.getenv("BRAILLE_SHARED_CACHE_WAYS", "4")),
+        )
+
+    def _slot_size(self) -> int:
+        return _SLOT.size + self.entry_bytes
+
+    def _total_size(self) -> int:
+        return HEADER_SIZE + self.max_entries * self._slot_size()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """프로세스 간(flock) + 프로세스 안 스레드 간 배타 잠금"""
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _attach(self):
+        """잠금 안에서 호출 - 기존 레이아웃을 따르거나 파일을 새로 초기화"""
+        header = os.pread(self._fd, _HEADER.size, 0)
+        if len(header) == _HEADER.size:
+            magic, version, slots, ways, entry_bytes, *_ = _HEADER.unpack(header)
+            if magic == MAGIC and version == LAYOUT_VERSION and slots and ways and slots % ways == 0:
+                if (slots, ways, entry_bytes) != (self.max_entries, self.ways, self.entry_bytes):
+                    logger.warning("Shared braille cache %s already uses %d slots x %d bytes (%d ways), keeping it",
+                                   self.path, slots, entry_bytes, ways)
+                self.max_entries, self.ways, self.entry_bytes = slots, ways, entry_bytes
+                if os.fstat(self._fd).st_size >= self._total_size():
+                    return
+        # 빈 파일 또는 다른 형식 - 0으로 채운(모두 빈 슬롯) 파일을 만들고 헤더 기록
+        os.ftruncate(self._fd, 0)
+        os.ftruncate(self._fd, self._total_size())
+        os.pwrite(self._fd, _HEADER.pack(MAGIC, LAYOUT_VERSION, self.max_entries, self.ways,
+                                         self.entry_bytes, 0, 0, 0, 0, 0), 0)
+
+    def _next_tick(self) -> int:
+        tick = _U64.unpack_from(self._mm, _TICK_OFFSET)[0] + 1
+        _U64.pack_into(self._mm, _TICK_OFFSET, tick)
+        return tick
+
+    def _count(self, name: str):
+        offset = _COUNTER_OFFSETS[name]
+        _U64.pack_into(self._mm, offset, _U64.unpack_from(self._mm, offset)[0] + 1)
+
+    def _bucket(self, key: bytes) -> range:
+        first = int.from_bytes(key[:8], "little") % self._buckets * self.ways
+        return range(first, first + self.ways)
+
+    def _offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * self._slot_size()
+
+    def _find(self, key: bytes) -> Optional[Tuple[int, Tuple[bytes, int, int, int, float]]]:
+        for slot in self._bucket(key):
+            offset = self._offset(slot)
+            if self._mm[offset:offset + 16] == key:
+                entry = _SLOT.unpack_from(self._mm, offset)
+                if entry[3]:
+                    return offset, entry
+        return None
+
+    def get(self, sanitized_text: str) -> Optional[str]:
+        key = text_digest(sanitized_text)
+        with self._locked():
+            found = self._find(key)
+            if found is None:
+                self._count("misses")
+                self.misses += 1
+                return None
+
+            offset, (_, length, chars, _, stored_at) = found
+            if self.ttl and time.time() - stored_at > self.ttl:
+                _SLOT.pack_into(self._mm, offset, bytes(16), 0, 0, 0, 0.0)
+                self._count("misses")
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            _U64.pack_into(self._mm, offset + 24, self._next_tick())
+            self._count("hits")
+            data = self._mm[offset + _SLOT.size:offset + _SLOT.size + length]
+        self.hits += 1
+        self.saved_chars += chars
+        return data.decode("utf-8")
+
+    def put(self, sanitized_text: str, braille: str):
+        data = braille.encode("utf-8")
+        if len(data) > self.entry_bytes:
+            self.too_large += 1
+            return
+        key = text_digest(sanitized_text)
+        with self._locked():
+            found = self._find(key)
+            if found is not None:
+                offset = found[0]
+            else:
+                # 빈 슬롯(사용 시각 0)이 있으면 그곳, 없으면 가장 오래 사용하지 않은 슬롯
+                offset, oldest = 0, None
+                for slot in self._bucket(key):
+                    candidate = self._offset(slot)
+                    tick = _U64.unpack_from(self._mm, candidate + 24)[0]
+                    if oldest is None or tick < oldest:
+                        offset, oldest = candidate, tick
+                if oldest:
+                    self._count("evictions")
+                    self.evictions += 1
+            self._mm[offset + _SLOT.size:offset + _SLOT.size + len(data)] = data
+            _SLOT.pack_into(self._mm, offset, key, len(data), len(sanitized_text), self._next_tick(), time.time())
+            self._count("stores")
+
+    def clear(self):
+        with self._locked():
+            for slot in range(self.max_entries):
+                _SLOT.pack_into(self._mm, self._offset(slot), bytes(16), 0, 0, 0, 0.0)
+
+    def close(self):
+        self._mm.close()
+        os.close(self._fd)
+
+    def shared_stats(self) -> Dict[str, int]:
+        """모든 워커 합계 (파일 헤더 값)"""
+        with self._locked():
+            counters = {name: _U64.unpack_from(self._mm, offset)[0] for name, offset in _COUNTER_OFFSETS.items()}
+            counters["size"] = sum(1 for slot in range(self.max_entries)
+                                   if _U64.unpack_from(self._mm, self._offset(slot) + 24)[0])
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+        return counters
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "max_entries": self.max_entries,
+            "entry_bytes": self.entry_bytes,
+            "ways": self.ways,
+            "ttl": self.ttl,
+            "pid": os.getpid(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "too_large": self.too_large,
+            "saved_chars": self.saved_chars,
+            "shared": self.shared_stats(),
+        }
@@ -0,0 +1,93 @@
+"""
+요청 합치기 (single-flight) - 같은 키의 업스트림 조회가 이미 진행 중이면 새로 보내지 않고 그 결과를 공유
+여러 탭/재렌더링으로 같은 GET이 동시에 몰려도 Dify에는 한 번만 요청한다.
+"""
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+import asyncio
+
+T = TypeVar("T")
+
+
+def _consume_result(future: asyncio.Future):
+    # 기다리는 쪽이 없어도 "exception was never retrieved" 경고가 나지 않게 결과를 읽어 둔다
+    if not future.cancelled():
+        future.exception()
+
+
+class SingleFlight:
+    """
+    진행 중인 조회 목록 (키 → 결과 Future)
+
+    - do(key, fn): 같은 키가 진행 중이면 그 결과를 기다리고, 아니면 fn()을 실행해 결과를 공유
+    - join / start / finish: 응답 스트리밍처럼 코루틴 하나로 감쌀 수 없는 작업용 저수준 API
+      (start가 돌려준 Future를 finish에 넘긴다 - 여러 번 호출해도 이후 리더의 항목은 지우지 않음)
+
+    리더 요청이 취소되면(클라이언트 연결 끊김) 기다리던 요청들은 취소되지 않고 다시 시도한다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def join(self, key: Hashable) -> Optional[asyncio.Future]:
+        """진행 중인 같은 키의 Future (없으면 None)"""
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+        return future
+
+    def start(self, key: Hashable) -> Optional[asyncio.Future]:
+        """이 요청이 리더가 됨 - 끝나면 반환된 Future로 반드시 finish() 호출 (이미 다른 리더가 있으면 None)"""
+        if key in self._calls:
+            return None
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_result)
+        self._calls[key] = future
+        self.leaders += 1
+        return future
+
+    def finish(self, key: Hashable, future: asyncio.Future, result: Any = None,
+               error: Optional[BaseException] = None):
+        """start()가 돌려준 future의 결과 설정 - 키가 이미 다음 리더의 것이면 목록에서 지우지 않는다"""
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if future.done():
+            return
+        if isinstance(error, asyncio.CancelledError):
+            future.cancel()
+        elif error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            call = self.start(key)
+            if call is not None:
+                break
+            future = self.join(key)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # 이 요청 자체가 취소됨
+                # 리더가 취소됨 - 다시 시도
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result=result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / requests, 4) if requests else 0.0,
+        }
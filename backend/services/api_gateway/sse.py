@@ -0,0 +1,352 @@
+"""
+SSE 프레임 송신기 - 작은 message 청크를 바이트 예산/플러시 간격 단위로 묶어서 전송
+토큰마다 json.dumps 한 번, 쓰기 한 번씩 하던 방식 대신 프레임 수를 줄이고,
+타자기처럼 보이는 연출(pacing)은 클라이언트가 요청할 때만 적용한다.
+"""
+from dataclasses import dataclass
+from json.decoder import scanstring
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+
+from metrics import COUNT_BUCKETS, REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# 스트림 단계별 시간 (요청 수신 시각 기준) 및 스트림당 청크 수 - source는 dify / braille
+STREAM_CONNECT_SECONDS = REGISTRY.histogram(
+    "gateway_stream_upstream_connect_seconds",
+    "Time from request to upstream response headers", ("source",))
+STREAM_FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    "gateway_stream_upstream_first_token_seconds",
+    "Time from request to the first answer chunk received from upstream (TTFT)", ("source",))
+STREAM_FIRST_CHUNK_SECONDS = REGISTRY.histogram(
+    "gateway_stream_first_chunk_seconds",
+    "Time from request to the first SSE frame produced for the client (TTFC)", ("source",))
+STREAM_DURATION_SECONDS = REGISTRY.histogram(
+    "gateway_stream_duration_seconds",
+    "Time from request to stream close", ("source",))
+STREAM_FRAMES = REGISTRY.histogram(
+    "gateway_stream_frames",
+    "SSE frames sent to the client per stream", ("source",), buckets=COUNT_BUCKETS)
+STREAM_UPSTREAM_CHUNKS = REGISTRY.histogram(
+    "gateway_stream_upstream_chunks",
+    "Answer chunks received from upstream per stream", ("source",), buckets=COUNT_BUCKETS)
+
+
+@dataclass(frozen=True)
+class PacingProfile:
+    """
+    message 이벤트 전송 방식
+
+    - max_bytes: 모아 둔 텍스트가 이 크기(UTF-8 바이트) 이상이면 즉시 전송 (0이면 청크마다 전송)
+    - flush_interval: 모아 둔 텍스트를 최대 이 시간(초)까지만 보관
+    - chunk_chars / delay: 타자기 연출 - 텍스트를 chunk_chars 글자씩 잘라 delay초 간격으로 전송
+    """
+    name: str
+    max_bytes: int = 0
+    flush_interval: float = 0.0
+    chunk_chars: int = 0
+    delay: float = 0.0
+
+
+PACING_PROFILES: Dict[str, PacingProfile] = {
+    # 업스트림 청크를 그대로 한 프레임씩 (지연 없음)
+    "passthrough": PacingProfile("passthrough"),
+    # 작은 토큰 청크를 묶어서 전송 (기본)
+    "coalesce": PacingProfile(
+        "coalesce",
+        max_bytes=int(os.getenv("SSE_COALESCE_BYTES", "512")),
+        flush_interval=float(os.getenv("SSE_FLUSH_INTERVAL", "0.05")),
+    ),
+    # 기존 화면 효과 (10글자씩 20ms 간격)
+    "typewriter": PacingProfile("typewriter", chunk_chars=10, delay=0.02),
+}
+
+DEFAULT_PACING = os.getenv("SSE_PACING", "coalesce")
+
+
+def _scan_string_field(line: str, key: str) -> Optional[str]:
+    """JSON 텍스트에서 첫 번째 "key": "..." 문자열 값만 디코딩 (찾지 못하면 None)"""
+    start = line.find(key)
+    if start < 0:
+        return None
+    position = start + len(key)
+    while position < len(line) and line[position] in " \t":
+        position += 1
+    if position >= len(line) or line[position] != '"':
+        return None
+    try:
+        value, _ = scanstring(line, position + 1)
+    except ValueError:
+        return None
+    return value
+
+
+def scan_dify_frame(line: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Dify SSE 줄("data: {...}")에서 event 이름과 message의 answer만 읽어냄 - (event, answer)
+
+    전체 json.loads 대신 키 위치를 찾아 문자열 값만 디코딩한다. 문자열 값 안의 따옴표는
+    이스케이프되어 있으므로 '"event":' 같은 키 패턴이 값 안에서 잘못 찾아지는 일은 없다.
+    event를 찾지 못하면 (None, None), message인데 answer가 없으면 (event, None)을 반환하며,
+    호출 측은 이 경우 전체 JSON 파싱으로 처리한다.
+    """
+    event = _scan_string_field(line, '"event":')
+    if event != "message":
+        return event, None
+    return event, _scan_string_field(line, '"answer":')
+
+
+def resolve_pacing(name: Optional[str]) -> PacingProfile:
+    """클라이언트가 요청한 pacing 이름을 프로필로 변환 (모르는 이름이면 기본 프로필)"""
+    profile = PACING_PROFILES.get(name or DEFAULT_PACING)
+    if profile is None:
+        profile = PACING_PROFILES.get(DEFAULT_PACING, PACING_PROFILES["coalesce"])
+    return profile
+
+
+class SSEStreamStats:
+    """게이트웨이 전체 SSE 스트림 누적 통계 (/admin/sse-streams)"""
+
+    def __init__(self):
+        self.streams = 0
+        self.text_chunks = 0
+        self.serializations = 0
+        self.frames = 0
+        self.message_frames = 0
+        self.raw_frames = 0
+        self.bytes = 0
+        self.by_profile: Dict[str, int] = {}
+
+    def record(self, emitter: "SSEEmitter"):
+        self.streams += 1
+        self.text_chunks += emitter.text_chunks
+        self.serializations += emitter.serializations
+        self.frames += emitter.frames
+        self.message_frames += emitter.message_frames
+        self.raw_frames += emitter.raw_frames
+        self.bytes += emitter.bytes
+        name = emitter.profile.name
+        self.by_profile[name] = self.by_profile.get(name, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "streams": self.streams,
+            "text_chunks": self.text_chunks,
+            "serializations": self.serializations,
+            "frames": self.frames,
+            "message_frames": self.message_frames,
+            "raw_frames": self.raw_frames,
+            "bytes": self.bytes,
+            "chunks_per_message_frame": round(self.text_chunks / self.message_frames, 2) if self.message_frames else 0.0,
+            "by_profile": dict(self.by_profile),
+        }
+
+
+sse_stream_stats = SSEStreamStats()
+
+
+class SSEEmitter:
+    """
+    스트림 하나의 SSE 프레임 생성기
+
+    text()로 받은 message 청크는 프로필에 따라 모았다가 한 프레임으로 내보내고,
+    event()로 보내는 다른 이벤트(braille_delta, message_end, error) 앞에서는 모아 둔
+    텍스트를 먼저 내보내 순서를 유지한다.
+
+    started(요청 수신 시각, time.monotonic)부터 업스트림 응답 헤더, 첫 답변 청크, 클라이언트로 보낼
+    첫 프레임까지의 시간을 재서 close() 때 메트릭에 기록한다.
+    """
+
+    def __init__(self, profile: PacingProfile, source: str = "dify", started: Optional[float] = None):
+        self.profile = profile
+        self.source = source
+        # 모아 둔 message - (원본 프레임 여부, 텍스트 청크 또는 직렬화된 프레임)을 받은 순서대로
+        self._pending: List[Tuple[bool, str]] = []
+        self._pending_bytes = 0
+        self._pending_since = 0.0
+        self._closed = False
+
+        # 스트림별 측정값
+        self.text_chunks = 0
+        self.serializations = 0
+        self.frames = 0
+        self.message_frames = 0
+        self.raw_frames = 0
+        self.bytes = 0
+        self.started = time.monotonic() if started is None else started
+        self.connected_at: Optional[float] = None
+        self.first_token_at: Optional[float] = None
+        self.first_frame_at: Optional[float] = None
+
+    def upstream_connected(self):
+        """업스트림 응답 헤더 수신 (재시도하면 마지막 응답 기준)"""
+        self.connected_at = time.monotonic()
+
+    def _frame(self, payload: Dict[str, Any]) -> str:
+        frame = f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        if self.first_frame_at is None:
+            self.first_frame_at = time.monotonic()
+        self.serializations += 1
+        self.frames += 1
+        self.bytes += len(frame)
+        return frame
+
+    def _take_pending(self) -> List[str]:
+        frames = []
+        pending, self._pending = self._pending, []
+        self._pending_bytes = 0
+        # 받은 순서 유지 - 연속된 원본 프레임은 직렬화 없이 이어 붙이고, 연속된 텍스트 청크는 한 프레임으로
+        for is_raw, group in itertools.groupby(pending, key=lambda item: item[0]):
+            data = "".join(payload for _, payload in group)
+            if is_raw:
+                if self.first_frame_at is None:
+                    self.first_frame_at = time.monotonic()
+                frames.append(data)
+            else:
+                self.message_frames += 1
+                frames.append(self._frame({"event": "message", "chunk": data}))
+        return frames
+
+    async def text(self, chunk: str) -> AsyncIterator[str]:
+        """message 청크 추가 - 지금 보낼 프레임들을 생성 (타자기 프로필이면 간격을 두고 생성)"""
+        if not chunk:
+            return
+        if not self.text_chunks:
+            self.first_token_at = time.monotonic()
+        self.text_chunks += 1
+        profile = self.profile
+
+        if profile.chunk_chars:
+            for i in range(0, len(chunk), profile.chunk_chars):
+                self.message_frames += 1
+                yield self._frame({"event": "message", "chunk": chunk[i:i + profile.chunk_chars]})
+                await asyncio.sleep(profile.delay)
+            return
+
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append((False, chunk))
+        self._pending_bytes += len(chunk.encode("utf-8"))
+        if self._pending_bytes >= profile.max_bytes or self.flush_timeout() == 0:
+            for frame in self._take_pending():
+                yield frame
+
+    def raw(self, frame: str) -> List[str]:
+        """
+        업스트림에서 이미 직렬화된 message 프레임("data: ...\n\n")을 그대로 전송 - 지금 보낼 데이터 반환
+        재직렬화하지 않으며, 묶음 전송 프로필이면 여러 프레임을 이어 붙여 한 번에 보낸다 (타자기 연출 없음).
+        """
+        if not self.text_chunks:
+            self.first_token_at = time.monotonic()
+        self.text_chunks += 1
+        self.frames += 1
+        self.message_frames += 1
+        self.raw_frames += 1
+        self.bytes += len(frame)
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append((True, frame))
+        self._pending_bytes += len(frame)
+        if self._pending_bytes >= self.profile.max_bytes or self.flush_timeout() == 0:
+            return self._take_pending()
+        return []
+
+    def event(self, payload: Dict[str, Any]) -> List[str]:
+        """다른 이벤트 전송 - 모아 둔 텍스트를 먼저 내보낸 뒤 이벤트 프레임"""
+        frames = self._take_pending()
+        frames.append(self._frame(payload))
+        return frames
+
+    def flush(self) -> List[str]:
+        """모아 둔 텍스트를 즉시 내보냄"""
+        return self._take_pending()
+
+    def flush_timeout(self) -> Optional[float]:
+        """모아 둔 텍스트를 내보내야 할 때까지 남은 시간 (모아 둔 텍스트가 없으면 None)"""
+        if not self._pending:
+            return None
+        elapsed = time.monotonic() - self._pending_since
+        return max(self.profile.flush_interval - elapsed, 0.0)
+
+    async def ticking(self, source: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """
+        업스트림 이터레이터를 그대로 중계하되, 모아 둔 텍스트의 플러시 시간이 되도록
+        업스트림이 조용하면 None을 생성한다 (호출 측은 None을 받으면 flush()를 전송).
+
+        업스트림은 별도 태스크가 작은 큐로 읽어 들이므로, 토큰이 몰려 올 때는 큐에서 바로
+        꺼내고 큐가 비었을 때만 플러시 시간까지 기다린다.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        finished = object()
+
+        async def pump():
+            try:
+                async for item in source:
+                    await queue.put((item, None))
+                await queue.put((finished, None))
+            except Exception as e:
+                await queue.put((finished, e))
+
+        reader = asyncio.ensure_future(pump())
+        try:
+            while True:
+                try:
+                    item, error = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = self.flush_timeout()
+                    try:
+                        item, error = await asyncio.wait_for(queue.get(), timeout) if timeout is not None \
+                            else await queue.get()
+                    except asyncio.TimeoutError:
+                        yield None
+                        continue
+                if item is finished:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            reader.cancel()
+
+    def close(self):
+        """스트림 종료 - 측정값을 로그와 누적 통계에 기록 (한 번만)"""
+        if self._closed:
+            return
+        self._closed = True
+        sse_stream_stats.record(self)
+        self._observe()
+        logger.info(
+            "SSE stream closed: profile=%s text_chunks=%d serializations=%d frames=%d "
+            "message_frames=%d raw_frames=%d bytes=%d",
+            self.profile.name, self.text_chunks, self.serializations, self.frames,
+            self.message_frames, self.raw_frames, self.bytes,
+        )
+
+    def _observe(self):
+        source = self.source
+        if self.connected_at is not None:
+            STREAM_CONNECT_SECONDS.observe(self.connected_at - self.started, source)
+        if self.first_token_at is not None:
+            STREAM_FIRST_TOKEN_SECONDS.observe(self.first_token_at - self.started, source)
+        if self.first_frame_at is not None:
+            STREAM_FIRST_CHUNK_SECONDS.observe(self.first_frame_at - self.started, source)
+        STREAM_DURATION_SECONDS.observe(time.monotonic() - self.started, source)
+        STREAM_FRAMES.observe(self.frames, source)
+        STREAM_UPSTREAM_CHUNKS.observe(self.text_chunks, source)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "profile": self.profile.name,
+            "text_chunks": self.text_chunks,
+            "serializations": self.serializations,
+            "frames": self.frames,
+            "message_frames": self.message_frames,
+            "raw_frames": self.raw_frames,
+            "bytes": self.bytes,
+        }
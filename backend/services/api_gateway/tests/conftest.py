@@ -0,0 +1,16 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+# 게이트웨이 모듈은 패키지가 아니라 같은 디렉터리 import를 사용하므로 경로를 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    """main 모듈 - 처음 import할 때 점역은 프로세스 풀 없이 (lifespan은 실행하지 않음)"""
+    monkeypatch.setenv("BRAILLE_WORKERS", "0")
+    monkeypatch.setenv("HEALTH_REFRESH_INTERVAL", "0")
+    return importlib.import_module("main")
@@ -0,0 +1,140 @@
+"""
+admission 모듈 테스트 - 동시 요청 제한, 우선순위/aging 순서, 대기열 초과/대기 시간 초과 거절
+"""
+import asyncio
+
+import pytest
+
+from admission import BULK, INTERACTIVE, VOICE, AdmissionLimiter, AdmissionRejected
+
+
+def test_slots_are_handed_to_waiters_in_order():
+    limiter = AdmissionLimiter("test", max_concurrent=2, max_queue=10, max_wait=1.0)
+    running = []
+    order = []
+    peak = 0
+
+    async def call(i):
+        nonlocal peak
+        async with limiter.slot():
+            running.append(i)
+            peak = max(peak, len(running))
+            order.append(i)
+            await asyncio.sleep(0.01)
+            running.remove(i)
+
+    async def run():
+        await asyncio.gather(*(call(i) for i in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert order == list(range(6))
+    stats = limiter.stats()
+    assert stats["active"] == 0 and stats["waiting"] == 0
+    assert stats["admitted"] == 6 and stats["queued"] == 4
+
+
+def test_full_queue_is_rejected_immediately():
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=1, max_wait=1.0)
+
+    async def run():
+        held = await limiter.acquire()
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await limiter.acquire()
+        held.release()
+        (await queued).release()
+        return rejected.value
+
+    rejected = asyncio.run(run())
+    assert rejected.reason == "queue full" and 1 <= rejected.retry_after <= 60
+    assert limiter.stats()["rejected_queue_full"] == 1
+    assert limiter.active == 0
+
+
+def test_wait_timeout_and_cancelled_waiters_do_not_leak_slots():
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=5, max_wait=0.02)
+
+    async def run():
+        held = await limiter.acquire()
+        with pytest.raises(AdmissionRejected, match="timeout"):
+            await limiter.acquire()
+        cancelled = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        held.release()
+        held.release()  # 두 번 반환해도 한 번만 반영
+        (await limiter.acquire()).release()
+
+    asyncio.run(run())
+    assert limiter.stats()["rejected_timeout"] == 1
+    assert limiter.active == 0 and limiter.waiting == 0
+
+
+def test_higher_priority_waiters_are_served_first():
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=10, max_wait=5.0)
+    order = []
+
+    async def call(priority, label):
+        async with limiter.slot(priority):
+            order.append(label)
+            await asyncio.sleep(0.005)
+
+    async def run():
+        held = await limiter.acquire()
+        tasks = [asyncio.ensure_future(call(priority, label)) for priority, label in
+                 ((BULK, "bulk"), (INTERACTIVE, "text"), (VOICE, "voice"), (INTERACTIVE, "text2"))]
+        await asyncio.sleep(0)
+        held.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert order == ["voice", "text", "text2", "bulk"]
+    classes = limiter.stats()["classes"]
+    assert classes[VOICE]["admitted"] == 1 and classes[BULK]["queued"] == 1
+    assert classes[BULK]["wait_max_ms"] >= classes[VOICE]["wait_max_ms"]
+
+
+def test_aged_waiters_are_promoted():
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=10, max_wait=5.0, aging=0.02)
+    order = []
+
+    async def call(priority, label):
+        async with limiter.slot(priority):
+            order.append(label)
+
+    async def run():
+        held = await limiter.acquire()
+        bulk = asyncio.ensure_future(call(BULK, "bulk"))
+        await asyncio.sleep(0.03)
+        voice = asyncio.ensure_future(call(VOICE, "voice"))
+        await asyncio.sleep(0)
+        held.release()
+        await asyncio.gather(bulk, voice)
+
+    asyncio.run(run())
+    assert order == ["bulk", "voice"]
+    assert limiter.stats()["classes"][BULK]["promoted"] == 1
+
+
+def test_full_queue_displaces_lower_priority():
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=1, max_wait=1.0)
+
+    async def run():
+        held = await limiter.acquire()
+        bulk = asyncio.ensure_future(limiter.acquire(BULK))
+        await asyncio.sleep(0)
+        voice = asyncio.ensure_future(limiter.acquire(VOICE))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected, match="displaced"):
+            await bulk
+        held.release()
+        (await voice).release()
+        with pytest.raises(ValueError):
+            await limiter.acquire("urgent")
+
+    asyncio.run(run())
+    assert limiter.stats()["rejected_displaced"] == 1
+    assert limiter.active == 0
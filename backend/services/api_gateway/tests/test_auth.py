@@ -0,0 +1,57 @@
+"""
+auth 모듈 테스트 - 토큰 검증 캐시, 만료, 헤더 해석
+"""
+import time
+
+import jwt as pyjwt
+import pytest
+
+from auth import AuthError, JWTAuthenticator, bearer_token
+
+SECRET = "test-secret"
+
+
+def token(**claims) -> str:
+    return pyjwt.encode({"sub": "saltware", **claims}, SECRET, algorithm="HS256")
+
+
+def test_verified_tokens_are_served_from_cache():
+    authenticator = JWTAuthenticator(SECRET, cache_size=2)
+    first = token(exp=int(time.time()) + 60)
+
+    assert authenticator.verify(first)["sub"] == "saltware"
+    assert authenticator.verify(first)["sub"] == "saltware"
+    assert authenticator.stats()["hits"] == 1 and authenticator.stats()["misses"] == 1
+
+    authenticator.verify(token(n=1))
+    authenticator.verify(token(n=2))
+    assert authenticator.stats()["evictions"] == 1
+
+
+def test_cached_entry_expires_with_token():
+    authenticator = JWTAuthenticator(SECRET)
+    short = token(exp=int(time.time()) + 1)
+    authenticator.verify(short)
+
+    time.sleep(1.1)
+    with pytest.raises(AuthError, match="만료"):
+        authenticator.verify(short)
+    assert authenticator.stats()["expirations"] == 1
+
+
+def test_invalid_tokens_are_rejected_and_not_cached():
+    authenticator = JWTAuthenticator(SECRET)
+    forged = pyjwt.encode({"sub": "saltware"}, "other-secret", algorithm="HS256")
+    for bad in (forged, "not-a-token", pyjwt.encode({"name": "x"}, SECRET, algorithm="HS256")):
+        with pytest.raises(AuthError):
+            authenticator.verify(bad)
+    assert authenticator.stats()["size"] == 0
+    assert authenticator.stats()["failures"] == 3
+
+
+def test_bearer_token():
+    assert bearer_token("Bearer abc") == "abc"
+    assert bearer_token("bearer  abc ") == "abc"
+    assert bearer_token("Basic abc") is None
+    assert bearer_token("Bearer ") is None
+    assert bearer_token(None) is None
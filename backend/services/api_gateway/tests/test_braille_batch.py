@@ -0,0 +1,67 @@
+"""
+/convert-to-braille/batch 엔드포인트 테스트 - 중복 텍스트 한 번만 점역, 요청 순서 유지, 항목별 실패 격리
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from braille_engine import BrailleEngineBusy
+
+
+@pytest.fixture
+def translated(gateway, monkeypatch):
+    """점역 엔진 대신 호출된 정제 텍스트를 기록하는 가짜 translate ("실패"/"바쁨"이 들어 있으면 오류)"""
+    calls = []
+
+    async def translate(sanitized_text, priority=None):
+        calls.append(sanitized_text)
+        await asyncio.sleep(0.01 if "느림" in sanitized_text else 0)
+        if "실패" in sanitized_text:
+            raise RuntimeError("korTranslate failed")
+        if "바쁨" in sanitized_text:
+            raise BrailleEngineBusy("queue full")
+        return f"<{sanitized_text}>"
+
+    monkeypatch.setattr(gateway.braille_engine, "translate", translate)
+    return calls
+
+
+def post_batch(gateway, texts, stream=False):
+    client = TestClient(gateway.app)
+    items = [{"id": f"m{index}", "text": text} for index, text in enumerate(texts)]
+    return client.post("/convert-to-braille/batch", json={"items": items, "stream": stream})
+
+
+def test_duplicates_are_translated_once_and_results_keep_input_order(gateway, translated):
+    # "**안녕**"과 "안녕"은 정제 결과가 같으므로 한 번만 점역
+    response = post_batch(gateway, ["느림 먼저", "안녕", "**안녕**", "둘째", "안녕"])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert sorted(translated) == ["느림 먼저", "둘째", "안녕"]
+    assert (body["count"], body["unique"]) == (5, 3)
+    assert [(result["index"], result["id"], result["braille"]) for result in body["results"]] == [
+        (0, "m0", "<느림 먼저>"), (1, "m1", "<안녕>"), (2, "m2", "<안녕>"), (3, "m3", "<둘째>"), (4, "m4", "<안녕>"),
+    ]
+
+
+def test_failed_items_do_not_fail_the_batch(gateway, translated):
+    response = post_batch(gateway, ["앞 문장", "실패 문장", "바쁨 문장", "실패 문장", "뒤 문장"])
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["braille"] for result in results] == ["<앞 문장>", None, None, None, "<뒤 문장>"]
+    assert [result.get("error") for result in results] == [None, "failed", "busy", "failed", None]
+    assert translated.count("실패 문장") == 1
+
+
+def test_stream_mode_sends_every_item_once(gateway, translated):
+    response = post_batch(gateway, ["느림 하나", "둘", "둘", "실패"], stream=True)
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2, 3]
+    assert lines[-1]["index"] == 0   # 완료되는 순서대로 전송
+    assert {line["index"]: line.get("error") for line in lines}[3] == "failed"
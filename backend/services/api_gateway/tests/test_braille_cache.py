@@ -0,0 +1,60 @@
+"""
+braille_cache 모듈 테스트 - LRU 제거 순서, TTL 만료, 항목 수/바이트 상한 (시각은 주입한 시계 기준)
+"""
+from braille_cache import BrailleCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = BrailleCache(max_entries=2, clock=FakeClock())
+    cache.put("가", "⠫")
+    cache.put("나", "⠉")
+    assert cache.get("가") == "⠫"   # "나"가 가장 오래 사용하지 않은 항목이 됨
+    cache.put("다", "⠊")
+
+    assert cache.get("나") is None
+    assert cache.get("가") == "⠫" and cache.get("다") == "⠊"
+    stats = cache.stats()
+    assert stats["size"] == 2 and stats["evictions"] == 1
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = BrailleCache(ttl=10, clock=clock)
+    cache.put("오래된", "⠥⠐⠗")
+    clock.now += 5
+    cache.put("새로운", "⠠⠗⠐⠥⠛")
+
+    clock.now += 5
+    assert cache.get("오래된") == "⠥⠐⠗"   # 정확히 ttl이 지난 시점까지는 유효
+    clock.now += 0.5
+    assert cache.get("오래된") is None
+    assert cache.get("새로운") == "⠠⠗⠐⠥⠛"
+    assert cache.stats()["expirations"] == 1 and cache.stats()["bytes"] == len("⠠⠗⠐⠥⠛".encode("utf-8"))
+
+
+def test_byte_cap_evicts_and_rejects_oversized_results():
+    cache = BrailleCache(max_entries=100, max_bytes=12, clock=FakeClock())   # 점자 한 칸은 UTF-8 3바이트
+    cache.put("가", "⠫⠫")
+    cache.put("나", "⠉⠉")
+    cache.put("가", "⠫⠫")                  # 같은 키를 다시 저장해도 크기는 한 번만 계산
+    assert cache.stats()["bytes"] == 12 and cache.stats()["evictions"] == 0
+
+    cache.put("다", "⠊")
+    assert cache.get("나") is None and cache.get("가") == "⠫⠫" and cache.get("다") == "⠊"
+    assert cache.stats()["bytes"] == 9 and cache.stats()["evictions"] == 1
+
+    cache.put("긴 문장", "⠠" * 5)           # 15바이트 > 12
+    assert cache.get("긴 문장") is None
+    assert cache.stats()["too_large"] == 1 and cache.stats()["size"] == 2
+
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
@@ -0,0 +1,114 @@
+"""
+braille_engine 모듈 테스트 - 백그라운드 예열, 예열 중 점역 요청, 워커 비정상 종료 후 재예열
+"""
+import asyncio
+import os
+import signal
+from concurrent.futures import BrokenExecutor
+
+import httpx
+import pytest
+from KorToBraille.KorToBraille import KorToBraille
+
+from braille_engine import BrailleEngine, translate_sanitized
+
+
+def test_start_returns_before_warm_up_and_ready_follows():
+    async def run():
+        engine = BrailleEngine(workers=0)
+        await engine.start()
+        before = engine.ready
+        await engine.wait_ready()
+        return before, engine.ready, engine.warmup_seconds, await engine.translate("점자 1")
+
+    before, ready, warmup, braille = asyncio.run(run())
+    assert not before
+    assert ready and warmup is not None
+    assert braille
+
+
+def test_translate_during_worker_warm_up():
+    async def run():
+        engine = BrailleEngine(workers=1, timeout=30)
+        try:
+            await engine.start()
+            braille = await engine.translate("점자 1")
+            await engine.wait_ready()
+            return braille, engine.ready, engine.stats()
+        finally:
+            engine.shutdown()
+
+    braille, ready, stats = asyncio.run(run())
+    assert braille == translate_sanitized(KorToBraille(), "점자 1")
+    assert ready and stats["ready"] and stats["completed"] == 1
+
+
+def test_ready_only_after_every_worker_process_is_warm():
+    async def run():
+        engine = BrailleEngine(workers=3, timeout=30)
+        try:
+            await engine.start()
+            await engine.wait_ready()
+            return engine.ready, engine.stats()["warm_pids"], set(engine._executor._processes)
+        finally:
+            engine.shutdown()
+
+    ready, warm_pids, pool_pids = asyncio.run(run())
+    assert ready
+    assert len(warm_pids) == 3
+    assert set(warm_pids) == pool_pids
+
+
+async def kill_first_worker(engine) -> int:
+    """풀에 워커 프로세스가 뜨는 대로 하나를 강제 종료하고 그 pid를 반환"""
+    while engine._executor is None or not engine._executor._processes:
+        await asyncio.sleep(0.01)
+    pid = next(iter(engine._executor._processes))
+    os.kill(pid, signal.SIGKILL)
+    return pid
+
+
+def test_worker_killed_during_warm_up_recovers_ready(gateway, monkeypatch):
+    engine = BrailleEngine(workers=2, timeout=30)
+    monkeypatch.setattr(gateway, "braille_engine", engine)
+
+    async def run():
+        transport = httpx.ASGITransport(app=gateway.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+            try:
+                await engine.start()
+                killed = await kill_first_worker(engine)
+                warming = await client.get("/ready")
+                await asyncio.wait_for(engine.wait_ready(), 60)
+                return killed, warming, await client.get("/ready"), set(engine.stats()["warm_pids"])
+            finally:
+                engine.shutdown()
+
+    killed, warming, ready, warm_pids = asyncio.run(run())
+    assert warming.status_code == 503
+    assert ready.status_code == 200 and ready.json()["braille"]["ready"]
+    assert len(warm_pids) == 2 and killed not in warm_pids
+
+
+def test_broken_pool_after_ready_is_recreated_and_warmed_again():
+    async def run():
+        engine = BrailleEngine(workers=2, timeout=30)
+        try:
+            await engine.start()
+            await engine.wait_ready()
+            old_pids = set(engine.stats()["warm_pids"])
+            os.kill(next(iter(old_pids)), signal.SIGKILL)
+            with pytest.raises(BrokenExecutor):
+                await engine.translate("점자 1")
+            recreating = engine.ready
+            await asyncio.wait_for(engine.wait_ready(), 60)
+            new_pids = set(engine.stats()["warm_pids"])
+            return old_pids, recreating, engine.ready, new_pids, set(engine._executor._processes), \
+                await engine.translate("점자 1")
+        finally:
+            engine.shutdown()
+
+    old_pids, recreating, ready, new_pids, pool_pids, braille = asyncio.run(run())
+    assert not recreating and ready
+    assert len(new_pids) == 2 and new_pids == pool_pids and not new_pids & old_pids
+    assert braille == translate_sanitized(KorToBraille(), "점자 1")
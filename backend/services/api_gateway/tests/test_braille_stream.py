@@ -0,0 +1,77 @@
+"""
+braille_stream 모듈 차등 테스트 - 문장 단위로 나눠 점역한 결과가 기존 main.py 방식
+(message_end에서 전체 답변을 한 번에 정제/점역)과 완전히 같은지 확인
+"""
+import os
+import random
+
+import pytest
+from KorToBraille.KorToBraille import KorToBraille
+
+from braille_engine import translate_sanitized
+from braille_stream import SentenceSegmenter
+from sanitizer import sanitize_text_for_braille
+
+CONVERTER = KorToBraille()
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "corpus")
+
+
+def legacy_braille(full_answer: str) -> str:
+    return translate_sanitized(CONVERTER, sanitize_text_for_braille(full_answer))
+
+
+def streamed(chunks):
+    """(feed마다 내보낸 조각 목록, 조각별 점역 + 남은 조각 점역을 이어 붙인 결과)"""
+    segmenter = SentenceSegmenter(sanitize_text_for_braille)
+    fed = [segmenter.feed(chunk) for chunk in chunks]
+    parts = [translate_sanitized(CONVERTER, sentence) for sentences in fed for sentence in sentences]
+    return fed, "".join(parts) + translate_sanitized(CONVERTER, segmenter.flush())
+
+
+def random_chunks(text: str, rng: random.Random):
+    cuts = sorted(rng.sample(range(1, len(text)), min(rng.randint(0, 8), len(text) - 1))) if len(text) > 1 else []
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+CASES = [
+    "안녕하세요. 반갑습니다! 오늘은 어떠세요? 좋아요",
+    "첫 줄\n둘째 줄\n\n셋째 줄.",
+    "가격은 3,000원입니다. 1. 첫째 항목 2. 둘째 항목",
+    "그는 \"정말이요? 네.\" 라고 말했다. 다음 문장",
+    "자세한 내용은 [기상청. 홈](https://www.weather.go.kr)에서 확인하세요. 끝.",
+    "정말?! 그래요... 말줄임표… 다음。 끝",
+    "**굵게.** *기울임!* `코드?` 마지막",
+]
+
+
+@pytest.mark.parametrize("text", CASES)
+def test_streamed_braille_matches_legacy_for_every_chunking(text):
+    expected = legacy_braille(text)
+    assert streamed([text])[1] == expected
+    assert streamed(list(text))[1] == expected  # 한 글자씩
+    for cut in range(1, len(text)):  # 두 조각으로 나눌 수 있는 모든 위치
+        assert streamed([text[:cut], text[cut:]])[1] == expected, (text[:cut], text[cut:])
+
+
+def test_chunk_split_inside_terminator_waits_for_whitespace():
+    fed, braille = streamed(["정말", "?", "!", " 네", ".", "", " 끝"])
+    assert fed == [[], [], [], ["정말?!"], [], [], ["네."]]
+    assert braille == legacy_braille("정말?! 네. 끝")
+
+
+def test_text_without_terminator_is_translated_on_flush():
+    text = "종결 부호가 없는 긴 답변 1 2 3 그리고 계속"
+    fed, braille = streamed(random_chunks(text, random.Random(0)))
+    assert all(sentences == [] for sentences in fed)
+    assert braille == legacy_braille(text)
+
+
+def test_corpus_matches_legacy_with_random_chunking():
+    rng = random.Random(0)
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        with open(os.path.join(CORPUS_DIR, name), encoding="utf-8") as source:
+            text = source.read()
+        expected = legacy_braille(text)
+        for _ in range(20):
+            chunks = random_chunks(text, rng)
+            assert streamed(chunks)[1] == expected, (name, chunks)
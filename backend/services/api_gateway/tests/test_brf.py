@@ -0,0 +1,67 @@
+"""
+brf 모듈 테스트 - 문자 변환 호환성과 쪽/줄 배치 규칙
+"""
+import random
+
+import pytest
+
+from brf import UNICODE_TO_BRF, FORM_FEED, LINE_END, convert_unicode_braille_to_brf, iter_brf_pages
+
+
+def legacy_convert_unicode_braille_to_brf(unicode_text: str) -> str:
+    brf_string = ""
+    for char in unicode_text:
+        brf_string += UNICODE_TO_BRF.get(char, '?')
+    return brf_string
+
+
+def random_braille(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    cells = list(UNICODE_TO_BRF) + ["⠀"] * 8 + ["\n", "x", " "]
+    for _ in range(count):
+        yield "".join(rng.choice(cells) for _ in range(rng.randint(0, 300)))
+
+
+def split_pages(brf: str):
+    return [page.split(LINE_END)[:-1] for page in brf.split(FORM_FEED)]
+
+
+def test_convert_matches_legacy():
+    for text in random_braille(500):
+        assert convert_unicode_braille_to_brf(text) == legacy_convert_unicode_braille_to_brf(text)
+
+
+def test_zero_width_is_plain_conversion():
+    text = "⠣⠒⠉⠻⠀⠚⠠⠝⠬⠀\n⠁"
+    assert "".join(iter_brf_pages(text, cells_per_line=0)) == legacy_convert_unicode_braille_to_brf(text)
+
+
+@pytest.mark.parametrize("cells_per_line,lines_per_page", [(40, 25), (10, 3), (1, 1), (7, 0)])
+def test_layout_rules(cells_per_line, lines_per_page):
+    for text in random_braille(300, seed=cells_per_line):
+        pages = list(iter_brf_pages(text, cells_per_line, lines_per_page, chunk_chars=17))
+        brf = "".join(pages)
+
+        # 청크 크기와 무관하게 같은 결과
+        assert brf == "".join(iter_brf_pages(text, cells_per_line, lines_per_page))
+
+        lines = [line for page in split_pages(brf) for line in page]
+        assert all(len(line) <= cells_per_line for line in lines)
+        if lines_per_page:
+            assert all(len(page) == lines_per_page for page in split_pages(brf)[:-1])
+        else:
+            assert FORM_FEED not in brf
+
+        # 단어 내용과 강제 줄바꿈 수는 보존된다 (긴 단어는 잘려서 여러 줄에 걸칠 수 있음)
+        converted = convert_unicode_braille_to_brf(text.replace("\n", "⠀"))
+        assert "".join(lines).replace(" ", "") == converted.replace(" ", "")
+        assert len(lines) >= text.count("\n")
+
+
+def test_words_break_at_boundaries():
+    text = "⠁⠁⠁⠀⠃⠃⠃⠀⠉⠉⠉⠀⠙⠙⠙⠙⠙⠙⠙⠙⠙⠙⠙⠙\n\n⠑"
+    assert "".join(iter_brf_pages(text, cells_per_line=8, lines_per_page=2)) == (
+        "AAA BBB\r\nCCC\r\n"
+        "\fDDDDDDDD\r\nDDDD\r\n"
+        "\f\r\nE\r\n"
+    )
@@ -0,0 +1,60 @@
+"""
+대화 기록 엔드포인트 테스트 - 무효화 전에 시작된 Dify 조회 결과를 새 요청이 공유/저장하지 않는지
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from history_cache import HistoryCache
+
+
+class FakeDify:
+    """conversations 조회마다 응답 순번을 돌려주는 업스트림 (첫 조회는 release될 때까지 대기)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def request(self, method, endpoint, **kwargs):
+        self.calls += 1
+        call = self.calls
+        if call == 1:
+            await self.release.wait()
+        body = {"data": [{"id": f"c{call}", "name": f"응답 {call}", "updated_at": call}], "has_more": False}
+        return httpx.Response(200, json=body)
+
+
+@pytest.fixture
+def dify(gateway, monkeypatch):
+    fake = FakeDify()
+    monkeypatch.setenv("API_KEY", "test")
+    monkeypatch.setattr(gateway, "history_cache", HistoryCache(ttl=60))
+    monkeypatch.setattr(gateway.upstream_clients, "get", lambda name: fake)
+    return fake
+
+
+def test_request_after_invalidation_does_not_join_or_store_older_read(gateway, dify):
+    async def run():
+        transport = httpx.ASGITransport(app=gateway.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+            before = asyncio.ensure_future(client.get("/conversations", params={"user": "u1"}))
+            while dify.calls < 1:
+                await asyncio.sleep(0)
+            gateway.invalidate_history("u1", "c1")   # message_end - 진행 중인 조회는 이전 목록
+
+            try:
+                # 이전 조회에 합류하면 release 전까지 끝나지 않는다
+                after = await asyncio.wait_for(client.get("/conversations", params={"user": "u1"}), 5)
+            finally:
+                dify.release.set()
+                before = await before
+            cached = await client.get("/conversations", params={"user": "u1"})
+        return before, after, cached
+
+    before, after, cached = asyncio.run(run())
+    assert dify.calls == 2
+    assert before.json()["data"][0]["id"] == "c1"
+    assert after.json()["data"][0]["id"] == "c2"
+    assert cached.headers["X-History-Cache"] == "hit"
+    assert cached.json()["data"][0]["id"] == "c2" and cached.headers["ETag"] == after.headers["ETag"]
@@ -0,0 +1,134 @@
+"""
+disk_cache 모듈 테스트 - 스트리밍 저장, LRU 제거, 재시작 복원, Range 해석
+"""
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from disk_cache import DiskCache, cache_key, iter_file_range, parse_byte_range
+
+GATEWAY_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+async def chunks(*parts: bytes, fail: bool = False):
+    for part in parts:
+        yield part
+    if fail:
+        raise ConnectionError("upstream closed")
+
+
+def drain(cache: DiskCache, key: str, source) -> bytes:
+    async def run():
+        return b"".join([chunk async for chunk in cache.tee(key, source, {"type": "audio/mpeg"})])
+    return asyncio.run(run())
+
+
+def test_tee_stores_complete_body(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000)
+    key = cache_key("tts-1", "안녕", "nova", 1.0, "mp3")
+
+    assert cache.get(key) is None
+    assert drain(cache, key, chunks(b"ab", b"cd")) == b"abcd"
+
+    entry = cache.get(key)
+    assert entry.size == 4 and entry.meta == {"type": "audio/mpeg"}
+    assert open(entry.path, "rb").read() == b"abcd"
+
+
+def test_interrupted_or_oversized_body_is_not_stored(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000, max_entry_bytes=3)
+
+    with pytest.raises(ConnectionError):
+        drain(cache, "broken", chunks(b"ab", fail=True))
+    assert drain(cache, "large", chunks(b"ab", b"cd")) == b"abcd"
+
+    assert cache.get("broken") is None and cache.get("large") is None
+    assert list(tmp_path.iterdir()) == []
+    assert cache.stats()["aborted"] == 2
+
+
+def test_lru_eviction_and_reload(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10)
+    drain(cache, "a", chunks(b"1" * 4))
+    drain(cache, "b", chunks(b"2" * 4))
+    assert cache.get("a") is not None
+    drain(cache, "c", chunks(b"3" * 4))
+
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    reloaded = DiskCache(str(tmp_path), max_bytes=10)
+    assert reloaded.total_bytes == 8
+    assert reloaded.get("a").size == 4 and reloaded.get("c").size == 4
+
+
+def test_reload_removes_bodies_without_valid_metadata(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=100)
+    drain(cache, "kept", chunks(b"ok"))
+    (tmp_path / "orphan.bin").write_bytes(b"1234")                 # 메타데이터 기록 전에 종료
+    (tmp_path / "broken.bin").write_bytes(b"1234")
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")   # 깨진 메타데이터
+
+    reloaded = DiskCache(str(tmp_path), max_bytes=100)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["kept.bin", "kept.json"]
+    assert reloaded.total_bytes == 2 and reloaded.get("kept") is not None
+
+
+def test_workers_claim_separate_directories_with_split_cap(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEST_CACHE_MAX_BYTES", "100")
+    monkeypatch.setenv("TEST_CACHE_DIR", str(tmp_path))
+    first, second, third = (DiskCache.from_env("TEST_CACHE", "", 0, workers=2) for _ in range(3))
+    assert list(tmp_path.iterdir()) == []   # 슬롯을 잡기 전에는 디렉터리를 건드리지 않음
+
+    assert first.claim_worker_directory()
+    drain(first, "a", chunks(b"1" * 4))
+    (tmp_path / "worker-0" / "writing.tmp").write_bytes(b"")   # 첫 워커가 아직 쓰는 중인 파일
+
+    assert second.claim_worker_directory()
+    assert not third.claim_worker_directory()   # 슬롯 수(워커 수)보다 많은 프로세스는 캐시 없이 동작
+    assert second.directory == str(tmp_path / "worker-1") and second.get("a") is None
+    assert first.max_bytes == second.max_bytes == 50
+    assert (tmp_path / "worker-0" / "writing.tmp").exists()
+
+
+def test_parse_byte_range():
+    assert parse_byte_range(None, 100) is None
+    assert parse_byte_range("bytes=0-9", 100) == (0, 9)
+    assert parse_byte_range("bytes=90-", 100) == (90, 99)
+    assert parse_byte_range("bytes=50-500", 100) == (50, 99)
+    assert parse_byte_range("bytes=-10", 100) == (90, 99)
+    assert parse_byte_range("bytes=0-1,5-6", 100) is None
+    assert parse_byte_range("items=0-1", 100) is None
+    for header in ("bytes=100-", "bytes=9-3", "bytes=-0"):
+        with pytest.raises(ValueError):
+            parse_byte_range(header, 100)
+
+
+def test_iter_file_range(tmp_path):
+    path = tmp_path / "body.bin"
+    path.write_bytes(bytes(range(200)) * 1000)
+    assert b"".join(iter_file_range(str(path), 150, 70_149)) == (bytes(range(200)) * 1000)[150:70_150]
+
+
+def test_gateway_opens_caches_in_lifespan_not_on_import(gateway, tmp_path, monkeypatch):
+    in_flight = tmp_path / "tts" / "abc.deadbeef.tmp"   # 다른 프로세스가 아직 쓰는 중인 응답
+    in_flight.parent.mkdir()
+    in_flight.write_bytes(b"")
+    env = {**os.environ, "TTS_CACHE_DIR": str(tmp_path / "tts"), "FILE_CACHE_DIR": str(tmp_path / "file"),
+           "BRAILLE_WORKERS": "0", "HEALTH_REFRESH_INTERVAL": "0", "LOG_LEVEL": "WARNING"}
+    # spawn 방식 점역 워커가 main을 다시 import하는 것과 같은 상황
+    subprocess.run([sys.executable, "-c", "import main"], cwd=GATEWAY_DIR, env=env, check=True)
+    assert in_flight.exists() and not (tmp_path / "file").exists()
+
+    monkeypatch.setenv("TTS_CACHE_DIR", str(tmp_path / "tts"))
+    monkeypatch.setenv("FILE_CACHE_DIR", str(tmp_path / "file"))
+    monkeypatch.setattr(gateway, "tts_cache", None)
+    monkeypatch.setattr(gateway, "file_cache", None)
+    with TestClient(gateway.app):
+        assert gateway.tts_cache.directory == str(tmp_path / "tts")
+        assert gateway.file_cache.directory == str(tmp_path / "file")
+    assert not in_flight.exists()   # 서비스를 시작하는 프로세스만 남은 임시 파일을 정리
@@ -0,0 +1,59 @@
+"""
+health 모듈 테스트 - 동시 프로브, 프로브별 타임아웃, TTL 캐시
+"""
+import asyncio
+import time
+
+from health import HealthMonitor
+
+
+def test_probes_run_concurrently_with_timeout_and_cache():
+    calls = {"fast": 0, "slow": 0}
+
+    async def fast():
+        calls["fast"] += 1
+        await asyncio.sleep(0.05)
+        return "healthy"
+
+    async def slow():
+        calls["slow"] += 1
+        await asyncio.sleep(10)
+        return "healthy"
+
+    async def broken():
+        raise ConnectionError("refused")
+
+    async def run():
+        monitor = HealthMonitor({"fast": fast, "slow": slow, "broken": broken}, timeout=0.1, ttl=60)
+        started = time.perf_counter()
+        first = await monitor.results()
+        elapsed = time.perf_counter() - started
+        second = await monitor.results()
+        return first, second, elapsed, monitor.stats()
+
+    first, second, elapsed, stats = asyncio.run(run())
+    assert elapsed < 0.5
+    assert first == second
+    assert first["fast"] == "healthy"
+    assert first["slow"].startswith("error: timeout")
+    assert first["broken"] == "error: refused"
+    assert calls == {"fast": 1, "slow": 1}
+    assert stats["timeouts"] == 1 and stats["refreshes"] == 1
+
+
+def test_stale_results_are_served_while_refreshing():
+    states = iter(["healthy", "unhealthy"])
+
+    async def probe():
+        return next(states)
+
+    async def run():
+        monitor = HealthMonitor({"svc": probe}, timeout=1, ttl=0)
+        first = dict(await monitor.results())
+        stale = dict(await monitor.results())
+        await monitor.refresh()
+        return first, stale, dict(monitor._results)
+
+    first, stale, refreshed = asyncio.run(run())
+    assert first == stale == {"svc": "healthy"}
+    assert refreshed == {"svc": "unhealthy"}
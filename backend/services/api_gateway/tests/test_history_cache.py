@@ -0,0 +1,65 @@
+"""
+history_cache 모듈 테스트 - TTL, 대화 단위 무효화, 조회 중 무효화, ETag 비교
+"""
+import time
+
+from history_cache import HistoryCache, etag_matches
+
+
+def test_invalidation_drops_user_lists_and_conversation_pages():
+    cache = HistoryCache(ttl=60)
+    generation = cache.generation("u1")
+    cache.put(("conversations", "u1", "", "", 20), {"data": []}, generation)
+    cache.put(("messages", "u1", "c1", "", 20), {"messages": [1]}, generation)
+    cache.put(("messages", "u1", "c2", "", 20), {"messages": [2]}, generation)
+    cache.put(("conversations", "u2", "", "", 20), {"data": []}, cache.generation("u2"))
+
+    cache.invalidate_conversation("u1", "c1")
+
+    assert cache.get(("conversations", "u1", "", "", 20)) is None
+    assert cache.get(("messages", "u1", "c1", "", 20)) is None
+    assert cache.get(("messages", "u1", "c2", "", 20)) is not None
+    assert cache.get(("conversations", "u2", "", "", 20)) is not None
+
+
+def test_result_fetched_before_invalidation_is_not_stored():
+    cache = HistoryCache(ttl=60)
+    key = ("messages", "u1", "c1", "", 20)
+    generation = cache.generation("u1")
+    cache.invalidate_conversation("u1", "c1")
+
+    entry = cache.put(key, {"messages": []}, generation)
+
+    assert entry.etag
+    assert cache.get(key) is None
+
+
+def test_ttl_expiry_and_etag():
+    cache = HistoryCache(ttl=0.01)
+    key = ("conversations", "u1", "", "", 20)
+    entry = cache.put(key, {"data": ["가"]}, 0)
+    assert cache.get(key) is entry
+    assert entry.body == '{"data":["가"]}'.encode("utf-8")
+    time.sleep(0.02)
+    assert cache.get(key) is None
+
+    assert etag_matches(entry.etag, entry.etag)
+    assert etag_matches(f'"other", W/{entry.etag}', entry.etag)
+    assert not etag_matches('"other"', entry.etag)
+    assert not etag_matches(None, entry.etag)
+
+
+def test_generations_stay_bounded_and_still_reject_stale_results():
+    cache = HistoryCache(ttl=60, max_entries=2)
+    key = ("messages", "u1", "c1", "", 20)
+    generation = cache.generation("u1")
+    cache.invalidate_conversation("u1", "c1")
+    for user in ("u2", "u3", "u4"):   # u1의 무효화 기록은 밀려난다
+        cache.invalidate_conversation(user, "c1")
+
+    assert cache.stats()["tracked_users"] == 2
+    cache.put(key, {"messages": []}, generation)
+    assert cache.get(key) is None
+
+    cache.put(key, {"messages": []}, cache.generation("u1"))
+    assert cache.get(key) is not None
@@ -0,0 +1,28 @@
+"""
+logging_setup 테스트 - 샘플링과 본문 자르기/가리기
+"""
+import logging_setup
+from logging_setup import LogSampler, Payload, format_payload
+
+
+def test_sampler_keeps_first_and_every_nth_per_key():
+    sample = LogSampler(every=3)
+    assert [sample("line") for _ in range(7)] == [True, False, False, True, False, False, True]
+    assert sample("chunk") is True
+    assert all(LogSampler(every=1)("line") for _ in range(3))
+
+
+def test_payload_truncate_redact_and_full(monkeypatch):
+    text = "가" * 10
+    monkeypatch.setattr(logging_setup.settings, "payload_max_chars", 4)
+
+    monkeypatch.setattr(logging_setup.settings, "payload_mode", "truncate")
+    assert format_payload(text) == "'가가가가'...(+6 chars)"
+    assert str(Payload("짧음")) == "'짧음'"
+
+    monkeypatch.setattr(logging_setup.settings, "payload_mode", "redact")
+    assert format_payload(text).startswith("<10 chars #")
+    assert "가" not in str(Payload({"query": text}))
+
+    monkeypatch.setattr(logging_setup.settings, "payload_mode", "full")
+    assert format_payload(text) == repr(text)
@@ -0,0 +1,57 @@
+"""
+metrics 모듈 테스트 - Prometheus 텍스트 출력, 라우트 템플릿 라벨
+"""
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS, MetricsMiddleware, MetricsRegistry
+
+
+def test_render_counter_histogram_and_gauge():
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests", "Requests", ("route",))
+    latency = registry.histogram("test_latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    registry.gauge("test_depth", "Depth", (), lambda: [((), 3)])
+
+    requests.inc('/a"b')
+    requests.inc('/a"b', amount=2)
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, "/a")
+
+    assert registry.counter("test_requests", "Requests", ("route",)) is requests
+    lines = registry.render().splitlines()
+    assert "# TYPE test_requests_total counter" in lines
+    assert 'test_requests_total{route="/a\\"b"} 3' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'test_latency_seconds_count{route="/a"} 3' in lines
+    assert "test_depth 3" in lines
+
+
+def test_middleware_labels_by_route_template_and_times_streams():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            yield b"a"
+            yield b"b"
+        return StreamingResponse(body())
+
+    client = TestClient(app)
+    before = HTTP_REQUEST_SECONDS.count("GET", "/items/{item_id}")
+    client.get("/items/1")
+    client.get("/items/2")
+    assert client.get("/stream").content == b"ab"
+    client.get("/missing")
+
+    assert HTTP_REQUEST_SECONDS.count("GET", "/items/{item_id}") == before + 2
+    assert HTTP_REQUESTS.value("GET", "/stream", 200) >= 1
+    assert HTTP_REQUESTS.value("GET", "unmatched", 404) >= 1
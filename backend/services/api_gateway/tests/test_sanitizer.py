@@ -0,0 +1,110 @@
+"""
+sanitizer 모듈 차등 테스트 - 기존 main.py 구현(단계별 re.sub)과 결과가 완전히 같은지 확인
+"""
+import random
+import re
+
+import pytest
+
+from sanitizer import sanitize_text_for_braille, extract_quoted_text_for_braille
+
+
+def legacy_sanitize_text_for_braille(text: str) -> str:
+    if not text or not text.strip():
+        return ""
+    emoji_pattern = re.compile(
+        "["
+        "\U0001F600-\U0001F64F"
+        "\U0001F300-\U0001F5FF"
+        "\U0001F680-\U0001F6FF"
+        "\U0001F700-\U0001F77F"
+        "\U0001F780-\U0001F7FF"
+        "\U0001F800-\U0001F8FF"
+        "\U0001F900-\U0001F9FF"
+        "\U0001FA00-\U0001FA6F"
+        "\U0001FA70-\U0001FAFF"
+        "\U00002600-\U000026FF"
+        "\U00002700-\U000027BF"
+        "\U0000FE00-\U0000FE0F"
+        "\U0001F1E0-\U0001F1FF"
+        "\U0001F004"
+        "\U0001F0CF"
+        "\U0001F18E"
+        "\U0001F191-\U0001F19A"
+        "\U0001F201-\U0001F202"
+        "\U0001F21A"
+        "\U0001F22F"
+        "\U0001F232-\U0001F23A"
+        "\U0001F250-\U0001F251"
+        "]+"
+    )
+    text = emoji_pattern.sub('', text)
+    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
+    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = re.sub(r'__(.*?)__', r'\1', text)
+    text = re.sub(r'\*(.*?)\*', r'\1', text)
+    text = re.sub(r'_(.*?)_', r'\1', text)
+    text = re.sub(r'`(.*?)`', r'\1', text)
+    text = re.sub(r'^#{1,6}\s*', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\n\s*\n', '\n', text).strip()
+    text = re.sub(r'[^가-힣0-9\s\.,\?!"]', '', text)
+    return text
+
+
+def legacy_extract_quoted_text_for_braille(text: str) -> str:
+    if not text or not text.strip():
+        return text
+    quote_patterns = [r"'([^']+)'", r'"([^"]+)"', r'`([^`]+)`', r'"([^"]+)"']
+    extracted_texts = []
+    for pattern in quote_patterns:
+        extracted_texts.extend(re.findall(pattern, text))
+    if extracted_texts:
+        return ' '.join(extracted_texts).strip()
+    return text
+
+
+CASES = [
+    "",
+    "   \n\t ",
+    None,
+    "안녕하세요.",
+    "## 오늘의 날씨 🌤️\n\n**서울**은 맑고 *23도*입니다.",
+    "[기상청](https://www.weather.go.kr)에서 확인하세요. ![지도](map.png)",
+    "__굵게__ 그리고 _기울임_ 그리고 `코드`",
+    "***세 개*** **닫히지 않은 강조\n다음 줄**",
+    "#제목\n##\n\n\n### 소제목\n본문 # 샵",
+    "English words are removed 123, 한글은 남는다!",
+    "따옴표 \"안녕\" 과 '작은' 그리고 `백틱`",
+    "👍🏻 이모지 ☔ 와 ✅ 그리고 🇰🇷 국기",
+    " 줄 구분자　전각 공백\r\n\r\n윈도우 줄바꿈",
+    "[링크 [중첩]](a(b)c) 와 [닫히지 않은](링크",
+]
+
+ALPHABET = list("가나다라 \n\t\r*_`[]()!#\"'.,?abc0123456789") + ["🌤", "️", "☔", "🇰", "\U0001F100", "　"]
+
+
+def random_texts(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 60)))
+
+
+@pytest.mark.parametrize("text", CASES)
+def test_sanitize_matches_legacy_cases(text):
+    assert sanitize_text_for_braille(text) == legacy_sanitize_text_for_braille(text)
+
+
+def test_sanitize_matches_legacy_fuzz():
+    for text in random_texts(20000):
+        assert sanitize_text_for_braille(text) == legacy_sanitize_text_for_braille(text), repr(text)
+
+
+@pytest.mark.parametrize("text", CASES)
+def test_extract_matches_legacy_cases(text):
+    assert extract_quoted_text_for_braille(text) == legacy_extract_quoted_text_for_braille(text)
+
+
+def test_extract_matches_legacy_fuzz():
+    for text in random_texts(20000, seed=1):
+        assert extract_quoted_text_for_braille(text) == legacy_extract_quoted_text_for_braille(text), repr(text)
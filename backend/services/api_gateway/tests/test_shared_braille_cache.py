@@ -0,0 +1,58 @@
+"""
+shared_braille_cache 모듈 테스트 - 프로세스 간 공유, 버킷 LRU 제거, 크기/만료 처리
+"""
+import multiprocessing
+import time
+
+from shared_braille_cache import SharedBrailleCache
+
+
+def _put_from_child(path: str):
+    cache = SharedBrailleCache(path, max_entries=64)
+    cache.put("자식 프로세스", "⠨⠣⠠⠕⠁")
+    cache.close()
+
+
+def test_entries_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / "braille.cache")
+    cache = SharedBrailleCache(path, max_entries=64)
+
+    child = multiprocessing.get_context("fork").Process(target=_put_from_child, args=(path,))
+    child.start()
+    child.join(10)
+
+    assert child.exitcode == 0
+    assert cache.get("자식 프로세스") == "⠨⠣⠠⠕⠁"
+    assert cache.get("없는 문장") is None
+    shared = cache.stats()["shared"]
+    assert shared["stores"] == 1 and shared["hits"] == 1 and shared["misses"] == 1 and shared["size"] == 1
+
+
+def test_existing_layout_wins_and_full_bucket_evicts_least_recent(tmp_path):
+    path = str(tmp_path / "braille.cache")
+    first = SharedBrailleCache(path, max_entries=2, ways=2)
+    second = SharedBrailleCache(path, max_entries=1024, ways=8)
+    assert (second.max_entries, second.ways) == (2, 2)
+
+    first.put("가", "⠫")
+    first.put("나", "⠉")
+    assert second.get("가") == "⠫"   # "나"가 가장 오래 사용하지 않은 항목이 됨
+    second.put("다", "⠊")
+
+    assert first.get("나") is None
+    assert first.get("가") == "⠫" and first.get("다") == "⠊"
+    assert first.stats()["shared"]["evictions"] == 1
+
+
+def test_oversized_and_expired_entries(tmp_path, monkeypatch):
+    cache = SharedBrailleCache(str(tmp_path / "braille.cache"), max_entries=8, ttl=10, entry_bytes=6)
+
+    cache.put("긴 문장", "⠠⠠⠠")   # 9바이트 > 6
+    assert cache.get("긴 문장") is None and cache.stats()["too_large"] == 1
+
+    cache.put("짧은", "⠠⠠")
+    assert cache.get("짧은") == "⠠⠠"
+    now = time.time()
+    monkeypatch.setattr("shared_braille_cache.time.time", lambda: now + 11)
+    assert cache.get("짧은") is None
+    assert cache.stats()["expirations"] == 1
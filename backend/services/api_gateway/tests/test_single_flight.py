@@ -0,0 +1,80 @@
+"""
+single_flight 모듈 테스트 - 동시 요청 합치기, 오류 공유, 리더 취소 시 재시도
+"""
+import asyncio
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return {"data": len(calls)}
+
+    async def run():
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+        later = await flight.do("key", fetch)
+        return results, later
+
+    results, later = asyncio.run(run())
+    assert results == [{"data": 1}] * 5
+    assert later == {"data": 2}
+    assert flight.stats()["upstream_calls"] == 2 and flight.stats()["coalesced"] == 4
+
+
+def test_errors_are_shared_with_waiters():
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ConnectionError("refused")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+    assert [type(result) for result in asyncio.run(run())] == [ConnectionError] * 3
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_waiter_retries_when_leader_is_cancelled():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    assert asyncio.run(run()) == 2
+
+
+def test_repeated_finish_does_not_drop_next_leader():
+    flight = SingleFlight("test")
+
+    async def run():
+        first = flight.start("key")
+        flight.finish("key", first)          # 저장하지 않을 크기라 미리 알림
+        second = flight.start("key")         # 다음 요청이 새 리더가 됨
+        flight.finish("key", first)          # 첫 리더의 응답 전송 완료 (BackgroundTask)
+        return first, second, flight.join("key")
+
+    first, second, joined = asyncio.run(run())
+    assert first.done() and second is not None and not second.done()
+    assert joined is second
+    assert flight.stats()["in_flight"] == 1
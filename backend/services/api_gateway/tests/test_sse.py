@@ -0,0 +1,97 @@
+"""
+sse 모듈 테스트 - 묶음 전송, 이벤트 순서, 플러시 간격
+"""
+import asyncio
+import json
+
+from sse import PacingProfile, SSEEmitter, resolve_pacing, scan_dify_frame
+
+
+def decode(frames):
+    return [json.loads(frame[len("data: "):]) for frame in frames]
+
+
+async def collect_text(emitter, chunks):
+    frames = []
+    for chunk in chunks:
+        async for frame in emitter.text(chunk):
+            frames.append(frame)
+    return frames
+
+
+def test_coalesce_by_byte_budget_and_event_order():
+    emitter = SSEEmitter(PacingProfile("test", max_bytes=6, flush_interval=60))
+    frames = asyncio.run(collect_text(emitter, ["가", "나", "다", "라"]))
+    frames += emitter.event({"event": "message_end"})
+
+    assert decode(frames) == [
+        {"event": "message", "chunk": "가나"},
+        {"event": "message", "chunk": "다라"},
+        {"event": "message_end"},
+    ]
+    assert emitter.stats()["text_chunks"] == 4
+    assert emitter.stats()["serializations"] == 3
+
+
+def test_passthrough_and_typewriter_keep_text():
+    passthrough = SSEEmitter(resolve_pacing("passthrough"))
+    frames = asyncio.run(collect_text(passthrough, ["안녕", "하세요"]))
+    assert [event["chunk"] for event in decode(frames)] == ["안녕", "하세요"]
+
+    typewriter = SSEEmitter(PacingProfile("typewriter", chunk_chars=2, delay=0))
+    frames = asyncio.run(collect_text(typewriter, ["안녕하세요"]))
+    assert [event["chunk"] for event in decode(frames)] == ["안녕", "하세", "요"]
+
+
+def test_ticking_flushes_when_upstream_is_quiet():
+    async def slow_source():
+        for item in ["a", "b"]:
+            await asyncio.sleep(0.05)
+            yield item
+
+    async def run():
+        emitter = SSEEmitter(PacingProfile("test", max_bytes=1024, flush_interval=0.01))
+        events = []
+        async for item in emitter.ticking(slow_source()):
+            if item is None:
+                events.extend(decode(emitter.flush()))
+                continue
+            async for frame in emitter.text(item):
+                events.extend(decode([frame]))
+        events.extend(decode(emitter.flush()))
+        return events
+
+    assert [event["chunk"] for event in asyncio.run(run())] == ["a", "b"]
+
+
+def test_unknown_profile_falls_back_to_default():
+    assert resolve_pacing("bogus") is resolve_pacing(None)
+
+
+def test_scan_dify_frame_matches_json():
+    answers = ["안녕", "", "줄\n바꿈", '따옴표 "q" \\ 백슬래시', "😀 이모지", '"answer": "가짜"', " "]
+    for answer in answers:
+        for ensure_ascii in (True, False):
+            payload = {"event": "message", "conversation_id": "c", "answer": answer, "created_at": 1}
+            line = "data: " + json.dumps(payload, ensure_ascii=ensure_ascii)
+            assert scan_dify_frame(line) == ("message", answer)
+
+    assert scan_dify_frame('data: {"event": "message_end", "metadata": {}}') == ("message_end", None)
+    assert scan_dify_frame('data: {"event": "message", "id": "x"}') == ("message", None)
+    assert scan_dify_frame("data: [DONE]") == (None, None)
+
+
+def test_interleaved_raw_and_parsed_frames_keep_order():
+    emitter = SSEEmitter(PacingProfile("test", max_bytes=1024, flush_interval=60))
+    raw_first = 'data: {"event": "message", "chunk": "원본1"}\n\n'
+    raw_second = 'data: {"event": "message", "chunk": "원본2"}\n\n'
+
+    assert emitter.raw(raw_first) == []
+    assert asyncio.run(collect_text(emitter, ["파싱", "1"])) == []
+    assert emitter.raw(raw_second) == []
+    frames = emitter.event({"event": "message_end"})
+
+    assert frames[0] == raw_first
+    assert decode(frames[1:2]) == [{"event": "message", "chunk": "파싱1"}]
+    assert frames[2] == raw_second
+    assert decode(frames[3:]) == [{"event": "message_end"}]
@@ -0,0 +1,87 @@
+"""
+upload_relay 모듈 테스트 - multipart 스트리밍 중계, 크기 제한, 필수 파트 검사
+"""
+import asyncio
+
+import pytest
+
+from upload_relay import MultipartRelay, UploadInvalid, UploadTooLarge
+
+CONTENT_TYPE = "multipart/form-data; boundary=bnd"
+
+
+def multipart_body(audio: bytes) -> bytes:
+    return (
+        b'--bnd\r\nContent-Disposition: form-data; name="model"\r\n\r\nwhisper-1\r\n'
+        b'--bnd\r\nContent-Disposition: form-data; name="language"\r\n\r\nko\r\n'
+        b'--bnd\r\nContent-Disposition: form-data; name="file"; filename="recording.webm"\r\n'
+        b"Content-Type: audio/webm\r\n\r\n" + audio + b"\r\n--bnd--\r\n"
+    )
+
+
+async def source(body: bytes, chunk_size: int = 7):
+    for i in range(0, len(body), chunk_size):
+        yield body[i:i + chunk_size]
+
+
+def relay_body(relay: MultipartRelay) -> bytes:
+    async def run():
+        return b"".join([chunk async for chunk in relay.stream()])
+    return asyncio.run(run())
+
+
+def test_passthrough_forwards_original_bytes():
+    body = multipart_body(b"A" * 1000)
+    relay = MultipartRelay(source(body), CONTENT_TYPE, str(len(body)), max_part_bytes=4096)
+
+    assert relay_body(relay) == body
+    assert relay.headers() == {"Content-Type": CONTENT_TYPE, "Content-Length": str(len(body))}
+    assert relay.bytes_in == relay.bytes_out == len(body)
+    assert [(part.name, part.size) for part in relay.parts] == [("model", 9), ("language", 2), ("file", 1000)]
+
+
+def test_selected_fields_are_reassembled():
+    relay = MultipartRelay(
+        source(multipart_body(b"A" * 100)), CONTENT_TYPE, None, max_part_bytes=4096,
+        fields={"file", "language"}, extra_fields={"model": "whisper-1", "response_format": "json"},
+        required_files=("file",),
+    )
+
+    assert relay_body(relay) == (
+        b'--bnd\r\nContent-Disposition: form-data; name="model"\r\n\r\nwhisper-1\r\n'
+        b'--bnd\r\nContent-Disposition: form-data; name="response_format"\r\n\r\njson\r\n'
+        b'--bnd\r\nContent-Disposition: form-data; name="language"\r\n\r\nko\r\n'
+        b'--bnd\r\nContent-Disposition: form-data; name="file"; filename="recording.webm"\r\n'
+        b"Content-Type: audio/webm\r\n\r\n" + b"A" * 100 + b"\r\n--bnd--\r\n"
+    )
+
+
+def test_part_over_limit_stops_stream():
+    relay = MultipartRelay(source(multipart_body(b"A" * 5000), 512), CONTENT_TYPE, None, max_part_bytes=1024)
+    with pytest.raises(UploadTooLarge):
+        relay_body(relay)
+    assert relay.bytes_out < 2048
+
+
+def test_declared_length_over_limit_is_rejected_before_reading():
+    with pytest.raises(UploadTooLarge):
+        MultipartRelay(source(b""), CONTENT_TYPE, str(10 * 1024 * 1024), max_part_bytes=1024)
+
+
+def test_missing_required_file_never_completes_body():
+    body = b'--bnd\r\nContent-Disposition: form-data; name="language"\r\n\r\nko\r\n--bnd--\r\n'
+    relay = MultipartRelay(source(body), CONTENT_TYPE, None, max_part_bytes=1024, required_files=("file",))
+    sent = []
+
+    async def run():
+        async for chunk in relay.stream():
+            sent.append(chunk)
+
+    with pytest.raises(UploadInvalid):
+        asyncio.run(run())
+    assert not b"".join(sent).endswith(b"--bnd--\r\n")
+
+
+def test_non_multipart_request_is_invalid():
+    with pytest.raises(UploadInvalid):
+        MultipartRelay(source(b"{}"), "application/json", "2", max_part_bytes=1024)
@@ -0,0 +1,60 @@
+"""
+upstream 모듈 테스트 - 프록시 헤더 필터링, 범용 프록시 응답 헤더
+"""
+import asyncio
+
+import httpx
+
+from upstream import filter_hop_by_hop
+
+
+def test_filter_hop_by_hop_drops_connection_scoped_headers():
+    headers = [
+        ("Host", "gateway"),
+        ("Connection", "keep-alive, X-Hop"),
+        ("X-Hop", "1"),
+        ("Transfer-Encoding", "chunked"),
+        ("Content-Type", "application/json"),
+        ("Set-Cookie", "a=1"),
+        ("Set-Cookie", "b=2"),
+    ]
+    assert filter_hop_by_hop(headers, drop=("host",)) == [
+        ("Content-Type", "application/json"),
+        ("Set-Cookie", "a=1"),
+        ("Set-Cookie", "b=2"),
+    ]
+
+
+def test_proxied_response_drops_upstream_date_and_server(gateway, monkeypatch):
+    async def chunks():
+        yield b"streamed "
+        yield b"body"
+
+    def upstream(request):
+        return httpx.Response(200, content=chunks(), headers=[
+            ("Date", "Mon, 01 Jan 2024 00:00:00 GMT"),
+            ("Server", "upstream-server"),
+            ("Content-Type", "text/plain"),
+            ("X-Upstream", "1"),
+            ("Set-Cookie", "a=1"),
+            ("Set-Cookie", "b=2"),
+        ])
+
+    services = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+    monkeypatch.setitem(gateway.SERVICE_ROUTES, "stub", "http://stub")
+    monkeypatch.setattr(gateway.upstream_clients, "get", lambda name: services)
+
+    async def run():
+        transport = httpx.ASGITransport(app=gateway.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+            origin = {"Origin": "http://localhost:3000"}
+            async with client.stream("GET", "/stub/items", headers=origin) as response:
+                return response, await response.aread()
+
+    response, body = asyncio.run(run())
+    assert response.status_code == 200 and body == b"streamed body"
+    assert "date" not in response.headers and "server" not in response.headers
+    assert response.headers["x-upstream"] == "1"
+    assert response.headers.get_list("set-cookie") == ["a=1", "b=2"]
+    # CORS 미들웨어가 붙인 게이트웨이 헤더는 유지
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
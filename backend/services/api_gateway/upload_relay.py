@@ -0,0 +1,230 @@
+"""
+multipart 업로드 중계 - 받은 폼 파트를 메모리에 모으지 않고 업스트림 요청 본문으로 바로 흘려보냄
+들어오는 청크 크기 단위로만 처리하므로 큰 문서/녹음 파일도 게이트웨이 메모리 사용량이 일정하다.
+"""
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+import time
+
+from multipart.multipart import MultipartParser, parse_options_header
+
+# Content-Length로 미리 거절할 때 파일 외 폼 필드/경계 문자열 몫으로 허용하는 여유
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    """업로드 크기 제한 초과 (413)"""
+
+
+class UploadInvalid(Exception):
+    """multipart 형식 오류 또는 필수 파트 누락 (400)"""
+
+
+@dataclass
+class UploadedPart:
+    name: str
+    filename: Optional[str]
+    content_type: Optional[str]
+    size: int = 0
+
+
+class UploadStats:
+    """게이트웨이 전체 업로드 중계 누적 통계 (/admin/uploads)"""
+
+    def __init__(self):
+        self.uploads = 0
+        self.rejected = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.total_seconds = 0.0
+
+    def record(self, relay: "MultipartRelay", rejected: bool = False):
+        self.uploads += 1
+        self.rejected += int(rejected)
+        self.bytes_in += relay.bytes_in
+        self.bytes_out += relay.bytes_out
+        self.total_seconds += relay.duration
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "uploads": self.uploads,
+            "rejected": self.rejected,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "avg_duration_ms": round(self.total_seconds / self.uploads * 1000, 3) if self.uploads else 0.0,
+        }
+
+
+upload_stats = UploadStats()
+
+
+class MultipartRelay:
+    """
+    multipart/form-data 요청 본문을 파싱하면서 업스트림으로 다시 내보내는 스트림
+
+    - max_part_bytes: 파트 하나의 최대 크기 (초과하는 순간 UploadTooLarge, 업스트림 요청은 중단됨)
+    - fields: 전달할 파트 이름 (None이면 모든 파트를 원본 바이트 그대로 전달하고 Content-Length도 유지)
+    - extra_fields: 본문 앞에 추가할 텍스트 필드 (지정하면 파트를 다시 조립해서 전달)
+    - required_files: 반드시 있어야 하는 파일 파트 이름 (없으면 본문을 끝맺지 않고 UploadInvalid)
+
+    본문의 마지막 조각은 필수 파트 검사를 통과한 뒤에만 내보내므로, 잘못된 업로드가
+    업스트림에 완전한 요청으로 도착하지 않는다.
+    """
+
+    def __init__(self, source: AsyncIterator[bytes], content_type: str, content_length: Optional[str],
+                 max_part_bytes: int, fields: Optional[Iterable[str]] = None,
+                 extra_fields: Optional[Dict[str, str]] = None, required_files: Iterable[str] = ()):
+        mime, params = parse_options_header(content_type or "")
+        if mime != b"multipart/form-data" or not params.get(b"boundary"):
+            raise UploadInvalid("multipart/form-data 요청이 아닙니다")
+        if content_length and content_length.isdigit() and \
+                int(content_length) > max_part_bytes + MULTIPART_OVERHEAD_BYTES:
+            raise UploadTooLarge(f"업로드 크기 제한({max_part_bytes} bytes)을 초과했습니다")
+
+        self._source = source
+        self._content_type = content_type
+        self._content_length = content_length
+        self.boundary: bytes = params[b"boundary"]
+        self.max_part_bytes = max_part_bytes
+        self.fields = set(fields) if fields is not None else None
+        self.extra_fields = extra_fields or {}
+        self.required_files = tuple(required_files)
+
+        self.parts: List[UploadedPart] = []
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.duration = 0.0
+
+        self._out: List[bytes] = []
+        self._header_field = b""
+        self._header_value = b""
+        self._part_headers: List[tuple] = []
+        self._part: Optional[UploadedPart] = None
+        self._forward_part = False
+        self._parser = MultipartParser(self.boundary, callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    @property
+    def passthrough(self) -> bool:
+        """원본 바이트를 그대로 전달하는지 (파트 선택/필드 추가가 없을 때)"""
+        return self.fields is None and not self.extra_fields
+
+    def headers(self) -> Dict[str, str]:
+        """업스트림 요청에 붙일 Content-Type (원본 그대로 전달할 때는 Content-Length 포함)"""
+        if self.passthrough:
+            headers = {"Content-Type": self._content_type}
+            if self._content_length:
+                headers["Content-Length"] = self._content_length
+            return headers
+        return {"Content-Type": f"multipart/form-data; boundary={self.boundary.decode('latin-1')}"}
+
+    # --- 파서 콜백 -------------------------------------------------------------
+
+    def _on_part_begin(self):
+        self._part_headers = []
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._part_headers.append((self._header_field, self._header_value))
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        disposition, content_type = b"", None
+        for field, value in self._part_headers:
+            if field.lower() == b"content-disposition":
+                disposition = value
+            elif field.lower() == b"content-type":
+                content_type = value.decode("latin-1")
+        _, options = parse_options_header(disposition)
+        filename = options.get(b"filename")
+        self._part = UploadedPart(
+            name=options.get(b"name", b"").decode("utf-8", "replace"),
+            filename=filename.decode("utf-8", "replace") if filename is not None else None,
+            content_type=content_type,
+        )
+        self._forward_part = not self.passthrough and (self.fields is None or self._part.name in self.fields)
+        if self._forward_part:
+            header_lines = b"".join(b"%s: %s\r\n" % (field, value) for field, value in self._part_headers)
+            self._out.append(b"--" + self.boundary + b"\r\n" + header_lines + b"\r\n")
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        self._part.size += end - start
+        if self._part.size > self.max_part_bytes:
+            raise UploadTooLarge(f"업로드 크기 제한({self.max_part_bytes} bytes)을 초과했습니다")
+        if self._forward_part:
+            self._out.append(data[start:end])
+
+    def _on_part_end(self):
+        if self._forward_part:
+            self._out.append(b"\r\n")
+        self.parts.append(self._part)
+        self._part = None
+
+    # --- 스트림 ----------------------------------------------------------------
+
+    def _field_bytes(self, name: str, value: str) -> bytes:
+        return (
+            b"--" + self.boundary + b"\r\n"
+            + f'Content-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8")
+        )
+
+    def _take_output(self, chunk: bytes) -> bytes:
+        if self.passthrough:
+            return chunk
+        output = b"".join(self._out)
+        self._out.clear()
+        return output
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """업스트림으로 보낼 본문 조각들 (httpx 요청의 content로 사용)"""
+        started = time.perf_counter()
+        held = b"".join(self._field_bytes(name, value) for name, value in self.extra_fields.items())
+        try:
+            async for chunk in self._source:
+                if not chunk:
+                    continue
+                self.bytes_in += len(chunk)
+                self._parser.write(chunk)
+                output = self._take_output(chunk)
+                if not output:
+                    continue
+                # 마지막 조각은 검사가 끝날 때까지 보류하기 위해 한 조각씩 늦게 내보낸다
+                if held:
+                    self.bytes_out += len(held)
+                    yield held
+                held = output
+
+            self._parser.finalize()
+            uploaded = {part.name for part in self.parts if part.filename is not None}
+            missing = [name for name in self.required_files if name not in uploaded]
+            if missing:
+                raise UploadInvalid(f"필수 파일이 없습니다: {', '.join(missing)}")
+            if not self.passthrough:
+                held += b"".join(self._out) + b"--" + self.boundary + b"--\r\n"
+                self._out.clear()
+            if held:
+                self.bytes_out += len(held)
+                yield held
+        finally:
+            self.duration = time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "duration_ms": round(self.duration * 1000, 3),
+            "parts": [{"name": part.name, "filename": part.filename, "size": part.size} for part in self.parts],
+        }
@@ -0,0 +1,219 @@
+"""
+업스트림 HTTP 클라이언트 풀 - 호스트별 공유 httpx.AsyncClient 관리
+요청마다 새 클라이언트를 만들지 않고 keep-alive 커넥션을 재사용한다.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import functools
+import logging
+import os
+import ssl
+
+import httpx
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_RESPONSES = REGISTRY.counter(
+    "gateway_upstream_responses", "Upstream responses by upstream and status code", ("upstream", "status"))
+UPSTREAM_ERRORS = REGISTRY.counter(
+    "gateway_upstream_errors", "Upstream requests that failed before a response (timeouts, connect errors)", ("upstream",))
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _http2_available() -> bool:
+    """httpx HTTP/2 지원에 필요한 h2 패키지 설치 여부"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context(http2: bool) -> ssl.SSLContext:
+    """
+    클라이언트끼리 공유하는 TLS 설정 - 클라이언트마다 CA 번들을 다시 읽지 않도록 (시작 시간 단축)
+    ALPN 광고(h2 포함 여부)가 달라지므로 HTTP/2 사용 여부별로 하나씩 만든다.
+    """
+    return httpx.create_ssl_context(http2=http2)
+
+
+# 프록시가 그대로 전달하면 안 되는 연결 단위(hop-by-hop) 헤더 (RFC 7230 6.1)
+HOP_BY_HOP_HEADERS = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "proxy-connection", "te", "trailer", "trailers", "transfer-encoding", "upgrade",
+})
+
+
+def filter_hop_by_hop(headers: Iterable[Tuple[str, str]], drop: Iterable[str] = ()) -> List[Tuple[str, str]]:
+    """
+    hop-by-hop 헤더와 Connection 헤더에 나열된 헤더, drop으로 지정한 헤더를 뺀 (이름, 값) 목록
+    같은 이름의 헤더가 여러 개여도(Set-Cookie 등) 순서대로 모두 유지한다.
+    """
+    items = list(headers)
+    excluded = set(HOP_BY_HOP_HEADERS) | {name.lower() for name in drop}
+    for name, value in items:
+        if name.lower() == "connection":
+            excluded.update(token.strip().lower() for token in value.split(",") if token.strip())
+    return [(name, value) for name, value in items if name.lower() not in excluded]
+
+
+@dataclass
+class UpstreamConfig:
+    """업스트림 하나에 대한 커넥션 풀 설정"""
+    name: str
+    base_url: str
+    timeout: float = 30.0
+    connect_timeout: float = 5.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+    @classmethod
+    def from_env(cls, name: str, base_url: str, **defaults: Any) -> "UpstreamConfig":
+        """UPSTREAM_<NAME>_* 환경 변수로 기본값을 덮어쓴 설정 생성"""
+        prefix = f"UPSTREAM_{name.upper()}_"
+        config = cls(name=name, base_url=base_url, **defaults)
+        config.base_url = os.getenv(f"{prefix}BASE_URL", config.base_url)
+        config.timeout = _env_float(f"{prefix}TIMEOUT", config.timeout)
+        config.connect_timeout = _env_float(f"{prefix}CONNECT_TIMEOUT", config.connect_timeout)
+        config.max_connections = _env_int(f"{prefix}MAX_CONNECTIONS", config.max_connections)
+        config.max_keepalive_connections = _env_int(
+            f"{prefix}MAX_KEEPALIVE", config.max_keepalive_connections
+        )
+        config.keepalive_expiry = _env_float(f"{prefix}KEEPALIVE_EXPIRY", config.keepalive_expiry)
+        config.http2 = _env_bool(f"{prefix}HTTP2", config.http2)
+        return config
+
+
+@dataclass
+class _UpstreamStats:
+    requests: int = 0
+    responses: int = 0
+    errors: int = 0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+
+
+class UpstreamClients:
+    """업스트림별 공유 AsyncClient 레지스트리 (FastAPI lifespan에서 start/aclose)"""
+
+    def __init__(self, configs: Dict[str, UpstreamConfig]):
+        self.configs = configs
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, _UpstreamStats] = {name: _UpstreamStats() for name in configs}
+
+    def _create_client(self, config: UpstreamConfig) -> httpx.AsyncClient:
+        http2 = config.http2 and _http2_available()
+        if config.http2 and not http2:
+            logger.warning("h2 패키지가 없어 %s 업스트림은 HTTP/1.1로 동작합니다", config.name)
+
+        stats = self._stats[config.name]
+        name = config.name
+
+        async def on_request(request: httpx.Request):
+            stats.requests += 1
+
+        async def on_response(response: httpx.Response):
+            stats.responses += 1
+            stats.status_codes[response.status_code] = stats.status_codes.get(response.status_code, 0) + 1
+            UPSTREAM_RESPONSES.inc(name, response.status_code)
+
+        return httpx.AsyncClient(
+            base_url=config.base_url,
+            timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=http2,
+            verify=_ssl_context(http2),
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+
+    async def start(self):
+        """모든 업스트림 클라이언트 생성"""
+        for name, config in self.configs.items():
+            if name not in self._clients:
+                self._clients[name] = self._create_client(config)
+                logger.info(
+                    "Upstream pool '%s' ready: %s (max_connections=%d, http2=%s)",
+                    name, config.base_url, config.max_connections, config.http2 and _http2_available(),
+                )
+
+    async def aclose(self):
+        """모든 업스트림 커넥션 정리"""
+        for name, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("Failed to close upstream pool '%s': %s", name, e)
+        self._clients.clear()
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """업스트림 클라이언트 조회 (lifespan 밖에서 호출되면 지연 생성)"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create_client(self.configs[name])
+            self._clients[name] = client
+        return client
+
+    def record_error(self, name: str):
+        """전송 단계에서 실패한 요청 집계 (타임아웃, 연결 실패 등)"""
+        self._stats[name].errors += 1
+        UPSTREAM_ERRORS.inc(name)
+
+    def stats(self) -> Dict[str, Any]:
+        """업스트림별 커넥션 풀 사용 현황"""
+        result = {}
+        for name, config in self.configs.items():
+            stats = self._stats[name]
+            entry: Dict[str, Any] = {
+                "base_url": config.base_url,
+                "http2": config.http2 and _http2_available(),
+                "timeout": config.timeout,
+                "max_connections": config.max_connections,
+                "max_keepalive_connections": config.max_keepalive_connections,
+                "requests": stats.requests,
+                "responses": stats.responses,
+                "errors": stats.errors,
+                "status_codes": dict(stats.status_codes),
+            }
+            entry.update(self._pool_usage(self._clients.get(name)))
+            result[name] = entry
+        return result
+
+    @staticmethod
+    def _pool_usage(client: Optional[httpx.AsyncClient]) -> Dict[str, Any]:
+        """httpcore 커넥션 풀 내부 상태 (버전에 따라 없으면 생략)"""
+        if client is None or client.is_closed:
+            return {"connections": 0, "active": 0, "idle": 0, "pending_requests": 0}
+
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            "connections": len(connections),
+            "active": len(connections) - idle,
+            "idle": idle,
+            "pending_requests": len(getattr(pool, "_requests", []) or []),
+        }
@@ -42,6 +42,8 @@ class TTSServiceImpl(TTSService):
             self.dependencies = {
                 "asset_service": self.asset_client
             }
+            # 헬스 체크 요청이 캐시된 상태를 바로 받도록 의존성 상태를 주기적으로 갱신
+            self.start_dependency_monitor()
             
             self.is_initialized = True
             print(f"[{self.service_name}] 초기화 완료")
@@ -52,6 +54,7 @@ class TTSServiceImpl(TTSService):
     
     async def cleanup(self):
         """리소스 정리"""
+        await self.stop_dependency_monitor()
         if self.asset_client:
             await self.asset_client.cleanup()
         
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# backend 서비스들은 상대 import(backend.services...)를 사용하므로 저장소 루트를 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -0,0 +1,50 @@
+"""
+service_base 모듈 테스트 - 의존성 상태 주기 갱신과 종료 시 중지
+"""
+import asyncio
+
+from backend.api.schemas.common import ServiceStatus
+from backend.services.tts_service import service as tts_module
+
+
+class FakeAssetClient:
+    def __init__(self, base_url: str):
+        self.healthy = True
+        self.probes = 0
+
+    async def initialize(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    async def health_check(self):
+        self.probes += 1
+        return {"healthy": self.healthy}
+
+
+def test_monitor_refreshes_cached_status_and_stops_on_cleanup(monkeypatch):
+    monkeypatch.setattr(tts_module, "AssetServiceClient", FakeAssetClient)
+
+    async def run():
+        service = tts_module.TTSServiceImpl()
+        service.dependency_status_ttl = 0.01
+        await service.initialize()
+        await asyncio.sleep(0.03)
+        first = await service.check_dependencies()
+
+        service.asset_client.healthy = False
+        await asyncio.sleep(0.03)
+        second = await service.check_dependencies()
+
+        monitor = service._dependency_monitor
+        await service.cleanup()
+        probes = service.asset_client.probes
+        await asyncio.sleep(0.03)
+        return first, second, monitor, service._dependency_monitor, probes, service.asset_client.probes
+
+    first, second, monitor, after_cleanup, probes, later_probes = asyncio.run(run())
+    assert first == {"asset_service": ServiceStatus.HEALTHY}
+    assert second == {"asset_service": ServiceStatus.UNHEALTHY}
+    assert monitor.cancelled() and after_cleanup is None
+    assert later_probes == probes
@@ -170,13 +170,16 @@ const handleSubmit = async (
       throw new Error('스트리밍 응답을 읽을 수 없습니다');
     }
 
+    let pending = '';
     try {
       while (true) {
         const { done, value } = await reader.read();
         if (done) break;
 
-        const chunk = decoder.decode(value);
-        const lines = chunk.split('\n');
+        // 프레임이 여러 read에 걸쳐 올 수 있으므로 마지막 미완성 줄은 다음 read와 합친다
+        pending += decoder.decode(value, { stream: true });
+        const lines = pending.split('\n');
+        pending = lines.pop() ?? '';
 
         for (const line of lines) {
           if (line.trim().startsWith('data: ')) {
@@ -187,7 +190,8 @@ const handleSubmit = async (
               const data = JSON.parse(jsonStr);
 
               if (data.event === 'message') {
-                const chunk = data.chunk || '';
+                // 게이트웨이 raw 중계 모드에서는 Dify 원본 프레임(answer)이 그대로 온다
+                const chunk = data.chunk ?? data.answer ?? '';
                 assistantContent += chunk;
 
                 setMessages(prevMessages =>